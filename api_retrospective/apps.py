@@ -0,0 +1,13 @@
+from django.apps import AppConfig
+
+
+class ApiRetrospectiveConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'api_retrospective'
+
+    def ready(self):
+        # Connects response cache and owner summary invalidation
+        # to model signals
+        from . import owner_summaries, response_cache
+        response_cache.connect_signals()
+        owner_summaries.connect_signals()
@@ -0,0 +1,90 @@
+import hashlib
+from datetime import datetime
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.renderers import JSONRenderer
+
+# Representations include viewer-specific fields such as is_owner
+VARY_HEADERS = ['Cookie', 'Authorization']
+
+
+class ConditionalRetrieveMixin:
+    """
+    Answers If-None-Match / If-Modified-Since on a detail view with
+    304 Not Modified, from a cheap lookup of the object's validator
+    fields instead of the view's full queryset and serializer.
+
+    The ETag hashes `validator_fields` (timestamps and counters)
+    together with the viewer and the query string. Last-Modified is
+    only sent when every validator is a timestamp, as counter changes
+    don't move it.
+    """
+    validator_fields = ['updated_at']
+
+    def get_validator_queryset(self):
+        return self.queryset.model._default_manager.order_by()
+
+    def get_validator_values(self, values):
+        """
+        Returns the values the ETag hashes, from those of the
+        validator fields.
+        """
+        return values
+
+    def get_validators(self):
+        """
+        Returns (etag, last_modified), or None if the object doesn't exist.
+        """
+        lookup = self.lookup_url_kwarg or self.lookup_field
+        values = self.get_validator_queryset().filter(**{
+            self.lookup_field: self.kwargs[lookup]
+        }).values_list(*self.validator_fields).first()
+        if values is None:
+            return None
+        values = self.get_validator_values(values)
+
+        user_id = self.request.user.pk if self.request.user else None
+        params = sorted(self.request.query_params.lists())
+        digest = hashlib.md5(
+            repr((user_id, params) + values).encode()
+        ).hexdigest()
+        last_modified = None
+        if all(isinstance(value, datetime) for value in values):
+            last_modified = int(max(values).timestamp())
+        return quote_etag(digest), last_modified
+
+    def retrieve(self, request, *args, **kwargs):
+        validators = self.get_validators()
+        if validators is None:
+            return super().retrieve(request, *args, **kwargs)
+        etag, last_modified = validators
+
+        response = get_conditional_response(
+            request, etag=etag, last_modified=last_modified
+        )
+        if response is None:
+            response = super().retrieve(request, *args, **kwargs)
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+        patch_vary_headers(response, VARY_HEADERS)
+        return response
+
+
+class WeakETagListMixin:
+    """
+    Adds a weak ETag, hashed from the serialized page, to list responses
+    and answers a matching If-None-Match with 304 Not Modified.
+    """
+
+    def list(self, request, *args, **kwargs):
+        response = super().list(request, *args, **kwargs)
+        content = JSONRenderer().render(response.data)
+        etag = 'W/' + quote_etag(hashlib.md5(content).hexdigest())
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            response = not_modified
+        response['ETag'] = etag
+        patch_vary_headers(response, VARY_HEADERS)
+        return response
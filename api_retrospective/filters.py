@@ -0,0 +1,23 @@
+from rest_framework import filters
+
+
+class IndexedOrderingFilter(filters.OrderingFilter):
+    """
+    Ordering filter for orderings served by `(-column, -id)` indexes.
+    `ordering_aliases` maps accepted names to the columns ordered by,
+    and ties are broken by id so that pages are stable.
+    """
+    ordering_aliases = {}
+
+    def get_ordering(self, request, queryset, view):
+        ordering = super().get_ordering(request, queryset, view)
+        if not ordering:
+            return ordering
+        terms = []
+        for term in ordering:
+            name = term.lstrip('-')
+            name = self.ordering_aliases.get(name, name)
+            terms.append(f'-{name}' if term.startswith('-') else name)
+        if not any(term.lstrip('-') in ('id', 'pk') for term in terms):
+            terms.append('-id' if terms[-1].startswith('-') else 'id')
+        return terms
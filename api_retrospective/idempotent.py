@@ -0,0 +1,64 @@
+from django.db import router, transaction
+from django.db.models.signals import pre_save, post_save
+from rest_framework import status
+from rest_framework.response import Response
+
+
+def create_or_get(model, **values):
+    """
+    Returns the `model` row with the given unique `values` and whether
+    it was created, in at most one INSERT and never an IntegrityError,
+    even when concurrent requests create the same row.
+
+    The INSERT is a bulk_create that ignores conflicts, so a duplicate
+    is skipped rather than a failed write. It skips Model.save and its
+    signals, so the model's save must do no more than the atomic block
+    here, and pre_save and post_save are sent as Model.save would.
+    """
+    instance = model.objects.filter(**values).first()
+    if instance is not None:
+        return instance, False
+    instance = model(**values)
+    using = router.db_for_write(model, instance=instance)
+    with transaction.atomic(using=using):
+        pre_save.send(
+            sender=model, instance=instance, raw=False, using=using,
+            update_fields=None,
+        )
+        model.objects.bulk_create([instance], ignore_conflicts=True)
+        # Reads back the new row, or the one a concurrent request
+        # inserted first, which differs in its insert-time values
+        # such as created_at
+        existing = model.objects.get(**values)
+        fields = [
+            field.attname for field in model._meta.concrete_fields
+            if not field.primary_key
+        ]
+        if any(
+            getattr(existing, name) != getattr(instance, name)
+            for name in fields
+        ):
+            return existing, False
+        post_save.send(
+            sender=model, instance=existing, created=True,
+            update_fields=None, raw=False, using=using,
+        )
+    return existing, True
+
+
+class IdempotentCreateMixin:
+    """
+    For create views whose serializer sets `created` on save: a create
+    that found the row already there answers 200 with it, not 201.
+    """
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        self.perform_create(serializer)
+        if not serializer.created:
+            return Response(serializer.data, status=status.HTTP_200_OK)
+        headers = self.get_success_headers(serializer.data)
+        return Response(
+            serializer.data, status=status.HTTP_201_CREATED, headers=headers
+        )
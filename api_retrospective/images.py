@@ -0,0 +1,138 @@
+import struct
+from rest_framework import serializers
+
+MAX_UPLOAD_BYTES = 2 * 1024 * 1024
+MAX_IMAGE_DIMENSION = 4096
+
+# JPEG start-of-frame markers, which carry the image dimensions
+JPEG_SOF_MARKERS = {
+    0xC0, 0xC1, 0xC2, 0xC3, 0xC5, 0xC6, 0xC7,
+    0xC9, 0xCA, 0xCB, 0xCD, 0xCE, 0xCF,
+}
+
+
+def png_size(file):
+    header = file.read(24)
+    if len(header) < 24 or header[12:16] != b'IHDR':
+        return None
+    return struct.unpack('>II', header[16:24])
+
+
+def gif_size(file):
+    header = file.read(10)
+    if len(header) < 10:
+        return None
+    return struct.unpack('<HH', header[6:10])
+
+
+def webp_size(file):
+    header = file.read(30)
+    if len(header) < 30:
+        return None
+    chunk = header[12:16]
+    if chunk == b'VP8 ':
+        width, height = struct.unpack('<HH', header[26:30])
+        return width & 0x3FFF, height & 0x3FFF
+    if chunk == b'VP8L':
+        bits = struct.unpack('<I', header[21:25])[0]
+        return (bits & 0x3FFF) + 1, ((bits >> 14) & 0x3FFF) + 1
+    if chunk == b'VP8X':
+        width = int.from_bytes(header[24:27], 'little') + 1
+        height = int.from_bytes(header[27:30], 'little') + 1
+        return width, height
+    return None
+
+
+def jpeg_size(file):
+    """
+    Walks the JPEG segments, seeking past their payloads,
+    until the first start-of-frame segment.
+    """
+    file.seek(2)
+    while True:
+        if file.read(1) != b'\xff':
+            return None
+        byte = file.read(1)
+        while byte == b'\xff':
+            byte = file.read(1)
+        if not byte:
+            return None
+        marker = byte[0]
+        if marker == 0xDA or marker == 0xD9:
+            return None
+        if 0xD0 <= marker <= 0xD7 or marker == 0x01:
+            continue
+        length = file.read(2)
+        if len(length) < 2:
+            return None
+        length = struct.unpack('>H', length)[0]
+        if marker in JPEG_SOF_MARKERS:
+            frame = file.read(5)
+            if len(frame) < 5:
+                return None
+            height, width = struct.unpack('>HH', frame[1:5])
+            return width, height
+        if length < 2:
+            return None
+        file.seek(length - 2, 1)
+
+
+# Signature, offset to check it at and header reader of each format
+IMAGE_FORMATS = [
+    (b'\x89PNG\r\n\x1a\n', 0, png_size),
+    (b'\xff\xd8', 0, jpeg_size),
+    (b'GIF87a', 0, gif_size),
+    (b'GIF89a', 0, gif_size),
+    (b'WEBP', 8, webp_size),
+]
+
+
+def read_image_size(file):
+    """
+    Returns the (width, height) declared in an image file's header,
+    or None if it isn't a PNG, JPEG, GIF or WebP image. Only header
+    bytes are read and no pixel data is decoded.
+    """
+    file.seek(0)
+    start = file.read(16)
+    try:
+        for signature, offset, reader in IMAGE_FORMATS:
+            if start[offset:offset + len(signature)] == signature:
+                file.seek(0)
+                return reader(file)
+        return None
+    finally:
+        file.seek(0)
+
+
+def validate_image_upload(file):
+    """
+    Validates that an upload is at most 2MB and an image of at most
+    4096x4096px. The size is checked before anything is read and the
+    dimensions come from the header alone, so images that would
+    decompress to huge bitmaps are refused without being decoded.
+    """
+    if file.size > MAX_UPLOAD_BYTES:
+        raise serializers.ValidationError('Image size larger than 2MB!')
+    size = read_image_size(file)
+    if size is None or 0 in size:
+        raise serializers.ValidationError(
+            'Upload a valid PNG, JPEG, GIF or WebP image.'
+        )
+    width, height = size
+    if height > MAX_IMAGE_DIMENSION:
+        raise serializers.ValidationError('Image height larger than 4096px!')
+    if width > MAX_IMAGE_DIMENSION:
+        raise serializers.ValidationError('Image width larger than 4096px!')
+
+
+class ImageUploadField(serializers.ImageField):
+    """
+    An image field validated by validate_image_upload, in place of
+    Pillow opening and verifying the whole upload.
+    """
+
+    def to_internal_value(self, data):
+        file = serializers.FileField.to_internal_value(self, data)
+        validate_image_upload(file)
+        return file
@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+from api_retrospective.response_cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    """
+    Reports how often anonymous list requests were answered from the
+    response cache. Counts are kept in the cache itself, so they cover
+    every process sharing it.
+    """
+    help = 'Reports the response cache hit and miss counts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset', action='store_true',
+            help='Zero the counts after reporting them.',
+        )
+
+    def handle(self, *args, **options):
+        stats = get_stats()
+        total = stats['hits'] + stats['misses']
+        ratio = stats['hits'] / total if total else 0
+        self.stdout.write(
+            f"Hits: {stats['hits']}, misses: {stats['misses']}, "
+            f'hit ratio: {ratio:.1%}'
+        )
+        if options['reset']:
+            reset_stats()
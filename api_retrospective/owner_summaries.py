@@ -0,0 +1,144 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache.backends.locmem import LocMemCache
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from rest_framework import serializers
+from rest_framework.fields import get_attribute
+from profiles.models import Profile
+from variants.serializers import absolute_urls, variant_urls
+from .response_cache import get_cache
+
+# The entries of an owner summary
+SUMMARY_NAMES = [
+    'username', 'profile_id', 'profile_image', 'profile_image_variants',
+]
+
+
+def summary_key(user_id):
+    return f'owner-summary:{user_id}'
+
+
+def build_summaries(user_ids):
+    """
+    Reads the summaries of the given users' profiles with one query,
+    resolving their image URLs through the storage backend.
+    """
+    storage = Profile._meta.get_field('image').storage
+    rows = Profile.objects.filter(owner_id__in=user_ids).values_list(
+        'owner_id', 'owner__username', 'id', 'image', 'image_variants'
+    )
+    return {
+        owner_id: {
+            'username': username,
+            'profile_id': profile_id,
+            'profile_image': storage.url(image),
+            'profile_image_variants': variant_urls(storage, image, variants),
+        }
+        for owner_id, username, profile_id, image, variants in rows
+    }
+
+
+def get_owner_summaries(user_ids):
+    """
+    Maps each user id to the username, profile id and profile image
+    URLs of the user, from the cache or else built in one batch.
+    Users without a profile are left out.
+    """
+    # Summaries share the response cache's backend, so processes that
+    # share one also share the summaries and their invalidation. A
+    # per-process cache would miss the other processes' edits, so
+    # summaries are then always read live
+    cache = get_cache()
+    if isinstance(cache, LocMemCache):
+        return build_summaries(user_ids)
+    keys = {user_id: summary_key(user_id) for user_id in user_ids}
+    cached = cache.get_many(keys.values())
+    summaries = {
+        user_id: cached[key] for user_id, key in keys.items() if key in cached
+    }
+    missing = [user_id for user_id in keys if user_id not in summaries]
+    if missing:
+        built = build_summaries(missing)
+        cache.set_many({
+            summary_key(user_id): summary
+            for user_id, summary in built.items()
+        }, settings.OWNER_SUMMARY_TIMEOUT)
+        summaries.update(built)
+    return summaries
+
+
+def forget_owner_summaries(*user_ids):
+    """
+    Drops the cached summaries of the given users, now and again once
+    the current transaction commits, so a read racing with the write
+    can't cache the old values for good.
+    """
+    keys = [summary_key(user_id) for user_id in user_ids]
+    get_cache().delete_many(keys)
+    transaction.on_commit(lambda: get_cache().delete_many(keys))
+
+
+def forget_profile_owner(sender, instance, **kwargs):
+    forget_owner_summaries(instance.owner_id)
+
+
+def forget_user(sender, instance, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    forget_owner_summaries(instance.pk)
+
+
+def connect_signals():
+    uid = 'owner-summaries'
+    post_save.connect(forget_profile_owner, sender=Profile, dispatch_uid=uid)
+    post_delete.connect(forget_profile_owner, sender=Profile, dispatch_uid=uid)
+    post_save.connect(forget_user, sender=User, dispatch_uid=uid)
+    post_delete.connect(forget_user, sender=User, dispatch_uid=uid)
+
+
+class OwnerSummaryField(serializers.Field):
+    """
+    A read-only entry of the summary of the user whose id is at
+    `source`. In list serializers, the summaries of every owner on
+    the page are fetched together on the first lookup.
+    """
+
+    def __init__(self, name, **kwargs):
+        assert name in SUMMARY_NAMES, f'Unknown owner summary {name!r}.'
+        self.summary_name = name
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def get_page_user_ids(self):
+        list_serializer = self.parent.parent
+        if not isinstance(list_serializer, serializers.ListSerializer):
+            return set()
+        return {
+            get_attribute(obj, self.source_attrs)
+            for obj in list_serializer.instance or ()
+        }
+
+    def to_representation(self, user_id):
+        summaries = self.context.setdefault('owner_summaries', {})
+        if user_id not in summaries:
+            user_ids = (self.get_page_user_ids() | {user_id}) - set(summaries)
+            found = get_owner_summaries(user_ids)
+            summaries.update({pk: found.get(pk) for pk in user_ids})
+        summary = summaries[user_id]
+        return summary[self.summary_name] if summary else None
+
+
+class OwnerImageVariantsField(OwnerSummaryField):
+    """
+    The owner's profile image variants, as absolute URLs.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__('profile_image_variants', **kwargs)
+
+    def to_representation(self, user_id):
+        urls = super().to_representation(user_id)
+        if urls is None:
+            return None
+        return absolute_urls(self.context.get('request'), urls)
@@ -0,0 +1,143 @@
+import json
+from base64 import b64decode, b64encode
+from binascii import Error as BinasciiError
+from collections import OrderedDict
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(PageNumberPagination):
+    """
+    Page number pagination with an opt-in keyset (cursor) mode.
+
+    Clients opt in with `?pagination=cursor` and follow the `next` link,
+    which carries the last row's ordering values as an opaque cursor.
+    Each page is fetched with a `WHERE (created_at, id) < cursor` style
+    filter, so deep pages cost the same as the first one and no
+    COUNT(*) is issued. The response keeps the `next`/`results` keys.
+
+    The keyset is the queryset's ordering plus `id` as a tie-breaker.
+    Orderings that span relations or nullable columns can't be keyed,
+    so those requests fall back to page numbers.
+    """
+    mode_query_param = 'pagination'
+    cursor_query_param = 'cursor'
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.keyset = None
+        if request.query_params.get(self.mode_query_param) == 'cursor':
+            self.keyset = self.get_keyset(queryset)
+        if self.keyset is None:
+            return super().paginate_queryset(queryset, request, view)
+
+        self.request = request
+        page_size = self.get_page_size(request)
+        queryset = queryset.order_by(*(
+            f'-{field.attname}' if descending else field.attname
+            for field, descending in self.keyset
+        ))
+        cursor = self.decode_cursor(request)
+        if cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(cursor))
+
+        rows = list(queryset[:page_size + 1])
+        self.page = rows[:page_size]
+        self.has_next = len(rows) > page_size
+        return self.page
+
+    def get_paginated_response(self, data):
+        if self.keyset is None:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ('next', self.get_next_link()),
+            ('results', data),
+        ]))
+
+    def get_next_link(self):
+        if self.keyset is None:
+            return super().get_next_link()
+        if not self.has_next:
+            return None
+        values = self.get_cursor_values(self.page[-1])
+        url = self.request.build_absolute_uri()
+        url = remove_query_param(url, self.page_query_param)
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(values)
+        )
+
+    def get_keyset(self, queryset):
+        """
+        Returns the (field, descending) pairs to key on,
+        or None if the ordering can't be keyed.
+        """
+        meta = queryset.model._meta
+        ordering = list(queryset.query.order_by or meta.ordering)
+        keyset = []
+        for name in ordering:
+            if not isinstance(name, str):
+                return None
+            descending = name.startswith('-')
+            try:
+                field = meta.get_field(name.lstrip('-'))
+            except FieldDoesNotExist:
+                return None
+            if field.null or not field.concrete or field.many_to_many:
+                return None
+            keyset.append((field, descending))
+        if not any(field.primary_key for field, _ in keyset):
+            descending = keyset[-1][1] if keyset else True
+            keyset.append((meta.pk, descending))
+        return keyset
+
+    def get_cursor_values(self, obj):
+        """
+        Returns the keyset values of the last row on the page.
+        """
+        return [getattr(obj, field.attname) for field, _ in self.keyset]
+
+    def get_keyset_filter(self, values, keyset=None):
+        """
+        Builds the lexicographic "comes after the cursor" condition,
+        e.g. created_at < c OR (created_at = c AND id < i).
+        It is ANDed with created_at <= c, a plain range on the leading
+        column that lets the database seek into the index rather than
+        scan it.
+        """
+        keyset = keyset or self.keyset
+        condition = Q()
+        equal = Q()
+        for (field, descending), value in zip(keyset, values):
+            lookup = 'lt' if descending else 'gt'
+            condition |= equal & Q(**{f'{field.attname}__{lookup}': value})
+            equal &= Q(**{field.attname: value})
+        field, descending = keyset[0]
+        lookup = 'lte' if descending else 'gte'
+        return Q(**{f'{field.attname}__{lookup}': values[0]}) & condition
+
+    def encode_cursor(self, values):
+        # isoformat() keeps the microseconds the keyset compares on
+        data = json.dumps([
+            value.isoformat() if hasattr(value, 'isoformat') else value
+            for value in values
+        ])
+        return b64encode(data.encode('ascii')).decode('ascii')
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None
+        try:
+            values = json.loads(b64decode(encoded.encode('ascii')))
+            if len(values) != len(self.keyset):
+                raise ValueError
+            return [
+                field.to_python(value)
+                for (field, _), value in zip(self.keyset, values)
+            ]
+        except (TypeError, ValueError, BinasciiError, ValidationError):
+            raise NotFound(self.invalid_cursor_message)
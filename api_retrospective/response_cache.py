@@ -0,0 +1,169 @@
+import hashlib
+import json
+import time
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from django.utils.cache import patch_vary_headers
+from django.utils.http import urlencode
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+
+CACHE_ALIAS = 'responses'
+
+# Saving or deleting any of these invalidates the cached responses
+# that declare them in `cache_dependencies`
+INVALIDATING_MODELS = [
+    'auth.user',
+    'posts.post',
+    'comments.comment',
+    'likes.like',
+    'followers.follower',
+    'profiles.profile',
+]
+
+STATS_KEYS = {
+    'hits': 'response-cache:stats:hits',
+    'misses': 'response-cache:stats:misses',
+}
+
+
+def get_cache():
+    return caches[CACHE_ALIAS]
+
+
+def version_key(label):
+    return f'response-cache:version:{label}'
+
+
+def new_version():
+    # Restarting from the clock never reuses a version that an evicted
+    # counter may already have handed out
+    return time.time_ns()
+
+
+def current_versions(labels):
+    """
+    Returns the current version of each model label, in order.
+    """
+    cache = get_cache()
+    keys = [version_key(label) for label in labels]
+    versions = cache.get_many(keys)
+    missing = [key for key in keys if key not in versions]
+    for key in missing:
+        cache.add(key, new_version(), None)
+    if missing:
+        versions.update(cache.get_many(missing))
+    return [versions.get(key) for key in keys]
+
+
+def bump(labels):
+    cache = get_cache()
+    for label in labels:
+        try:
+            cache.incr(version_key(label))
+        except ValueError:
+            cache.set(version_key(label), new_version(), None)
+
+
+def invalidate(*labels):
+    """
+    Moves each model label to a new version, so every cached response
+    that depends on it is missed from now on and left to expire.
+    Call it after bulk writes, which send no model signals.
+
+    Inside a transaction the versions move again once it commits, as
+    a read racing with the write may have cached the old rows under
+    the first new version.
+    """
+    bump(labels)
+    transaction.on_commit(lambda: bump(labels))
+
+
+def bump_version(sender, update_fields=None, **kwargs):
+    """
+    Invalidates the responses depending on a saved or deleted model.
+    """
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    invalidate(sender._meta.label_lower)
+
+
+def response_key(request, versions):
+    """
+    Builds the cache key of a request from its path, its query params
+    in a normalized order and the versions of its dependencies.
+    """
+    params = sorted(
+        (key, value)
+        for key, values in request.query_params.lists()
+        for value in values
+    )
+    raw = f'{request.path}?{urlencode(params)}|{versions}'
+    return 'response-cache:' + hashlib.md5(raw.encode()).hexdigest()
+
+
+def record(outcome):
+    cache = get_cache()
+    try:
+        cache.incr(STATS_KEYS[outcome])
+    except ValueError:
+        cache.add(STATS_KEYS[outcome], 1, None)
+
+
+def get_stats():
+    """
+    Returns the hit and miss counts recorded since the last reset.
+    """
+    counts = get_cache().get_many(STATS_KEYS.values())
+    return {
+        outcome: counts.get(key, 0) for outcome, key in STATS_KEYS.items()
+    }
+
+
+def reset_stats():
+    get_cache().delete_many(STATS_KEYS.values())
+
+
+def connect_signals():
+    for label in INVALIDATING_MODELS:
+        model = apps.get_model(label)
+        uid = f'response-cache:{label}'
+        post_save.connect(bump_version, sender=model, dispatch_uid=uid)
+        post_delete.connect(bump_version, sender=model, dispatch_uid=uid)
+
+
+class AnonymousCacheMixin:
+    """
+    Serves list responses to anonymous users from the shared response
+    cache. Entries are keyed on the versions of `cache_dependencies`,
+    the model labels whose writes change the response.
+    """
+    cache_dependencies = []
+
+    def list(self, request, *args, **kwargs):
+        if request.user.is_authenticated:
+            return super().list(request, *args, **kwargs)
+
+        cache = get_cache()
+        # Versions are read before the queryset runs, so a write racing
+        # with it stores the response under an already stale key
+        key = response_key(
+            request, current_versions(self.cache_dependencies)
+        )
+        data = cache.get(key)
+        if data is not None:
+            record('hits')
+            response = Response(data)
+            response['X-Cache'] = 'HIT'
+        else:
+            record('misses')
+            response = super().list(request, *args, **kwargs)
+            if response.status_code == 200:
+                data = json.loads(JSONRenderer().render(response.data))
+                cache.set(key, data, settings.RESPONSE_CACHE_TIMEOUT)
+            response['X-Cache'] = 'MISS'
+        patch_vary_headers(response, ['Cookie', 'Authorization'])
+        return response
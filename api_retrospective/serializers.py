@@ -1,5 +1,5 @@
 from dj_rest_auth.serializers import UserDetailsSerializer
-from rest_framework import serializers
+from .owner_summaries import OwnerSummaryField
 
 
 class CurrentUserSerializer(UserDetailsSerializer):
@@ -7,8 +7,8 @@ class CurrentUserSerializer(UserDetailsSerializer):
     Serializer for the current user, extending UserDetailsSerializer
     to include additional fields for profile ID and profile image.
     """
-    profile_id = serializers.ReadOnlyField(source='profile.id')
-    profile_image = serializers.ReadOnlyField(source='profile.image.url')
+    profile_id = OwnerSummaryField('profile_id', source='pk')
+    profile_image = OwnerSummaryField('profile_image', source='pk')
 
     class Meta(UserDetailsSerializer.Meta):
         fields = UserDetailsSerializer.Meta.fields + (
@@ -44,6 +44,92 @@ if 'DEV' not in os.environ:
         'rest_framework.renderers.JSONRenderer',
     ]
 
+# Posts by users with more followers than this are not fanned out to
+# the followers' feeds on write; the feed reads them on request instead.
+FEED_FANOUT_THRESHOLD = 1000
+# How many of a user's recent posts are copied into a new follower's feed
+FEED_BACKFILL_LIMIT = 100
+
+# Follow suggestions are scored from an in-memory copy of the follow
+# graph, reloaded to pick up other processes' writes after this many
+# seconds; /profiles/suggestions/ returns SUGGESTIONS_LIMIT by default
+FOLLOW_GRAPH_MAX_AGE = 300
+SUGGESTIONS_LIMIT = 10
+SUGGESTIONS_MAX_LIMIT = 50
+
+# Replies shown under each comment of /comments/threads/; the rest
+# of a thread is paged through /comments/<id>/replies/
+COMMENT_THREAD_REPLIES = 3
+
+# Rows the NDJSON exports read from the database per batch
+EXPORT_CHUNK_SIZE = 2000
+
+# Most results a ranked search endpoint returns
+SEARCH_RESULTS_LIMIT = 100
+
+# Most posts /posts/bulk/ returns per request
+POSTS_BULK_LIMIT = 100
+
+# Most post ids /likes/batch/ accepts per list
+LIKES_BATCH_LIMIT = 100
+
+# With COUNTER_BUFFER set, Post rows are recounted in batches, every
+# COUNTER_FLUSH_INTERVAL seconds or once this many posts have pending
+# counts, instead of one UPDATE per like or comment. Each
+# worker merges only its own pending counts into reads, so workers can
+# disagree by up to one interval's likes and comments
+COUNTER_BUFFER = 'COUNTER_BUFFER' in os.environ
+COUNTER_FLUSH_INTERVAL = 1
+COUNTER_FLUSH_SIZE = 500
+
+# Trending scores halve every TRENDING_HALF_LIFE_HOURS; a comment
+# counts for more than a like
+TRENDING_HALF_LIFE_HOURS = 24
+TRENDING_WEIGHTS = {'like': 1.0, 'comment': 2.0}
+# Each compute_trending run rescans this many seconds before the last
+# one started, for likes and comments whose transactions committed late
+TRENDING_OVERLAP_SECONDS = 600
+
+# Longest edge in px of each resized copy made of uploaded images
+IMAGE_VARIANTS = {'thumb': 150, 'medium': 600, 'full': 1600}
+IMAGE_VARIANT_QUALITY = 82
+
+# Anonymous list responses are cached in the 'responses' cache, chosen
+# with RESPONSE_CACHE: 'file' (shared by the processes of one machine,
+# the default), 'memcached' (shared cache server at
+# RESPONSE_CACHE_LOCATION, requires pymemcache) or 'locmem' (per
+# process, so only for a single worker: writes in one process don't
+# invalidate the others' responses). Processes on other machines, such
+# as the Procfile's image variants worker, only invalidate the web
+# processes' responses through 'memcached'
+RESPONSE_CACHE_BACKENDS = {
+    'locmem': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'responses',
+    },
+    'file': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.getenv('RESPONSE_CACHE_LOCATION', '/tmp/responses'),
+    },
+    'memcached': {
+        'BACKEND': 'django.core.cache.backends.memcached.PyMemcacheCache',
+        'LOCATION': os.getenv('RESPONSE_CACHE_LOCATION', '127.0.0.1:11211'),
+    },
+}
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'responses': RESPONSE_CACHE_BACKENDS[os.getenv('RESPONSE_CACHE', 'file')],
+}
+# Seconds a cached response lives, unless a write invalidates it first
+RESPONSE_CACHE_TIMEOUT = 300
+# Seconds the cached post category counts live; writes adjust them
+CATEGORY_COUNTS_TIMEOUT = 300
+# Seconds a cached owner summary (username, profile id and profile image
+# URLs) lives; profile and user saves drop it sooner
+OWNER_SUMMARY_TIMEOUT = 3600
+
 REST_USE_JWT = True
 JWT_AUTH_SECURE = True
 JWT_AUTH_COOKIE = 'my-app-auth'
@@ -111,6 +197,12 @@ INSTALLED_APPS = [
     'followers',
     'feedback',
     'report',
+    'feed',
+    'search',
+    'variants',
+    'suggestions',
+    'exports',
+    'api_retrospective',
 
     
 
@@ -0,0 +1,61 @@
+from rest_framework.permissions import SAFE_METHODS
+
+FIELDS_PARAM = 'fields'
+OMIT_PARAM = 'omit'
+
+
+def parse_names(value):
+    return {name.strip() for name in (value or '').split(',') if name.strip()}
+
+
+def selected_fields(request, names):
+    """
+    Returns the given field names that a read request selected with
+    `?fields=` (only these) and `?omit=` (all but these).
+    Writes always get every field.
+    """
+    if request is None or request.method not in SAFE_METHODS:
+        return list(names)
+    fields = parse_names(request.query_params.get(FIELDS_PARAM))
+    omit = parse_names(request.query_params.get(OMIT_PARAM))
+    return [
+        name for name in names
+        if (not fields or name in fields) and name not in omit
+    ]
+
+
+def is_field_selected(request, name):
+    return bool(selected_fields(request, [name]))
+
+
+class SparseFieldsSerializerMixin:
+    """
+    Leaves out the fields that the request's `?fields=` / `?omit=`
+    didn't select, so their values are never computed.
+    """
+
+    def get_fields(self):
+        fields = super().get_fields()
+        request = self.context.get('request')
+        return {
+            name: fields[name] for name in selected_fields(request, fields)
+        }
+
+
+class SparseQuerysetMixin:
+    """
+    Adds the joins of a view's queryset only when the fields that need
+    them are selected. `field_relations` maps select_related paths to
+    the fields using them.
+    """
+    field_relations = {}
+
+    def get_queryset(self):
+        queryset = super().get_queryset()
+        relations = [
+            path for path, names in self.field_relations.items()
+            if selected_fields(self.request, names)
+        ]
+        if relations:
+            queryset = queryset.select_related(*relations)
+        return queryset
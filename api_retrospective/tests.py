@@ -0,0 +1,262 @@
+import re
+import threading
+import time
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import OperationalError, connection, connections
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APITestCase
+from comments.models import Comment
+from followers.models import Follower
+from likes.models import Like
+from posts.models import Post
+from profiles.models import Profile
+from report.models import Report
+from .idempotent import create_or_get
+from .serializers import CurrentUserSerializer
+
+# SQLite reports full table scans as "SCAN <table>", and index-order
+# scans as "SCAN <table> USING [COVERING] INDEX <index>"
+SQLITE_FULL_SCAN = re.compile(r'^SCAN \S+( AS \S+)?$')
+
+
+def full_scans(sql, params):
+    """
+    Returns the steps of a query's plan that scan a whole table.
+    """
+    with connection.cursor() as cursor:
+        if connection.vendor == 'postgresql':
+            # Tiny test tables would be seq scanned whatever the indexes,
+            # so only report the scans the planner can't avoid
+            cursor.execute('SET LOCAL enable_seqscan = off')
+            cursor.execute(f'EXPLAIN {sql}', params)
+            plan = [row[0] for row in cursor.fetchall()]
+            return [line for line in plan if 'Seq Scan' in line]
+        cursor.execute(f'EXPLAIN QUERY PLAN {sql}', params)
+        plan = [row[-1] for row in cursor.fetchall()]
+        return [line for line in plan if SQLITE_FULL_SCAN.match(line)]
+
+
+class QueryPlanTests(APITestCase):
+    """
+    Checks that the main endpoints read through indexes, by explaining
+    every query they run over a small seeded dataset.
+    """
+
+    def setUp(self):
+        users = [
+            User.objects.create_user(username=f'user{i}', password='pass')
+            for i in range(5)
+        ]
+        for i, user in enumerate(users):
+            for other in users[:i]:
+                Follower.objects.create(owner=user, followed=other)
+            for j in range(5):
+                post = Post.objects.create(
+                    owner=user, title=f'post {j}', category='other'
+                )
+                Comment.objects.create(owner=user, post=post, content='hi')
+                Like.objects.create(owner=users[j], post=post)
+            Report.objects.create(user=user, title='report', category='spam')
+        self.client.login(username='user4', password='pass')
+
+    def assert_indexed(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200, url)
+        for query in queries:
+            sql = query['sql']
+            if not sql.startswith('SELECT'):
+                continue
+            with self.subTest(url=url, sql=sql):
+                self.assertEqual(full_scans(sql, None), [])
+
+    def test_main_endpoints_do_not_scan_tables(self):
+        profile_id = User.objects.get(username='user1').profile.id
+        post_id = Post.objects.first().id
+        comment_id = Comment.objects.first().id
+        for url in [
+            '/posts/',
+            '/posts/?pagination=cursor',
+            f'/posts/?owner__profile={profile_id}',
+            f'/posts/?owner__followed__owner__profile={profile_id}',
+            f'/posts/?likes__owner__profile={profile_id}',
+            '/posts/?ordering=-likes_count',
+            '/posts/?ordering=-comments_count',
+            '/posts/?ordering=-likes__created_at',
+            f'/posts/{post_id}/',
+            f'/comments/?post={post_id}',
+            f'/comments/threads/?post={post_id}',
+            f'/comments/{comment_id}/replies/',
+            '/comments/',
+            f'/profiles/{profile_id}/',
+            '/profiles/?fields=id,name,owner',
+            '/profiles/?ordering=-followers_count',
+            '/likes/',
+            '/followers/',
+            '/feed/',
+            '/report/?category=spam',
+            '/report/?user=1',
+        ]:
+            self.assert_indexed(url)
+
+
+class OwnerSummaryTests(APITestCase):
+    """
+    Tests for the cached owner summaries the post, comment and current
+    user serializers read owner details from.
+    """
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.users = [
+            User.objects.create_user(username=f'user{i}', password='pass')
+            for i in range(3)
+        ]
+        for user in self.users:
+            Post.objects.create(owner=user, title='post')
+
+    def profile_queries(self, url):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        return response, [
+            query for query in queries
+            if 'profiles_profile' in query['sql']
+        ]
+
+    def test_page_owners_are_summarized_in_one_query_then_cached(self):
+        response, queries = self.profile_queries('/posts/')
+        self.assertEqual(len(queries), 1)
+        self.assertEqual(
+            {post['owner'] for post in response.data['results']},
+            {'user0', 'user1', 'user2'},
+        )
+        _, queries = self.profile_queries('/posts/?fields=owner,profile_id')
+        self.assertEqual(queries, [])
+
+    def test_profile_and_user_saves_refresh_the_summary(self):
+        self.client.get('/posts/')
+        profile = Profile.objects.get(owner=self.users[0])
+        profile.image = 'images/new.png'
+        profile.save()
+        self.users[0].username = 'renamed'
+        self.users[0].save()
+        response = self.client.get(f'/posts/?owner__profile={profile.id}')
+        post = response.data['results'][0]
+        self.assertEqual(post['owner'], 'renamed')
+        self.assertTrue(post['profile_image'].endswith('images/new.png'))
+
+    def test_per_process_cache_reads_summaries_live(self):
+        with self.settings(CACHES={
+            'default': settings.CACHES['default'],
+            'responses': settings.RESPONSE_CACHE_BACKENDS['locmem'],
+        }):
+            self.client.get('/posts/')
+            _, queries = self.profile_queries('/posts/?fields=owner')
+        self.assertEqual(len(queries), 1)
+
+    def test_current_user_reads_the_summary(self):
+        user = self.users[1]
+        data = CurrentUserSerializer(user).data
+        self.assertEqual(data['profile_id'], user.profile.id)
+        self.assertEqual(data['profile_image'], user.profile.image.url)
+
+
+class CreateOrGetConflictTests(APITestCase):
+    def setUp(self):
+        self.owner = User.objects.create_user(username='owner')
+        self.post = Post.objects.create(owner=self.owner, title='post')
+
+    def test_row_inserted_meanwhile_is_returned_uncreated(self):
+        # A like of the same post lands between the lookup and the
+        # conflict-ignoring insert
+        bulk_create = Like.objects.bulk_create
+
+        def like_first(likes, **kwargs):
+            Like.objects.create(owner=self.owner, post=self.post)
+            return bulk_create(likes, **kwargs)
+
+        with mock.patch.object(Like.objects, 'bulk_create', like_first):
+            like, created = create_or_get(
+                Like, owner=self.owner, post=self.post
+            )
+        self.assertFalse(created)
+        self.assertEqual(like, Like.objects.get())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_new_row_is_created_with_its_signals(self):
+        like, created = create_or_get(Like, owner=self.owner, post=self.post)
+        self.assertTrue(created)
+        self.assertEqual(like, Like.objects.get())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+
+class CreateOrGetTests(TransactionTestCase):
+    """
+    Races many threads, each with its own connection, to create the
+    same like and the same follow.
+    SQLite serializes writers by failing them with "table is locked",
+    which the threads retry a bounded number of times; no other
+    error may surface.
+    """
+    THREADS = 8
+    RETRIES = 200
+
+    def setUp(self):
+        caches['responses'].clear()
+        self.owner = User.objects.create_user(username='owner')
+        self.followed = User.objects.create_user(username='followed')
+        self.post = Post.objects.create(owner=self.followed, title='post')
+
+    def race(self, model, **values):
+        barrier = threading.Barrier(self.THREADS)
+        results, errors = [], []
+
+        def create():
+            try:
+                barrier.wait()
+                for attempt in range(self.RETRIES):
+                    try:
+                        results.append(create_or_get(model, **values))
+                        break
+                    except OperationalError as error:
+                        if 'locked' not in str(error):
+                            raise
+                        time.sleep(0.01)
+                else:
+                    raise AssertionError('The table stayed locked.')
+            except Exception as error:
+                errors.append(error)
+            finally:
+                connections.close_all()
+
+        threads = [
+            threading.Thread(target=create) for _ in range(self.THREADS)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(errors, [])
+        self.assertEqual(
+            [created for _, created in results].count(True), 1
+        )
+        self.assertEqual(
+            {instance.pk for instance, _ in results},
+            {model.objects.get(**values).pk},
+        )
+
+    def test_concurrent_likes_create_one_like(self):
+        self.race(Like, owner=self.owner, post=self.post)
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_concurrent_follows_create_one_follower(self):
+        self.race(Follower, owner=self.owner, followed=self.followed)
+        profile = Profile.objects.get(owner=self.followed)
+        self.assertEqual(profile.followers_count, 1)
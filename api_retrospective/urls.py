@@ -36,6 +36,9 @@ urlpatterns = [
     path('', include('followers.urls')),
     path('', include('feedback.urls')),
     path('', include('report.urls')),
+    path('', include('feed.urls')),
+    path('', include('suggestions.urls')),
+    path('', include('exports.urls')),
 
 ]
 
@@ -0,0 +1,83 @@
+"""
+Measures the memory footprint of the in-memory follow graph per million
+edges, and the latency of scoring suggestions over it, for a few
+follower counts and out-degrees.
+
+Run from the repository root with the usual environment variables:
+
+    python benchmarks/follow_graph.py [--edges 1000000]
+
+The graph is built from synthetic edges, so no database is needed.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+parser.add_argument('--edges', type=int, default=1000000)
+parser.add_argument('--queries', type=int, default=200)
+args = parser.parse_args()
+
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_retrospective.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from suggestions.graph import FollowGraph  # noqa: E402
+
+# Follows per follower of each run
+OUT_DEGREES = [10, 50, 200]
+
+
+def synthetic_edges(followers, out_degree):
+    """
+    Yields sorted (owner_id, followed_id) pairs, with followed users
+    skewed towards low ids as popular accounts are.
+    """
+    random.seed(0)
+    users = followers * 2
+    for owner_id in range(1, followers + 1):
+        followed = set()
+        while len(followed) < out_degree:
+            followed.add(int(users * random.random() ** 2) + 1)
+        for followed_id in sorted(followed):
+            yield owner_id, followed_id
+
+
+def main():
+    print(f'{args.edges} edges per graph\n')
+    print(
+        f'{"followers":>10} {"degree":>7} {"MB":>7} {"MB/1M edges":>12} '
+        f'{"B/edge":>7} {"suggest ms":>11}'
+    )
+    for out_degree in OUT_DEGREES:
+        followers = args.edges // out_degree
+        edges = list(synthetic_edges(followers, out_degree))
+
+        graph = FollowGraph()
+        tracemalloc.start()
+        graph.build(iter(edges))
+        size = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+
+        start = time.perf_counter()
+        for _ in range(args.queries):
+            graph.suggest(random.randint(1, followers), 10)
+        latency = (time.perf_counter() - start) * 1000 / args.queries
+
+        print(
+            f'{followers:>10} {out_degree:>7} {size / 2 ** 20:>7.1f} '
+            f'{size / 2 ** 20 * 1000000 / len(edges):>12.1f} '
+            f'{size / len(edges):>7.1f} {latency:>11.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
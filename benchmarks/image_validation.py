@@ -0,0 +1,86 @@
+"""
+Compares the per-upload CPU time and peak memory of validating an
+image upload through Pillow (the previous PostSerializer.validate_image
+path) and through the header-only api_retrospective.images validator.
+
+Run from the repository root:
+
+    python benchmarks/image_validation.py
+"""
+import os
+import sys
+import time
+import tracemalloc
+from io import BytesIO
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import django  # noqa: E402
+from django.conf import settings  # noqa: E402
+
+settings.configure()
+django.setup()
+
+from django import forms  # noqa: E402
+from django.core.files.uploadedfile import SimpleUploadedFile  # noqa: E402
+from PIL import Image  # noqa: E402
+from api_retrospective.images import validate_image_upload  # noqa: E402
+
+ROUNDS = 50
+
+
+def make_upload(fmt, size):
+    # Noise doesn't compress, so the uploads approach the 2MB limit
+    image = Image.frombytes('RGB', size, os.urandom(size[0] * size[1] * 3))
+    buffer = BytesIO()
+    image.save(buffer, fmt)
+    return SimpleUploadedFile(f'upload.{fmt.lower()}', buffer.getvalue())
+
+
+def pillow_validate(upload):
+    # What DRF's ImageField and the old validate_image did per upload
+    value = forms.ImageField().clean(upload)
+    return value.image.width, value.image.height
+
+
+def header_validate(upload):
+    validate_image_upload(upload)
+
+
+def measure(validate, upload):
+    """
+    Returns the mean CPU seconds and the peak traced bytes per call.
+    """
+    start = time.process_time()
+    for _ in range(ROUNDS):
+        upload.seek(0)
+        validate(upload)
+    cpu = (time.process_time() - start) / ROUNDS
+
+    upload.seek(0)
+    tracemalloc.start()
+    validate(upload)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return cpu, peak
+
+
+def main():
+    uploads = {
+        'JPEG 1600x1200': make_upload('JPEG', (1600, 1200)),
+        'PNG 800x800': make_upload('PNG', (800, 800)),
+    }
+    print(f'{"upload":<16} {"validator":<8} {"cpu/upload":>12} {"peak mem":>10}')
+    for name, upload in uploads.items():
+        for label, validate in [
+            ('pillow', pillow_validate), ('header', header_validate),
+        ]:
+            cpu, peak = measure(validate, upload)
+            print(
+                f'{name:<16} {label:<8} {cpu * 1e6:>10.1f}us '
+                f'{peak / 1024:>8.1f}KB'
+            )
+
+
+if __name__ == '__main__':
+    main()
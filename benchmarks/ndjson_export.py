@@ -0,0 +1,94 @@
+"""
+Measures the peak Python memory and the time of streaming a post's
+comments as NDJSON, for growing numbers of comments.
+
+Run from the repository root with the usual environment variables:
+
+    python benchmarks/ndjson_export.py [--comments 10000 100000 500000]
+
+The data is seeded into its own SQLite database (--database) on the
+first run and reused by later runs; delete the file to reseed.
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+parser.add_argument(
+    '--comments', type=int, nargs='+', default=[10000, 100000, 500000]
+)
+parser.add_argument(
+    '--database', default='/tmp/ndjson_export_benchmark.sqlite3'
+)
+args = parser.parse_args()
+
+os.environ['DATABASE_URL'] = f'sqlite:///{args.database}'
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_retrospective.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.utils.timezone import now  # noqa: E402
+from posts.models import Post  # noqa: E402
+from exports.exporters import ndjson_lines, post_export  # noqa: E402
+
+BATCH = 20000
+
+
+def seed():
+    """
+    Creates one post per requested size with that many comments,
+    inserted with raw SQL to skip the model signals.
+    """
+    user = User.objects.create(username='exporter')
+    created_at = now()
+    with transaction.atomic(), connection.cursor() as cursor:
+        for count in args.comments:
+            post = Post.objects.create(owner=user, title=f'{count}')
+            for offset in range(0, count, BATCH):
+                cursor.executemany(
+                    'INSERT INTO comments_comment (owner_id, post_id, '
+                    'created_at, updated_at, content, path, depth, '
+                    'replies_count) VALUES (%s, %s, %s, %s, %s, %s, 0, 0)',
+                    [
+                        (user.id, post.id, created_at, created_at,
+                         'a comment of a few words', '')
+                        for _ in range(min(BATCH, count - offset))
+                    ]
+                )
+
+
+def main():
+    call_command('migrate', verbosity=0)
+    if not Post.objects.exists():
+        print('Seeding...', flush=True)
+        seed()
+
+    print(f'{"comments":>10} {"lines":>10} {"peak MiB":>9} {"seconds":>8}')
+    for count in args.comments:
+        post = Post.objects.get(title=f'{count}')
+        start = time.perf_counter()
+        lines = sum(1 for _ in ndjson_lines(post_export(post.id)))
+        elapsed = time.perf_counter() - start
+        # Traced separately, as tracing slows allocations down
+        tracemalloc.start()
+        sum(1 for _ in ndjson_lines(post_export(post.id)))
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            f'{count:>10} {lines:>10} {peak / 2 ** 20:>9.2f} '
+            f'{elapsed:>8.2f}'
+        )
+
+
+if __name__ == '__main__':
+    main()
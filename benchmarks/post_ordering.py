@@ -0,0 +1,186 @@
+"""
+Measures the latency of the /posts/ popularity orderings page by page
+over a seeded dataset (1M likes by default), against the join-and-group
+queries they replace.
+
+Run from the repository root with the usual environment variables:
+
+    python benchmarks/post_ordering.py [--likes 1000000] [--pages 200]
+
+The data is seeded into its own SQLite database (--database) on the
+first run and reused by later runs; delete the file to reseed.
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import timedelta
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+parser = argparse.ArgumentParser(description=__doc__.split('\n\n')[0])
+parser.add_argument('--likes', type=int, default=1000000)
+parser.add_argument('--users', type=int, default=2000)
+parser.add_argument('--posts', type=int, default=50000)
+parser.add_argument('--comments', type=int, default=200000)
+parser.add_argument('--pages', type=int, default=200)
+parser.add_argument(
+    '--database', default='/tmp/post_ordering_benchmark.sqlite3'
+)
+args = parser.parse_args()
+
+os.environ['DATABASE_URL'] = f'sqlite:///{args.database}'
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'api_retrospective.settings')
+
+import django  # noqa: E402
+
+django.setup()
+
+from io import StringIO  # noqa: E402
+from django.conf import settings  # noqa: E402
+from django.core.cache import caches  # noqa: E402
+from django.contrib.auth.models import User  # noqa: E402
+from django.core.management import call_command  # noqa: E402
+from django.db import connection, transaction  # noqa: E402
+from django.db.models import Count  # noqa: E402
+from django.utils.timezone import now  # noqa: E402
+from rest_framework.test import APIClient  # noqa: E402
+from posts.models import Post  # noqa: E402
+
+BATCH = 20000
+REPEATS = 3
+PAGE_MARKS = [1, 10, 50, 100, 200, 500, 1000]
+
+
+def seed():
+    """
+    Inserts users, posts, likes and comments with raw SQL, skipping
+    the model signals, then fills in the denormalized post columns.
+    """
+    random.seed(0)
+    start = now() - timedelta(days=60)
+    with transaction.atomic(), connection.cursor() as cursor:
+        User.objects.bulk_create(
+            User(username=f'user{i}') for i in range(args.users)
+        )
+        user_ids = list(User.objects.values_list('id', flat=True))
+        Post.objects.bulk_create((
+            Post(owner_id=random.choice(user_ids), title=f'post {i}')
+            for i in range(args.posts)
+        ), batch_size=BATCH)
+        post_ids = list(Post.objects.values_list('id', flat=True))
+
+        per_user = args.likes // len(user_ids)
+        rows = []
+        for owner_id in user_ids:
+            for post_id in random.sample(post_ids, per_user):
+                liked_at = start + timedelta(seconds=random.randrange(5184000))
+                rows.append((owner_id, post_id, liked_at))
+            if len(rows) >= BATCH:
+                cursor.executemany(
+                    'INSERT INTO likes_like (owner_id, post_id, created_at) '
+                    'VALUES (%s, %s, %s)', rows
+                )
+                rows = []
+        cursor.executemany(
+            'INSERT INTO likes_like (owner_id, post_id, created_at) '
+            'VALUES (%s, %s, %s)', rows
+        )
+
+        created_at = now()
+        for offset in range(0, args.comments, BATCH):
+            cursor.executemany(
+                'INSERT INTO comments_comment '
+                '(owner_id, post_id, created_at, updated_at, content) '
+                'VALUES (%s, %s, %s, %s, %s)',
+                [
+                    (random.choice(user_ids), random.choice(post_ids),
+                     created_at, created_at, 'comment')
+                    for _ in range(min(BATCH, args.comments - offset))
+                ]
+            )
+    call_command('reconcile_post_counts', stdout=StringIO())
+    with connection.cursor() as cursor:
+        cursor.execute('ANALYZE')
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000
+
+
+def walk_cursor_pages(client, ordering):
+    """
+    Follows the `next` links of an ordering and returns the latency
+    of each page in milliseconds, the best of REPEATS requests.
+    """
+    url = f'/posts/?ordering={ordering}&pagination=cursor'
+    latencies = []
+    seen = set()
+    while url and len(latencies) < args.pages:
+        best = None
+        for _ in range(REPEATS):
+            caches['responses'].clear()
+            start = time.perf_counter()
+            response = client.get(url)
+            elapsed = (time.perf_counter() - start) * 1000
+            best = elapsed if best is None else min(best, elapsed)
+        latencies.append(best)
+        ids = {post['id'] for post in response.data['results']}
+        assert not ids & seen, 'pages overlap'
+        seen |= ids
+        url = response.data['next']
+    return latencies
+
+
+def main():
+    call_command('migrate', verbosity=0)
+    if not Post.objects.exists():
+        print('Seeding...', flush=True)
+        seed()
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT COUNT(*) FROM likes_like')
+        likes = cursor.fetchone()[0]
+    print(
+        f'{User.objects.count()} users, {Post.objects.count()} posts, '
+        f'{likes} likes'
+    )
+
+    print('\nJoin-and-group queries replaced (ms):')
+    baselines = {
+        '-likes_count': lambda offset: list(
+            Post.objects.annotate(total=Count('likes'))
+            .order_by('-total')[offset:offset + 10]
+        ),
+        '-likes__created_at': lambda offset: list(
+            Post.objects.order_by('-likes__created_at')[offset:offset + 10]
+        ),
+    }
+    for ordering, query in baselines.items():
+        page_1 = timed(lambda: query(0))
+        page_100 = timed(lambda: query(990))
+        print(
+            f'  {ordering:<20} page 1: {page_1:8.1f}  '
+            f'page 100: {page_100:8.1f}'
+        )
+
+    settings.ALLOWED_HOSTS.append('testserver')
+    client = APIClient()
+    print('\nIndexed orderings through /posts/, cursor pages (ms):')
+    for ordering in ['-likes_count', '-comments_count', '-likes__created_at']:
+        latencies = walk_cursor_pages(client, ordering)
+        marks = '  '.join(
+            f'p{page}: {latencies[page - 1]:5.1f}'
+            for page in PAGE_MARKS if page <= len(latencies)
+        )
+        print(f'  {ordering:<20} {marks}')
+
+    print('\nQuery plan of a -likes_count page:')
+    print(Post.objects.order_by('-likes_count', '-id')[:10].explain())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:34
+
+from django.db import migrations, models
+from django.db.models import CharField, Value
+from django.db.models.functions import Cast, Concat, LPad
+import django.db.models.deletion
+
+
+def backfill_paths(apps, schema_editor):
+    """
+    Gives every existing, top-level, comment the path of its own id.
+    """
+    Comment = apps.get_model('comments', 'Comment')
+    Comment.objects.update(path=Concat(
+        LPad(Cast('id', output_field=CharField()), 10, Value('0')),
+        Value('/'),
+    ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('comments', '0002_keyset_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='depth',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='parent',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='replies', to='comments.comment'),
+        ),
+        migrations.AddField(
+            model_name='comment',
+            name='path',
+            field=models.CharField(db_index=True, default='', editable=False, max_length=255),
+        ),
+        migrations.RunPython(backfill_paths, migrations.RunPython.noop),
+        migrations.AddField(
+            model_name='comment',
+            name='replies_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='comment',
+            index=models.Index(fields=['post', 'depth', '-created_at', '-id'], name='comment_post_depth_created_idx'),
+        ),
+    ]
@@ -1,22 +1,136 @@
-from django.db import models
+from django.db import models, transaction
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
+from posts.counters import buffer_counts
 from posts.models import Post
 
 
+# Digits of each id in Comment.path, and the deepest reply that fits
+PATH_DIGITS = 10
+MAX_DEPTH = 255 // (PATH_DIGITS + 1) - 1
+
+
 class Comment(models.Model):
     """
     Comment model related to a User and a Post.
     The 'owner' is the user who created the comment.
     The 'post' is the post to which the comment belongs.
+    The optional 'parent' is the comment that this one replies to.
+    'path' is the materialized path of the comment: the zero-padded ids
+    of its ancestors and itself, like '0000000012/0000000034/'.
+    Ordering by it lists a thread depth first.
     """
     owner = models.ForeignKey(User, on_delete=models.CASCADE)
     post = models.ForeignKey(Post, on_delete=models.CASCADE)
+    parent = models.ForeignKey(
+        'self', related_name='replies', on_delete=models.CASCADE,
+        null=True, blank=True,
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     content = models.TextField()
+    path = models.CharField(
+        max_length=255, default='', editable=False, db_index=True
+    )
+    depth = models.IntegerField(default=0, editable=False)
+    # Denormalized count of direct replies, kept by the signals below
+    replies_count = models.IntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Serve the keyset pagination on (created_at, id),
+            # globally and within a post's comments
+            models.Index(
+                fields=['-created_at', '-id'], name='comment_created_id_idx'
+            ),
+            models.Index(
+                fields=['post', '-created_at', '-id'],
+                name='comment_post_created_id_idx',
+            ),
+            # Serves a post's top-level comments, newest first
+            models.Index(
+                fields=['post', 'depth', '-created_at', '-id'],
+                name='comment_post_depth_created_idx',
+            ),
+        ]
 
     def __str__(self):
         return self.content
+
+    def save(self, *args, **kwargs):
+        """
+        Fills in the path and depth of a new comment from its parent.
+        The path ends with the comment's own id, so it is set by an
+        update right after the insert, in the same transaction.
+        """
+        if not self._state.adding:
+            return super().save(*args, **kwargs)
+        with transaction.atomic():
+            parent_path = self.parent.path if self.parent_id else ''
+            self.depth = self.parent.depth + 1 if self.parent_id else 0
+            super().save(*args, **kwargs)
+            self.path = parent_path + f'{self.pk:0{PATH_DIGITS}d}/'
+            Comment.objects.filter(pk=self.pk).update(path=self.path)
+
+    def get_descendants(self):
+        """
+        Returns the replies to the comment at any depth, as a range of
+        paths that the path index serves.
+        """
+        # ':' sorts right after the digits, so it bounds the paths
+        # that start with this one
+        return Comment.objects.filter(
+            path__gt=self.path, path__lt=self.path + ':'
+        )
+
+
+def increment_comments_count(sender, instance, created, **kwargs):
+    """
+    Increments the post's comments_count when a new comment is created.
+    """
+    if not created or buffer_counts(instance.post_id, comments=1):
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comments_count=F('comments_count') + 1
+    )
+
+
+def decrement_comments_count(sender, instance, **kwargs):
+    """
+    Decrements the post's comments_count when a comment is deleted.
+    """
+    if buffer_counts(instance.post_id, comments=-1):
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        comments_count=F('comments_count') - 1
+    )
+
+
+def increment_replies_count(sender, instance, created, **kwargs):
+    """
+    Increments the parent's replies_count when a new reply is created.
+    """
+    if created and instance.parent_id:
+        Comment.objects.filter(pk=instance.parent_id).update(
+            replies_count=F('replies_count') + 1
+        )
+
+
+def decrement_replies_count(sender, instance, **kwargs):
+    """
+    Decrements the parent's replies_count when a reply is deleted.
+    """
+    if instance.parent_id:
+        Comment.objects.filter(pk=instance.parent_id).update(
+            replies_count=F('replies_count') - 1
+        )
+
+
+# Keeps Post.comments_count and Comment.replies_count in step with
+# the comments table
+post_save.connect(increment_comments_count, sender=Comment)
+post_delete.connect(decrement_comments_count, sender=Comment)
+post_save.connect(increment_replies_count, sender=Comment)
+post_delete.connect(decrement_replies_count, sender=Comment)
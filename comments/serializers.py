@@ -1,24 +1,55 @@
 from django.contrib.humanize.templatetags.humanize import naturaltime
-from rest_framework import serializers
-from .models import Comment
+from rest_framework import ISO_8601, serializers
+from api_retrospective.owner_summaries import (
+    OwnerImageVariantsField, OwnerSummaryField,
+)
+from api_retrospective.sparse_fields import SparseFieldsSerializerMixin
+from .models import MAX_DEPTH, Comment
 
 
-class CommentSerializer(serializers.ModelSerializer):
+class CommentSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     """
     Serializer for the Comment model.
     Adds additional fields for owner details and formatted timestamps.
+    `created_at` and `updated_at` are naturaltime strings, with ISO 8601
+    copies in `created_at_iso` and `updated_at_iso` for clients that
+    render relative times themselves; `?omit=created_at,updated_at`
+    leaves out the naturaltime strings.
     """
-    owner = serializers.ReadOnlyField(source='owner.username')
+    owner = OwnerSummaryField('username', source='owner_id')
     is_owner = serializers.SerializerMethodField()
-    profile_id = serializers.ReadOnlyField(source='owner.profile.id')
-    profile_image = serializers.ReadOnlyField(source='owner.profile.image.url')
+    profile_id = OwnerSummaryField('profile_id', source='owner_id')
+    profile_image = OwnerSummaryField('profile_image', source='owner_id')
+    profile_image_variants = OwnerImageVariantsField(source='owner_id')
     created_at = serializers.SerializerMethodField()
     updated_at = serializers.SerializerMethodField()
+    created_at_iso = serializers.DateTimeField(
+        source='created_at', format=ISO_8601, read_only=True
+    )
+    updated_at_iso = serializers.DateTimeField(
+        source='updated_at', format=ISO_8601, read_only=True
+    )
+
+    def validate(self, data):
+        """Checks that a reply is on its parent's post and not too deep."""
+        parent = data.get('parent')
+        if parent is not None:
+            if parent.post_id != data['post'].id:
+                raise serializers.ValidationError({'parent': (
+                    'Replies must be on the same post as their parent.'
+                )})
+            if parent.depth >= MAX_DEPTH:
+                raise serializers.ValidationError({'parent': (
+                    f'Replies can be nested at most {MAX_DEPTH} deep.'
+                )})
+        return data
 
     def get_is_owner(self, obj):
         """Checks if the current user is the owner of the comment."""
         request = self.context.get('request')
-        return request and request.user == obj.owner
+        return request and request.user.pk == obj.owner_id
 
     def get_created_at(self, obj):
         """Returns the human-readable version of the creation timestamp."""
@@ -32,13 +63,40 @@ class CommentSerializer(serializers.ModelSerializer):
         model = Comment
         fields = [
             'id', 'owner', 'is_owner', 'profile_id', 'profile_image',
-            'post', 'created_at', 'updated_at', 'content',
+            'profile_image_variants',
+            'post', 'parent', 'depth', 'replies_count',
+            'created_at', 'updated_at', 'created_at_iso',
+            'updated_at_iso', 'content',
         ]
 
 
 class CommentDetailSerializer(CommentSerializer):
     """
     Serializer for the Comment model used in detail views.
-    The `post` field is read-only to avoid setting it on updates.
+    The `post` and `parent` fields are read-only to avoid setting them
+    on updates.
+    """
+    post = serializers.ReadOnlyField(source='post_id')
+    parent = serializers.ReadOnlyField(source='parent_id')
+
+
+class CommentThreadSerializer(CommentSerializer):
     """
-    post = serializers.ReadOnlyField(source='post.id')
+    Serializer for a top-level comment with the first replies of its
+    thread, depth first, as resolved by the view into the `replies`
+    context map. `replies_next` links to the rest of the thread.
+    """
+    replies = serializers.SerializerMethodField()
+    replies_next = serializers.SerializerMethodField()
+
+    def get_replies(self, obj):
+        replies = self.context['replies'][obj.id]['results']
+        return CommentSerializer(
+            replies, many=True, context=self.context
+        ).data
+
+    def get_replies_next(self, obj):
+        return self.context['replies'][obj.id]['next']
+
+    class Meta(CommentSerializer.Meta):
+        fields = CommentSerializer.Meta.fields + ['replies', 'replies_next']
@@ -1,4 +1,8 @@
 from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils.dateparse import parse_datetime
 from rest_framework.test import APITestCase
 from rest_framework import status
 from .models import Comment
@@ -123,3 +127,258 @@ class CommentsCreateDetailViewTest(APITestCase):
         response = self.client.delete(f'/comments/{self.comment1.id}/')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
         self.assertTrue(Comment.objects.filter(id=self.comment1.id).exists())
+
+
+class CommentCursorPaginationTest(APITestCase):
+    def setUp(self):
+        """
+        Set up a post with more comments than fit on one page.
+        """
+        user = User.objects.create_user(
+            username='testuser1', password='testpassword'
+        )
+        self.post = Post.objects.create(owner=user, title='Test Title')
+        other_post = Post.objects.create(owner=user, title='Other Title')
+        self.comments = [
+            Comment.objects.create(
+                owner=user, post=self.post, content=f'comment {i}'
+            )
+            for i in range(15)
+        ]
+        Comment.objects.create(owner=user, post=other_post, content='other')
+
+    def test_cursor_pages_walk_a_posts_comments(self):
+        """
+        Test that cursor pages return all comments of the filtered post.
+        """
+        response = self.client.get(
+            f'/comments/?post={self.post.id}&pagination=cursor'
+        )
+        first_page = response.data['results']
+        self.assertEqual(len(first_page), 10)
+        response = self.client.get(response.data['next'])
+        second_page = response.data['results']
+        self.assertIsNone(response.data['next'])
+        self.assertEqual(
+            [comment['id'] for comment in first_page + second_page],
+            [comment.id for comment in reversed(self.comments)]
+        )
+
+
+class CommentConditionalGetTest(APITestCase):
+    def setUp(self):
+        """
+        Set up a comment to revalidate.
+        """
+        user = User.objects.create_user(
+            username='testuser1', password='testpassword'
+        )
+        post = Post.objects.create(owner=user, title='Test Title')
+        self.comment = Comment.objects.create(
+            owner=user, post=post, content='comment'
+        )
+        self.url = f'/comments/{self.comment.id}/'
+
+    def test_replies_count_leaves_out_last_modified(self):
+        """
+        Test that a comment sends no Last-Modified, as a new reply
+        changes its replies_count but not its updated_at.
+        """
+        response = self.client.get(self.url)
+        self.assertIn('ETag', response)
+        self.assertNotIn('Last-Modified', response)
+
+    def test_reply_changes_the_etag(self):
+        """
+        Test that a new reply invalidates its parent's ETag.
+        """
+        etag = self.client.get(self.url)['ETag']
+        Comment.objects.create(
+            owner=self.comment.owner, post=self.comment.post,
+            parent=self.comment, content='reply',
+        )
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['replies_count'], 1)
+
+    def test_edit_changes_the_etag(self):
+        """
+        Test that editing a comment invalidates its ETag.
+        """
+        etag = self.client.get(self.url)['ETag']
+        self.comment.content = 'edited'
+        self.comment.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['content'], 'edited')
+
+
+    def test_owner_rename_changes_the_etag(self):
+        """
+        Test that renaming the comment's owner invalidates its ETag.
+        """
+        etag = self.client.get(self.url)['ETag']
+        owner = self.comment.owner
+        owner.username = 'renamed'
+        owner.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['owner'], 'renamed')
+
+
+class CommentQueryCountTest(APITestCase):
+    def setUp(self):
+        """
+        Set up a post commented on by several users.
+        """
+        caches['responses'].clear()
+        self.users = [
+            User.objects.create_user(username=f'user{i}', password='pass')
+            for i in range(10)
+        ]
+        self.post = Post.objects.create(owner=self.users[0], title='Title')
+        self.comments = [
+            Comment.objects.create(
+                owner=user, post=self.post, content=f'comment {i}'
+            )
+            for i, user in enumerate(self.users)
+        ]
+
+    def count_queries(self, url):
+        caches['responses'].clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return len(queries)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        """
+        Test that a page of comments by ten owners costs the post
+        filter's lookup, the comments query and one owner summary query.
+        """
+        url = f'/comments/?post={self.post.id}&pagination=cursor'
+        self.assertEqual(self.count_queries(url), 3)
+        Comment.objects.exclude(pk=self.comments[0].pk).delete()
+        self.assertEqual(self.count_queries(url), 3)
+
+    def test_detail_does_not_load_the_post_or_owner(self):
+        """
+        Test that a comment is served by its validator query, the
+        comment query and the owner summary query.
+        """
+        self.assertEqual(
+            self.count_queries(f'/comments/{self.comments[3].id}/'), 3
+        )
+
+    def test_iso_timestamps_can_replace_naturaltime(self):
+        """
+        Test that ISO timestamps are returned alongside naturaltime,
+        and alone with ?omit=created_at,updated_at.
+        """
+        comment = self.comments[0]
+        response = self.client.get(f'/comments/{comment.id}/')
+        # Asserts the naturaltime format, as its text depends on how
+        # long the request took
+        created_at = str(response.data['created_at'])
+        self.assertRegex(created_at, r'^(now|.+ ago)$')
+        self.assertIsNone(parse_datetime(created_at))
+        self.assertEqual(
+            parse_datetime(response.data['created_at_iso']),
+            comment.created_at,
+        )
+        response = self.client.get(
+            f'/comments/{comment.id}/?omit=created_at,updated_at'
+        )
+        self.assertNotIn('created_at', response.data)
+        self.assertIn('updated_at_iso', response.data)
+
+
+class CommentThreadTest(APITestCase):
+    def setUp(self):
+        """
+        Set up a post with a deep thread and a few shallow ones.
+        """
+        caches['responses'].clear()
+        self.user = User.objects.create_user(
+            username='testuser1', password='testpassword'
+        )
+        self.post = Post.objects.create(owner=self.user, title='Title')
+        self.root = self.comment('root')
+        self.first = self.comment('first', self.root)
+        self.nested = self.comment('nested', self.first)
+        self.second = self.comment('second', self.root)
+        self.third = self.comment('third', self.root)
+        self.fourth = self.comment('fourth', self.root)
+
+    def comment(self, content, parent=None, post=None):
+        return Comment.objects.create(
+            owner=self.user, post=post or self.post, parent=parent,
+            content=content,
+        )
+
+    def test_replies_get_paths_depths_and_counts(self):
+        """
+        Test that replies extend their parent's path and count.
+        """
+        self.nested.refresh_from_db()
+        self.root.refresh_from_db()
+        self.assertEqual(self.nested.depth, 2)
+        self.assertEqual(
+            self.nested.path,
+            f'{self.root.id:010d}/{self.first.id:010d}/'
+            f'{self.nested.id:010d}/'
+        )
+        self.assertEqual(self.root.replies_count, 4)
+        self.fourth.delete()
+        self.root.refresh_from_db()
+        self.assertEqual(self.root.replies_count, 3)
+
+    def test_reply_must_be_on_its_parents_post(self):
+        """
+        Test that a reply to a comment on another post is rejected.
+        """
+        other_post = Post.objects.create(owner=self.user, title='Other')
+        self.client.login(username='testuser1', password='testpassword')
+        response = self.client.post('/comments/', {
+            'post': other_post.id, 'parent': self.root.id, 'content': 'hi',
+        })
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        response = self.client.post('/comments/', {
+            'post': self.post.id, 'parent': self.root.id, 'content': 'hi',
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.assertEqual(response.data['depth'], 1)
+
+    def test_threads_list_first_replies_then_link_to_the_rest(self):
+        """
+        Test that threads show their first replies depth first and
+        link to a cursor page with the rest.
+        """
+        response = self.client.get(f'/comments/threads/?post={self.post.id}')
+        [thread] = response.data['results']
+        self.assertEqual(thread['id'], self.root.id)
+        self.assertEqual(
+            [reply['content'] for reply in thread['replies']],
+            ['first', 'nested', 'second'],
+        )
+        response = self.client.get(thread['replies_next'])
+        self.assertEqual(
+            [reply['content'] for reply in response.data['results']],
+            ['third', 'fourth'],
+        )
+        self.assertIsNone(response.data['next'])
+
+    def test_threads_query_count_does_not_grow_with_threads(self):
+        """
+        Test that a page of threads costs the post filter's lookup, the
+        threads, their replies and the owner summaries.
+        """
+        url = f'/comments/threads/?post={self.post.id}&pagination=cursor'
+        for i in range(5):
+            thread = self.comment(f'thread {i}')
+            self.comment('reply', thread)
+        caches['responses'].clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(len(response.data['results']), 6)
+        self.assertEqual(len(queries), 4)
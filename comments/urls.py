@@ -3,5 +3,7 @@ from comments import views
 
 urlpatterns = [
     path('comments/', views.CommentList.as_view()),
-    path('comments/<int:pk>/', views.CommentDetail.as_view())
+    path('comments/<int:pk>/', views.CommentDetail.as_view()),
+    path('comments/threads/', views.CommentThreadList.as_view()),
+    path('comments/<int:pk>/replies/', views.CommentReplyList.as_view()),
 ]
\ No newline at end of file
@@ -1,11 +1,43 @@
+from django.conf import settings
+from django.db.models import Q
+from django.shortcuts import get_object_or_404
 from rest_framework import generics, permissions
+from rest_framework.utils.urls import replace_query_param
 from django_filters.rest_framework import DjangoFilterBackend
+from api_retrospective.conditional import (
+    ConditionalRetrieveMixin, WeakETagListMixin,
+)
+from api_retrospective.owner_summaries import get_owner_summaries
+from api_retrospective.pagination import KeysetPagination
 from api_retrospective.permissions import IsOwnerOrReadOnly
-from .models import Comment
-from .serializers import CommentSerializer, CommentDetailSerializer
+from api_retrospective.response_cache import AnonymousCacheMixin
+from .models import PATH_DIGITS, Comment
+from .serializers import (
+    CommentSerializer, CommentDetailSerializer, CommentThreadSerializer,
+)
 
 
-class CommentList(generics.ListCreateAPIView):
+def first_replies(threads, limit):
+    """
+    Maps the id of each thread to its first `limit` replies, depth
+    first. One query, with an indexed path range per thread.
+    """
+    condition = Q()
+    for thread in threads:
+        condition |= Q(pk__in=(
+            thread.get_descendants().order_by('path').values('pk')[:limit]
+        ))
+    replies = {thread.id: [] for thread in threads}
+    if threads:
+        for reply in Comment.objects.filter(condition).order_by('path'):
+            # The first id of a reply's path is its thread's
+            replies[int(reply.path[:PATH_DIGITS])].append(reply)
+    return replies
+
+
+class CommentList(
+    WeakETagListMixin, AnonymousCacheMixin, generics.ListCreateAPIView
+):
     """
     View to list all comments or create a new comment if the user is logged in.
     - Supports filtering comments by the `post` field.
@@ -13,7 +45,9 @@ class CommentList(generics.ListCreateAPIView):
     """
     serializer_class = CommentSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
+    pagination_class = KeysetPagination
     queryset = Comment.objects.all()
+    cache_dependencies = ['comments.comment', 'profiles.profile', 'auth.user']
     filter_backends = [DjangoFilterBackend]
     filterset_fields = ['post']  # Allows filtering by post ID.
 
@@ -24,7 +58,9 @@ class CommentList(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class CommentDetail(generics.RetrieveUpdateDestroyAPIView):
+class CommentDetail(
+    ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     View to retrieve, update, or delete a specific comment by its ID.
     - Only the owner of the comment can update or delete it.
@@ -33,3 +69,85 @@ class CommentDetail(generics.RetrieveUpdateDestroyAPIView):
     permission_classes = [IsOwnerOrReadOnly]
     serializer_class = CommentDetailSerializer
     queryset = Comment.objects.all()
+    validator_fields = [
+        'updated_at', 'replies_count', 'owner__profile__updated_at',
+        'owner__username',
+    ]
+
+
+class CommentThreadList(
+    WeakETagListMixin, AnonymousCacheMixin, generics.ListAPIView
+):
+    """
+    Lists top-level comments, newest first, each with the first
+    COMMENT_THREAD_REPLIES replies of its thread and a `replies_next`
+    link to the rest. A page costs a fixed number of queries.
+    - Supports filtering threads by the `post` field.
+    """
+    serializer_class = CommentThreadSerializer
+    pagination_class = KeysetPagination
+    queryset = Comment.objects.filter(depth=0)
+    cache_dependencies = ['comments.comment', 'profiles.profile', 'auth.user']
+    filter_backends = [DjangoFilterBackend]
+    filterset_fields = ['post']
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get('many') and args:
+            threads = list(args[0])
+            context = self.get_serializer_context()
+            context['replies'] = self.get_thread_replies(threads)
+            # Resolves the owners of the threads and their replies,
+            # which nested serializers can't batch, together
+            comments = threads + [
+                reply for replies in context['replies'].values()
+                for reply in replies['results']
+            ]
+            context['owner_summaries'] = get_owner_summaries(
+                {comment.owner_id for comment in comments}
+            )
+            kwargs['context'] = context
+            args = (threads,) + args[1:]
+        return super().get_serializer(*args, **kwargs)
+
+    def get_thread_replies(self, threads):
+        """
+        Returns the first replies of each thread and the cursor link of
+        CommentReplyList that continues after them, by thread id.
+        """
+        limit = settings.COMMENT_THREAD_REPLIES
+        # One more reply than shown tells whether there are more
+        found = first_replies(threads, limit + 1)
+        pagination = self.pagination_class()
+        thread_replies = {}
+        for thread in threads:
+            replies = found[thread.id]
+            next_link = None
+            if len(replies) > limit:
+                replies = replies[:limit]
+                cursor = pagination.encode_cursor(
+                    [replies[-1].path, replies[-1].id]
+                )
+                next_link = self.request.build_absolute_uri(
+                    f'/comments/{thread.id}/replies/'
+                    f'?{pagination.mode_query_param}=cursor'
+                )
+                next_link = replace_query_param(
+                    next_link, pagination.cursor_query_param, cursor
+                )
+            thread_replies[thread.id] = {'results': replies, 'next': next_link}
+        return thread_replies
+
+
+class CommentReplyList(generics.ListAPIView):
+    """
+    Lists the replies below a comment at any depth, depth first, so
+    that each reply follows its parent.
+    """
+    serializer_class = CommentSerializer
+    pagination_class = KeysetPagination
+
+    def get_queryset(self):
+        comment = get_object_or_404(
+            Comment.objects.only('path'), pk=self.kwargs['pk']
+        )
+        return comment.get_descendants().order_by('path')
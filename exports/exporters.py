@@ -0,0 +1,65 @@
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+from comments.models import Comment
+from followers.models import Follower
+from likes.models import Like
+from posts.models import Post
+
+# The columns exported of each model, by row type
+EXPORT_FIELDS = {
+    'post': [
+        'id', 'owner_id', 'created_at', 'updated_at', 'title',
+        'description', 'location', 'image', 'category',
+        'likes_count', 'comments_count',
+    ],
+    'comment': [
+        'id', 'owner_id', 'post_id', 'parent_id', 'created_at',
+        'updated_at', 'content',
+    ],
+    'like': ['id', 'owner_id', 'post_id', 'created_at'],
+    'follower': ['id', 'owner_id', 'followed_id', 'created_at'],
+}
+
+
+def export_rows(row_type, queryset):
+    """
+    Yields the exported columns of each row of `queryset` as a dict,
+    tagged with `row_type`. Rows are read in id order through a
+    server-side cursor where the database has one, EXPORT_CHUNK_SIZE
+    at a time, and never held as model instances.
+    """
+    rows = queryset.order_by('id').values(*EXPORT_FIELDS[row_type])
+    for row in rows.iterator(chunk_size=settings.EXPORT_CHUNK_SIZE):
+        yield {'type': row_type, **row}
+
+
+def post_export(post_id):
+    """
+    Yields a post, then its comments and its likes.
+    """
+    yield from export_rows('post', Post.objects.filter(pk=post_id))
+    yield from export_rows('comment', Comment.objects.filter(post=post_id))
+    yield from export_rows('like', Like.objects.filter(post=post_id))
+
+
+def user_export(user_id):
+    """
+    Yields a user's posts, comments and likes, then their follows
+    of others and others' follows of them.
+    """
+    yield from export_rows('post', Post.objects.filter(owner=user_id))
+    yield from export_rows('comment', Comment.objects.filter(owner=user_id))
+    yield from export_rows('like', Like.objects.filter(owner=user_id))
+    yield from export_rows('follower', Follower.objects.filter(
+        Q(owner=user_id) | Q(followed=user_id)
+    ))
+
+
+def ndjson_lines(rows):
+    """
+    Encodes each row as one line of newline-delimited JSON.
+    """
+    encoder = DjangoJSONEncoder()
+    for row in rows:
+        yield encoder.encode(row) + '\n'
@@ -0,0 +1,40 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from posts.models import Post
+from exports.exporters import ndjson_lines, post_export, user_export
+
+
+class Command(BaseCommand):
+    """
+    Writes a post's or a user's rows as newline-delimited JSON, one
+    row at a time, to stdout or a file.
+    """
+    help = (
+        "Exports a post's comments and likes, or a user's posts, "
+        'comments, likes and follows, as newline-delimited JSON.'
+    )
+
+    def add_arguments(self, parser):
+        target = parser.add_mutually_exclusive_group(required=True)
+        target.add_argument('--post', type=int, help='Id of the post.')
+        target.add_argument('--user', type=int, help='Id of the user.')
+        parser.add_argument(
+            '--output', help='File to write to instead of stdout.',
+        )
+
+    def handle(self, *args, **options):
+        if options['post'] is not None:
+            if not Post.objects.filter(pk=options['post']).exists():
+                raise CommandError(f"Post {options['post']} does not exist.")
+            rows = post_export(options['post'])
+        else:
+            if not User.objects.filter(pk=options['user']).exists():
+                raise CommandError(f"User {options['user']} does not exist.")
+            rows = user_export(options['user'])
+
+        if options['output']:
+            with open(options['output'], 'w') as output:
+                output.writelines(ndjson_lines(rows))
+        else:
+            for line in ndjson_lines(rows):
+                self.stdout.write(line, ending='')
@@ -0,0 +1,75 @@
+import json
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from comments.models import Comment
+from followers.models import Follower
+from likes.models import Like
+from posts.models import Post
+
+
+class ExportTests(APITestCase):
+    """
+    Tests for the NDJSON exports of posts and users.
+    """
+    def setUp(self):
+        self.staff = User.objects.create_user(
+            username='staff', password='pass', is_staff=True
+        )
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.brian = User.objects.create_user(
+            username='brian', password='pass'
+        )
+        self.post = Post.objects.create(owner=self.adam, title='a post')
+        for i in range(5):
+            Comment.objects.create(
+                owner=self.brian, post=self.post, content=f'comment {i}'
+            )
+        Like.objects.create(owner=self.brian, post=self.post)
+        Follower.objects.create(owner=self.adam, followed=self.brian)
+        Follower.objects.create(owner=self.brian, followed=self.adam)
+
+    def stream(self, url):
+        response = self.client.get(url)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        content = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in content.splitlines()]
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_staff_can_stream_a_post(self):
+        self.client.login(username='staff', password='pass')
+        rows = self.stream(f'/exports/posts/{self.post.id}/')
+        self.assertEqual(
+            [row['type'] for row in rows],
+            ['post'] + ['comment'] * 5 + ['like'],
+        )
+        self.assertEqual(rows[1]['content'], 'comment 0')
+        self.assertEqual(rows[6]['owner_id'], self.brian.id)
+
+    def test_user_export_has_follows_both_ways(self):
+        self.client.login(username='staff', password='pass')
+        rows = self.stream(f'/exports/users/{self.adam.id}/')
+        self.assertEqual(
+            [row['type'] for row in rows], ['post', 'follower', 'follower']
+        )
+
+    def test_exports_are_staff_only(self):
+        self.client.login(username='adam', password='pass')
+        response = self.client.get(f'/exports/users/{self.adam.id}/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+        self.client.login(username='staff', password='pass')
+        response = self.client.get('/exports/posts/999/')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_command_writes_ndjson(self):
+        out = StringIO()
+        call_command('export_ndjson', user=self.brian.id, stdout=out)
+        rows = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(
+            [row['type'] for row in rows],
+            ['comment'] * 5 + ['like', 'follower', 'follower'],
+        )
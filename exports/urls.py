@@ -0,0 +1,7 @@
+from django.urls import path
+from exports import views
+
+urlpatterns = [
+    path('exports/posts/<int:pk>/', views.PostExport.as_view()),
+    path('exports/users/<int:pk>/', views.UserExport.as_view()),
+]
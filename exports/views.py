@@ -0,0 +1,39 @@
+from django.contrib.auth.models import User
+from django.http import StreamingHttpResponse
+from django.shortcuts import get_object_or_404
+from rest_framework import permissions
+from rest_framework.views import APIView
+from posts.models import Post
+from .exporters import ndjson_lines, post_export, user_export
+
+
+def ndjson_response(rows, filename):
+    response = StreamingHttpResponse(
+        ndjson_lines(rows), content_type='application/x-ndjson'
+    )
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+
+class PostExport(APIView):
+    """
+    Streams a post, its comments and its likes as newline-delimited
+    JSON. Staff only.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, pk):
+        post = get_object_or_404(Post.objects.only('id'), pk=pk)
+        return ndjson_response(post_export(post.id), f'post-{post.id}.ndjson')
+
+
+class UserExport(APIView):
+    """
+    Streams a user's posts, comments, likes and follows as
+    newline-delimited JSON, e.g. for data access requests. Staff only.
+    """
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, pk):
+        user = get_object_or_404(User.objects.only('id'), pk=pk)
+        return ndjson_response(user_export(user.id), f'user-{user.id}.ndjson')
@@ -0,0 +1,55 @@
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from followers.models import Follower
+from posts.models import Post
+from feed.models import FeedItem, heavy_posters_followed_by
+
+
+class Command(BaseCommand):
+    """
+    Fills the materialized home feeds from the existing follows and posts.
+    Posts by heavy posters are skipped, as the feed reads them on request.
+    """
+    help = 'Backfills the materialized home feeds.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--user', type=int, action='append', dest='users',
+            help='Only backfill the feed of this user id (repeatable).',
+        )
+        parser.add_argument(
+            '--limit', type=int, default=settings.FEED_BACKFILL_LIMIT,
+            help='Most recent posts to copy per followed user.',
+        )
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Clear each feed before filling it.',
+        )
+
+    def handle(self, *args, **options):
+        users = User.objects.order_by('pk')
+        if options['users']:
+            users = users.filter(pk__in=options['users'])
+
+        total = 0
+        for user in users.iterator():
+            feed = FeedItem.objects.filter(user=user)
+            if options['rebuild']:
+                feed.delete()
+            before = feed.count()
+            followed_ids = Follower.objects.filter(owner=user).exclude(
+                followed__in=heavy_posters_followed_by(user)
+            ).values_list('followed', flat=True)
+            for followed_id in followed_ids:
+                posts = Post.objects.filter(
+                    owner_id=followed_id
+                ).order_by('-created_at')[:options['limit']]
+                FeedItem.objects.bulk_create([
+                    FeedItem(user=user, post_id=post_id, created_at=created_at)
+                    for post_id, created_at
+                    in posts.values_list('id', 'created_at')
+                ], ignore_conflicts=True)
+            total += feed.count() - before
+
+        self.stdout.write(f'Backfilled {total} feed item(s).')
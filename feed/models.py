@@ -0,0 +1,107 @@
+from django.conf import settings
+from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.contrib.auth.models import User
+from posts.models import Post
+from followers.models import Follower
+from profiles.models import Profile
+
+
+class FeedItem(models.Model):
+    """
+    A post in a user's materialized home feed.
+    'user' is the reader and 'post' is a post by someone they follow.
+    'created_at' is copied from the post so the feed can be read
+    by (user, created_at) without touching the posts table.
+    """
+    user = models.ForeignKey(
+        User, related_name='feed_items', on_delete=models.CASCADE
+    )
+    post = models.ForeignKey(
+        Post, related_name='feed_items', on_delete=models.CASCADE
+    )
+    created_at = models.DateTimeField()
+
+    class Meta:
+        ordering = ['-created_at']
+        unique_together = ['user', 'post']
+        indexes = [
+            models.Index(
+                fields=['user', '-created_at', '-post'],
+                name='feeditem_user_created_idx',
+            ),
+        ]
+
+    def __str__(self):
+        return f'{self.user} {self.post}'
+
+
+def is_heavy_poster(user):
+    """
+    Returns True if the user has more followers than the fan-out
+    threshold, going by their profile's followers_count.
+    """
+    return Profile.objects.filter(
+        owner=user, followers_count__gt=settings.FEED_FANOUT_THRESHOLD
+    ).exists()
+
+
+def heavy_posters_followed_by(user):
+    """
+    Returns the ids of the users followed by `user` whose posts
+    are not fanned out and have to be read on request.
+    """
+    return list(
+        Profile.objects.filter(
+            owner__followed__owner=user,
+            followers_count__gt=settings.FEED_FANOUT_THRESHOLD,
+        ).values_list('owner', flat=True)
+    )
+
+
+def fan_out_post(sender, instance, created, **kwargs):
+    """
+    Copies a new post into the feeds of its owner's followers,
+    unless the owner is a heavy poster.
+    """
+    if not created or is_heavy_poster(instance.owner):
+        return
+    follower_ids = Follower.objects.filter(
+        followed=instance.owner
+    ).values_list('owner', flat=True)
+    FeedItem.objects.bulk_create([
+        FeedItem(user_id=follower_id, post=instance,
+                 created_at=instance.created_at)
+        for follower_id in follower_ids
+    ], ignore_conflicts=True)
+
+
+def add_followed_posts(sender, instance, created, **kwargs):
+    """
+    Copies the followed user's recent posts into the new follower's feed.
+    """
+    if not created or is_heavy_poster(instance.followed):
+        return
+    posts = Post.objects.filter(
+        owner=instance.followed
+    ).order_by('-created_at')[:settings.FEED_BACKFILL_LIMIT]
+    FeedItem.objects.bulk_create([
+        FeedItem(user=instance.owner, post_id=post_id, created_at=created_at)
+        for post_id, created_at in posts.values_list('id', 'created_at')
+    ], ignore_conflicts=True)
+
+
+def remove_followed_posts(sender, instance, **kwargs):
+    """
+    Trims the unfollowed user's posts from the former follower's feed.
+    """
+    FeedItem.objects.filter(
+        user_id=instance.owner_id, post__owner_id=instance.followed_id
+    ).delete()
+
+
+# Keeps the materialized feeds in step with posts and follows.
+# Deleted posts leave the feeds through the cascade on FeedItem.post.
+post_save.connect(fan_out_post, sender=Post)
+post_save.connect(add_followed_posts, sender=Follower)
+post_delete.connect(remove_followed_posts, sender=Follower)
@@ -0,0 +1,101 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import override_settings
+from rest_framework import status
+from rest_framework.test import APITestCase
+from followers.models import Follower
+from posts.models import Post
+from .models import FeedItem
+
+
+class FeedListViewTests(APITestCase):
+    """
+    Tests for the materialized home feed.
+    """
+    def setUp(self):
+        self.reader = User.objects.create_user(
+            username='reader', password='pass'
+        )
+        self.author = User.objects.create_user(
+            username='author', password='pass'
+        )
+        self.stranger = User.objects.create_user(
+            username='stranger', password='pass'
+        )
+        self.client.login(username='reader', password='pass')
+
+    def feed_titles(self):
+        response = self.client.get('/feed/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post['title'] for post in response.data['results']]
+
+    def test_logged_out_user_cant_view_feed(self):
+        self.client.logout()
+        response = self.client.get('/feed/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_new_posts_are_fanned_out_to_followers(self):
+        Follower.objects.create(owner=self.reader, followed=self.author)
+        Post.objects.create(owner=self.author, title='followed post')
+        Post.objects.create(owner=self.stranger, title='stranger post')
+        self.assertEqual(self.feed_titles(), ['followed post'])
+        self.assertEqual(FeedItem.objects.filter(user=self.reader).count(), 1)
+
+    def test_follow_backfills_and_unfollow_trims_the_feed(self):
+        Post.objects.create(owner=self.author, title='older post')
+        follow = Follower.objects.create(
+            owner=self.reader, followed=self.author
+        )
+        self.assertEqual(self.feed_titles(), ['older post'])
+        follow.delete()
+        self.assertEqual(self.feed_titles(), [])
+
+    def test_deleted_posts_leave_the_feed(self):
+        Follower.objects.create(owner=self.reader, followed=self.author)
+        post = Post.objects.create(owner=self.author, title='short lived')
+        post.delete()
+        self.assertFalse(FeedItem.objects.exists())
+        self.assertEqual(self.feed_titles(), [])
+
+    @override_settings(FEED_FANOUT_THRESHOLD=0)
+    def test_heavy_posters_are_read_on_request(self):
+        Follower.objects.create(owner=self.reader, followed=self.author)
+        Post.objects.create(owner=self.author, title='heavy post')
+        self.assertFalse(FeedItem.objects.exists())
+        self.assertEqual(self.feed_titles(), ['heavy post'])
+
+    def test_cursor_pages_merge_both_sources(self):
+        Follower.objects.create(owner=self.reader, followed=self.author)
+        Follower.objects.create(owner=self.reader, followed=self.stranger)
+        with override_settings(FEED_FANOUT_THRESHOLD=0):
+            heavy = [
+                Post.objects.create(owner=self.stranger, title=f'heavy {i}')
+                for i in range(6)
+            ]
+        light = [
+            Post.objects.create(owner=self.author, title=f'light {i}')
+            for i in range(6)
+        ]
+        seen = []
+        url = '/feed/'
+        with override_settings(FEED_FANOUT_THRESHOLD=1):
+            # stranger now has a second follower and is read on request
+            Follower.objects.create(owner=self.author, followed=self.stranger)
+            while url:
+                response = self.client.get(url)
+                seen += [post['id'] for post in response.data['results']]
+                url = response.data['next']
+        expected = sorted(heavy + light, key=lambda post: (
+            post.created_at, post.id
+        ), reverse=True)
+        self.assertEqual(seen, [post.id for post in expected])
+
+    def test_backfill_command_rebuilds_feeds(self):
+        Follower.objects.create(owner=self.reader, followed=self.author)
+        Post.objects.create(owner=self.author, title='a post')
+        FeedItem.objects.all().delete()
+        out = StringIO()
+        call_command('backfill_feeds', stdout=out)
+        self.assertIn('Backfilled 1 feed item(s).', out.getvalue())
+        self.assertEqual(self.feed_titles(), ['a post'])
@@ -0,0 +1,76 @@
+import heapq
+from rest_framework import generics, permissions
+from api_retrospective.pagination import KeysetPagination
+from posts.models import Post
+from posts.serializers import PostSerializer
+from posts.views import LikeIdsMixin
+from .models import FeedItem, heavy_posters_followed_by
+
+
+class FeedPagination(KeysetPagination):
+    """
+    Cursor pagination for the home feed, keyed on (created_at, post id).
+    Merges a page of the user's materialized feed with the matching
+    page of posts by heavy posters, which are read on request.
+    The feed is always in cursor mode and has no page numbers.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.keyset = [
+            (Post._meta.get_field('created_at'), True),
+            (Post._meta.pk, True),
+        ]
+        item_keyset = [
+            (FeedItem._meta.get_field('created_at'), True),
+            (FeedItem._meta.get_field('post'), True),
+        ]
+        page_size = self.get_page_size(request)
+        cursor = self.decode_cursor(request)
+
+        items = queryset.order_by('-created_at', '-post_id')
+        posts = view.get_fan_out_on_read_queryset().order_by(
+            '-created_at', '-id'
+        )
+        if cursor is not None:
+            items = items.filter(self.get_keyset_filter(cursor, item_keyset))
+            posts = posts.filter(self.get_keyset_filter(cursor))
+
+        keys = heapq.merge(
+            items.values_list('created_at', 'post_id')[:page_size + 1],
+            posts.values_list('created_at', 'id')[:page_size + 1],
+            reverse=True,
+        )
+        post_ids = []
+        for _, post_id in keys:
+            if post_id not in post_ids:
+                post_ids.append(post_id)
+            if len(post_ids) > page_size:
+                break
+
+        self.has_next = len(post_ids) > page_size
+        post_ids = post_ids[:page_size]
+        found = Post.objects.in_bulk(post_ids)
+        self.page = [found[pk] for pk in post_ids if pk in found]
+        return self.page
+
+
+class FeedList(LikeIdsMixin, generics.ListAPIView):
+    """
+    Lists the posts of the users you follow, newest first.
+    Reads the materialized feed, plus the posts of any heavy posters.
+    """
+    serializer_class = PostSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    pagination_class = FeedPagination
+
+    def get_queryset(self):
+        return FeedItem.objects.filter(user=self.request.user)
+
+    def get_fan_out_on_read_queryset(self):
+        """
+        Returns the posts that are not fanned out on write:
+        those by followed users above the follower threshold.
+        """
+        heavy_posters = heavy_posters_followed_by(self.request.user)
+        return Post.objects.filter(owner__in=heavy_posters)
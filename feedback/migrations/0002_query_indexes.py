@@ -0,0 +1,17 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('feedback', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='feedback',
+            index=models.Index(fields=['-created_at', '-id'], name='feedback_created_id_idx'),
+        ),
+    ]
@@ -13,6 +13,11 @@ class Feedback(models.Model):
     class Meta:
         """Order the most recent feedback first."""
         ordering = ['-created_at']
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'], name='feedback_created_id_idx'
+            ),
+        ]
 
     def __str__(self):
         return self.content
@@ -4,4 +4,5 @@ from feedback import views
 
 urlpatterns = [
     path('feedback/', views.FeedbackList.as_view()),
+    path('feedback/search/', views.FeedbackSearch.as_view()),
 ]
\ No newline at end of file
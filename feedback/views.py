@@ -1,4 +1,7 @@
-from rest_framework import generics, filters
+from rest_framework import generics
+from search.filters import IndexedSearchFilter
+from search.models import SEARCH_FIELDS
+from search.views import RankedSearchList
 from .models import Feedback
 from .serializers import FeedbackSerializer
 
@@ -10,6 +13,13 @@ class FeedbackList(generics.ListCreateAPIView):
     serializer_class = FeedbackSerializer
 
     filter_backends = [
-        filters.SearchFilter,
+        IndexedSearchFilter,
     ]
-    search_fields = ['first_name', 'last_name', 'email', 'content']
+    search_fields = SEARCH_FIELDS[Feedback]
+
+
+class FeedbackSearch(RankedSearchList):
+    """Lists the feedback matching `?q=`, best match first."""
+
+    queryset = Feedback.objects.all()
+    serializer_class = FeedbackSerializer
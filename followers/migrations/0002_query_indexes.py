@@ -0,0 +1,21 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('followers', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='follower',
+            index=models.Index(fields=['-created_at', '-id'], name='follower_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='follower',
+            index=models.Index(fields=['followed', '-created_at'], name='follower_followed_created_idx'),
+        ),
+    ]
@@ -1,4 +1,4 @@
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth.models import User
 
 
@@ -19,6 +19,24 @@ class Follower(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ['owner', 'followed']
+        indexes = [
+            # Serves the follower list, newest first
+            models.Index(
+                fields=['-created_at', '-id'], name='follower_created_id_idx'
+            ),
+            # Serves a user's followers, newest first; the unique
+            # (owner, followed) index already serves who a user follows
+            models.Index(
+                fields=['followed', '-created_at'],
+                name='follower_followed_created_idx',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Commits a new row together with the profile counters that its
+        # post_save signals update; deletes are atomic already
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f'{self.owner} {self.followed}'
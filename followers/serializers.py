@@ -1,12 +1,14 @@
-from django.db import IntegrityError
 from rest_framework import serializers
+from api_retrospective.idempotent import create_or_get
 from .models import Follower
 
 
 class FollowerSerializer(serializers.ModelSerializer):
     """
     Serializer for the Follower model.
-    The create method handles the unique constraint on 'owner' and 'followed'.
+    Following a user already followed returns the existing follower,
+    with `created` set to False, rather than failing the unique
+    constraint on 'owner' and 'followed'.
     """
     owner = serializers.ReadOnlyField(source='owner.username')
     followed_name = serializers.ReadOnlyField(source='followed.username')
@@ -18,7 +20,5 @@ class FollowerSerializer(serializers.ModelSerializer):
         ]
 
     def create(self, validated_data):
-        try:
-            return super().create(validated_data)
-        except IntegrityError:
-            raise serializers.ValidationError({'detail': 'possible duplicate'})
+        instance, self.created = create_or_get(Follower, **validated_data)
+        return instance
@@ -76,3 +76,39 @@ class FeedbackListTest(APITestCase):
         self.client.login(username='testuser', password='testpassword')
         response = self.client.get('/feedback/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class FollowerListViewTests(APITestCase):
+    """
+    Tests for the FollowerList view.
+    """
+    def setUp(self):
+        self.tester = User.objects.create_user(
+            username='tester', password='test123'
+        )
+        self.followed = User.objects.create_user(
+            username='followed', password='test321'
+        )
+
+    def test_logged_in_user_can_follow_a_user(self):
+        self.client.login(username='tester', password='test123')
+        response = self.client.post('/followers/', {
+            'followed': self.followed.id
+        })
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+        self.followed.profile.refresh_from_db()
+        self.assertEqual(self.followed.profile.followers_count, 1)
+
+    def test_following_a_user_twice_returns_the_existing_follower(self):
+        follower = Follower.objects.create(
+            owner=self.tester, followed=self.followed
+        )
+        self.client.login(username='tester', password='test123')
+        response = self.client.post('/followers/', {
+            'followed': self.followed.id
+        })
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], follower.id)
+        self.assertEqual(Follower.objects.count(), 1)
+        self.followed.profile.refresh_from_db()
+        self.assertEqual(self.followed.profile.followers_count, 1)
@@ -1,14 +1,16 @@
 from rest_framework import generics, permissions
+from api_retrospective.idempotent import IdempotentCreateMixin
 from api_retrospective.permissions import IsOwnerOrReadOnly
 from .models import Follower
 from .serializers import FollowerSerializer
 
 
-class FollowerList(generics.ListCreateAPIView):
+class FollowerList(IdempotentCreateMixin, generics.ListCreateAPIView):
     """
     List all followers, i.e., all instances of a user following another user.
     Create a follower, i.e., follow a user if logged in.
     Perform_create: associate the current logged-in user with a follower.
+    Following a user again returns the existing follower with a 200.
     """
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     queryset = Follower.objects.all()
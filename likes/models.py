@@ -1,6 +1,10 @@
-from django.db import models
+from django.db import connections, models
+from django.db.models import Count, F, Max, Subquery, OuterRef
+from django.db.models.functions import Coalesce, Greatest
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
-from posts.models import Post
+from posts.counters import buffer_counts
+from posts.models import NEVER_LIKED, Post
 
 
 class Like(models.Model):
@@ -18,6 +22,141 @@ class Like(models.Model):
     class Meta:
         ordering = ['-created_at']
         unique_together = ['owner', 'post']
+        indexes = [
+            # Serves the like list, newest first
+            models.Index(
+                fields=['-created_at', '-id'], name='like_created_id_idx'
+            ),
+            # Serves a post's newest like, for Post.last_liked_at
+            models.Index(
+                fields=['post', '-created_at'], name='like_post_created_idx'
+            ),
+        ]
 
     def __str__(self):
         return f'{self.owner} {self.post}'
+
+
+def last_liked_at():
+    """
+    Returns a subquery for the time of the outer post's newest like.
+    """
+    return Coalesce(Subquery(
+        Like.objects.filter(post=OuterRef('pk'))
+        .order_by().values('post')
+        .annotate(newest=Max('created_at')).values('newest')
+    ), NEVER_LIKED)
+
+
+def increment_likes_count(sender, instance, created, **kwargs):
+    """
+    Increments the post's likes_count and moves its last_liked_at
+    when a new like is created.
+    """
+    if not created or buffer_counts(instance.post_id, likes=1):
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        likes_count=F('likes_count') + 1,
+        last_liked_at=Greatest('last_liked_at', instance.created_at),
+    )
+
+
+def decrement_likes_count(sender, instance, **kwargs):
+    """
+    Decrements the post's likes_count and recomputes its
+    last_liked_at when a like is deleted.
+    """
+    if buffer_counts(instance.post_id, likes=-1):
+        return
+    Post.objects.filter(pk=instance.post_id).update(
+        likes_count=F('likes_count') - 1,
+        last_liked_at=last_liked_at(),
+    )
+
+
+# Keeps Post.likes_count and last_liked_at in step with the likes table
+post_save.connect(increment_likes_count, sender=Like)
+post_delete.connect(decrement_likes_count, sender=Like)
+
+
+def like_count():
+    """
+    Returns a subquery counting the outer post's likes.
+    """
+    return Coalesce(Subquery(
+        Like.objects.filter(post=OuterRef('pk'))
+        .order_by().values('post')
+        .annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+def like_posts(user, post_ids):
+    """
+    Likes the given posts as `user` with one bulk insert, skipping the
+    posts they already like, and moves the counters of the posts whose
+    like this insert made with one UPDATE. Returns the user's like ids
+    on the given posts, by post id, and the ids of the posts liked now.
+    Bulk inserts send no signals, so call it in a transaction and
+    invalidate cached responses after.
+    """
+    liked = set(Like.objects.filter(
+        owner=user, post__in=post_ids
+    ).values_list('post_id', flat=True))
+    likes = [
+        Like(owner=user, post_id=post_id)
+        for post_id in post_ids if post_id not in liked
+    ]
+    # A like made meanwhile is skipped by the insert, and keeps its own
+    # created_at, which tells it apart from the likes inserted here
+    Like.objects.bulk_create(likes, ignore_conflicts=True)
+    created_at = {like.post_id: like.created_at for like in likes}
+    like_ids, inserted = {}, []
+    for like_id, post_id, stored_at in Like.objects.filter(
+        owner=user, post__in=post_ids
+    ).values_list('pk', 'post_id', 'created_at'):
+        like_ids[post_id] = like_id
+        if created_at.get(post_id) == stored_at:
+            inserted.append(post_id)
+    Post.objects.filter(pk__in=inserted).update(
+        likes_count=F('likes_count') + 1,
+        last_liked_at=last_liked_at(),
+    )
+    return like_ids, inserted
+
+
+def unlike_posts(user, post_ids):
+    """
+    Deletes the likes of `user` on the given posts with one DELETE and
+    updates the unliked posts' counters with one UPDATE. Returns the
+    ids of the unliked posts. Like like_posts, it sends no signals.
+    """
+    # Locks the likes, so a concurrent unlike waits and then finds
+    # them gone rather than counting them too
+    likes = dict(
+        Like.objects.select_for_update().filter(
+            owner=user, post__in=post_ids
+        ).values_list('pk', 'post_id')
+    )
+    if not likes:
+        return []
+    # A plain DELETE, as QuerySet.delete() would fetch the likes and
+    # send a post_delete per like to update each post on its own
+    with connections[Like.objects.db].cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {cursor.db.ops.quote_name(Like._meta.db_table)} '
+            f'WHERE id IN ({", ".join(["%s"] * len(likes))})',
+            list(likes),
+        )
+        deleted = cursor.rowcount
+    unliked = list(likes.values())
+    if deleted == len(likes):
+        likes_count = F('likes_count') - 1
+    else:
+        # Another delete got some of the likes despite the lock, as on
+        # backends without row locks, and counted them; recount instead
+        likes_count = like_count()
+    Post.objects.filter(pk__in=unliked).update(
+        likes_count=likes_count,
+        last_liked_at=last_liked_at(),
+    )
+    return unliked
@@ -1,12 +1,16 @@
-from django.db import IntegrityError
+from django.conf import settings
 from rest_framework import serializers
+from api_retrospective.idempotent import create_or_get
 from likes.models import Like
+from posts.models import Post
 
 
 class LikeSerializer(serializers.ModelSerializer):
     """
     Serializer for the Like model.
-    The create method handles the unique constraint on 'owner' and 'post'.
+    Creating a like that exists returns the existing like, with
+    `created` set to False, rather than failing the unique constraint
+    on 'owner' and 'post'.
     """
     owner = serializers.ReadOnlyField(source='owner.username')
 
@@ -15,9 +19,46 @@ class LikeSerializer(serializers.ModelSerializer):
         fields = ['id', 'created_at', 'owner', 'post']
 
     def create(self, validated_data):
-        try:
-            return super().create(validated_data)
-        except IntegrityError:
-            raise serializers.ValidationError({
-                'detail': 'possible duplicate'
-            })
+        instance, self.created = create_or_get(Like, **validated_data)
+        return instance
+
+
+class LikeBatchSerializer(serializers.Serializer):
+    """
+    Validates the post ids of a batch of likes and unlikes.
+    Every post to like must exist; unknown posts to unlike are ignored.
+    """
+    like = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), default=list,
+        max_length=settings.LIKES_BATCH_LIMIT,
+    )
+    unlike = serializers.ListField(
+        child=serializers.IntegerField(min_value=1), default=list,
+        max_length=settings.LIKES_BATCH_LIMIT,
+    )
+
+    def validate_like(self, value):
+        post_ids = list(dict.fromkeys(value))
+        found = set(Post.objects.filter(
+            pk__in=post_ids
+        ).values_list('pk', flat=True))
+        missing = [post_id for post_id in post_ids if post_id not in found]
+        if missing:
+            raise serializers.ValidationError(
+                f'Unknown post ids: {", ".join(map(str, missing))}.'
+            )
+        return post_ids
+
+    def validate_unlike(self, value):
+        return list(dict.fromkeys(value))
+
+    def validate(self, data):
+        both = set(data['like']) & set(data['unlike'])
+        if both:
+            raise serializers.ValidationError(
+                'Posts to like and unlike must differ: '
+                f'{", ".join(map(str, sorted(both)))}.'
+            )
+        if not data['like'] and not data['unlike']:
+            raise serializers.ValidationError('No posts to like or unlike.')
+        return data
@@ -1,3 +1,4 @@
+from unittest import mock
 from django.contrib.auth.models import User
 from .models import Like
 from posts.models import Post
@@ -30,11 +31,18 @@ class LikeListViewTests(APITestCase):
         self.assertEqual(count, 2)
         self.assertEqual(response.status_code, status.HTTP_201_CREATED)
 
-    def test_logged_in_user_cant_like_a_post_twice(self):
+    def test_liking_a_post_twice_returns_the_existing_like(self):
         self.client.login(username='tester', password='test123')
         test_post = Post.objects.get(title='Test title')
-        response = self.client.post('/likes/', {'post': test_post.id})
-        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        like = Like.objects.get(post=test_post)
+        # Session, user, post and like lookups, and the like's owner,
+        # with no failed INSERT
+        with self.assertNumQueries(5):
+            response = self.client.post('/likes/', {'post': test_post.id})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['id'], like.id)
+        test_post.refresh_from_db()
+        self.assertEqual(test_post.likes_count, 1)
 
     def test_logged_out_user_cant_like_a_post(self):
         test_post = Post.objects.get(title='Test title')
@@ -74,3 +82,111 @@ class LikeDetailViewTests(APITestCase):
         self.client.login(username='tester2', password='test321')
         response = self.client.delete('/likes/1/')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class LikeBatchViewTests(APITestCase):
+    """
+    Tests for the LikeBatch view.
+    """
+    def setUp(self):
+        self.tester = User.objects.create_user(
+            username='tester', password='test123'
+        )
+        self.posts = [
+            Post.objects.create(owner=self.tester, title=f'Post {number}')
+            for number in range(3)
+        ]
+        self.liked = Like.objects.create(owner=self.tester, post=self.posts[0])
+
+    def test_logged_in_user_can_like_and_unlike_posts(self):
+        self.client.login(username='tester', password='test123')
+        first, second, third = self.posts
+        response = self.client.post('/likes/batch/', {
+            'like': [second.id, third.id], 'unlike': [first.id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        likes = Like.objects.filter(owner=self.tester).order_by('post_id')
+        self.assertEqual(response.data['likes'], [
+            {'id': like.id, 'post': like.post_id} for like in likes
+        ])
+        self.assertEqual(response.data['unliked'], [first.id])
+        self.assertEqual(
+            [like.post_id for like in likes], [second.id, third.id]
+        )
+        for post in self.posts:
+            post.refresh_from_db()
+        self.assertEqual(
+            [post.likes_count for post in self.posts], [0, 1, 1]
+        )
+        self.assertEqual(second.last_liked_at, likes[0].created_at)
+
+    def test_liking_a_liked_post_returns_the_existing_like(self):
+        self.client.login(username='tester', password='test123')
+        first = self.posts[0]
+        response = self.client.post('/likes/batch/', {
+            'like': [first.id, first.id], 'unlike': [self.posts[1].id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            response.data['likes'], [{'id': self.liked.id, 'post': first.id}]
+        )
+        self.assertEqual(response.data['unliked'], [])
+        first.refresh_from_db()
+        self.assertEqual(first.likes_count, 1)
+
+    def test_like_made_meanwhile_is_counted_once(self):
+        # A like of the same post lands between the read of the user's
+        # likes and the bulk insert
+        second = self.posts[1]
+        bulk_create = Like.objects.bulk_create
+
+        def like_first(likes, **kwargs):
+            Like.objects.create(owner=self.tester, post=second)
+            return bulk_create(likes, **kwargs)
+
+        self.client.login(username='tester', password='test123')
+        with mock.patch.object(Like.objects, 'bulk_create', like_first):
+            response = self.client.post(
+                '/likes/batch/', {'like': [second.id]}, format='json'
+            )
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        like = Like.objects.get(owner=self.tester, post=second)
+        self.assertEqual(
+            response.data['likes'], [{'id': like.id, 'post': second.id}]
+        )
+        second.refresh_from_db()
+        self.assertEqual(second.likes_count, 1)
+
+    def test_batch_runs_a_fixed_number_of_queries(self):
+        self.client.login(username='tester', password='test123')
+        post_ids = [post.id for post in self.posts]
+        # Session and user, post lookup, savepoint, liked lookup,
+        # insert, counters, unliked lookup, delete, counters, result
+        # and release
+        with self.assertNumQueries(12):
+            response = self.client.post('/likes/batch/', {
+                'like': post_ids[1:], 'unlike': post_ids[:1],
+            }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+    def test_cant_like_unknown_posts(self):
+        self.client.login(username='tester', password='test123')
+        response = self.client.post(
+            '/likes/batch/', {'like': [self.posts[1].id, 999]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(Like.objects.count(), 1)
+
+    def test_cant_like_and_unlike_the_same_post(self):
+        self.client.login(username='tester', password='test123')
+        post_id = self.posts[1].id
+        response = self.client.post('/likes/batch/', {
+            'like': [post_id], 'unlike': [post_id],
+        }, format='json')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_logged_out_user_cant_batch_likes(self):
+        response = self.client.post(
+            '/likes/batch/', {'like': [self.posts[1].id]}, format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
@@ -3,5 +3,6 @@ from likes import views
 
 urlpatterns = [
     path('likes/', views.LikeList.as_view()),
+    path('likes/batch/', views.LikeBatch.as_view()),
     path('likes/<int:pk>/', views.LikeDetail.as_view()),
 ]
\ No newline at end of file
@@ -1,12 +1,18 @@
+from django.db import transaction
 from rest_framework import generics, permissions
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from api_retrospective.idempotent import IdempotentCreateMixin
 from api_retrospective.permissions import IsOwnerOrReadOnly
-from likes.models import Like
-from likes.serializers import LikeSerializer
+from api_retrospective.response_cache import invalidate
+from likes.models import Like, like_posts, unlike_posts
+from likes.serializers import LikeBatchSerializer, LikeSerializer
 
 
-class LikeList(generics.ListCreateAPIView):
+class LikeList(IdempotentCreateMixin, generics.ListCreateAPIView):
     """
     List likes or create a like if logged in.
+    Liking a post again returns the existing like with a 200.
     """
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
     serializer_class = LikeSerializer
@@ -26,3 +32,31 @@ class LikeDetail(generics.RetrieveDestroyAPIView):
     permission_classes = [IsOwnerOrReadOnly]
     serializer_class = LikeSerializer
     queryset = Like.objects.all()
+
+
+class LikeBatch(APIView):
+    """
+    Like and unlike many posts at once, in one transaction.
+    Takes {"like": [post ids], "unlike": [post ids]} and returns the
+    user's likes of the posts to like, with the posts actually unliked.
+    Liking an already liked post, or unliking one that isn't, is a no-op.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        serializer = LikeBatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        like, unlike = (
+            serializer.validated_data['like'],
+            serializer.validated_data['unlike'],
+        )
+        with transaction.atomic():
+            like_ids, liked = like_posts(request.user, like)
+            unliked = unlike_posts(request.user, unlike)
+        likes = [
+            {'id': like_ids[post_id], 'post': post_id}
+            for post_id in sorted(like_ids)
+        ]
+        if liked or unliked:
+            invalidate('likes.like', 'posts.post')
+        return Response({'likes': likes, 'unliked': unliked})
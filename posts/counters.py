@@ -0,0 +1,195 @@
+import atexit
+import logging
+import threading
+from collections import Counter
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from api_retrospective.response_cache import invalidate
+from posts.models import Post
+
+logger = logging.getLogger(__name__)
+
+
+def actual_count(model):
+    """
+    Returns a subquery expression counting the rows of `model`
+    that belong to the outer post.
+    """
+    return Coalesce(Subquery(
+        model.objects.filter(post=OuterRef('pk'))
+        .order_by().values('post')
+        .annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+class CounterBuffer:
+    """
+    Write-behind buffer for Post.likes_count, comments_count and
+    last_liked_at. Like and comment signals add their deltas here once
+    their transaction commits, and every COUNTER_FLUSH_INTERVAL seconds,
+    or as soon as COUNTER_FLUSH_SIZE posts are pending, one UPDATE
+    recounts the posts they touched from the Like and Comment tables.
+    Reads merge the deltas of this process through `pending`,
+    including those of a flush that has yet to commit.
+
+    Each process only knows its own deltas, so until they are flushed
+    gunicorn workers can report counts that differ by the likes and
+    comments the others took in the last COUNTER_FLUSH_INTERVAL.
+
+    A flush recounts rather than adds, so it is idempotent: a worker
+    that dies before its flush leaves its posts stale, not wrong, until
+    another flush or reconcile_post_counts recounts them, and the
+    flushes of the other workers don't count twice what reconcile
+    already restored.
+    """
+
+    def __init__(self):
+        self.likes = Counter()
+        self.comments = Counter()
+        # Deltas taken by the flush in progress, until it commits
+        self.flushing = Counter(), Counter()
+        self.timer = None
+        self.lock = threading.Lock()
+        self.flush_lock = threading.Lock()
+
+    def add(self, post_id, likes=0, comments=0):
+        """
+        Buffers deltas, flushing when enough posts are pending. Runs
+        after the like or comment committed, so a failed flush is
+        logged rather than raised; its deltas wait for the next one.
+        """
+        self.merge(post_id, likes, comments)
+        with self.lock:
+            size = len(self.likes.keys() | self.comments.keys())
+        if size >= settings.COUNTER_FLUSH_SIZE:
+            try:
+                self.flush()
+            except Exception:
+                logger.exception('Could not flush the post counters.')
+
+    def merge(self, post_id, likes, comments):
+        """
+        Adds deltas to the buffer and schedules its next flush.
+        """
+        with self.lock:
+            self.likes[post_id] += likes
+            self.comments[post_id] += comments
+            if self.timer is None:
+                self.timer = threading.Timer(
+                    settings.COUNTER_FLUSH_INTERVAL, self.flush_in_thread
+                )
+                self.timer.daemon = True
+                self.timer.start()
+
+    def pending(self, post_id):
+        """
+        Returns the unflushed (likes, comments) deltas of a post.
+        """
+        with self.lock:
+            flushing_likes, flushing_comments = self.flushing
+            return (
+                self.likes[post_id] + flushing_likes[post_id],
+                self.comments[post_id] + flushing_comments[post_id],
+            )
+
+    def take(self):
+        """
+        Empties the buffer, returning what it held. The counts stay
+        merged into reads as flushing until `settle` is called.
+        """
+        with self.lock:
+            if self.timer is not None:
+                self.timer.cancel()
+                self.timer = None
+            taken = self.flushing = self.likes, self.comments
+            self.likes, self.comments = Counter(), Counter()
+        return taken
+
+    def settle(self):
+        with self.lock:
+            self.flushing = Counter(), Counter()
+
+    def reset(self):
+        self.take()
+        self.settle()
+
+    def flush(self):
+        """
+        Recounts the posts with pending deltas, one flush at a time.
+        If the write fails, the deltas go back into the buffer for the
+        next flush.
+        """
+        with self.flush_lock:
+            self.write(*self.take())
+
+    def write(self, likes, comments):
+        post_ids = likes.keys() | comments.keys()
+        if not post_ids:
+            self.settle()
+            return
+        # Imported here as likes.models and comments.models import
+        # this module
+        from comments.models import Comment
+        from likes.models import Like, last_liked_at
+        try:
+            with transaction.atomic():
+                Post.objects.filter(pk__in=sorted(post_ids)).update(
+                    likes_count=actual_count(Like),
+                    comments_count=actual_count(Comment),
+                    last_liked_at=last_liked_at(),
+                )
+        except Exception:
+            for post_id in post_ids:
+                self.merge(post_id, likes[post_id], comments[post_id])
+            self.settle()
+            raise
+        self.settle()
+        invalidate('posts.post')
+
+    def flush_in_thread(self):
+        # The timer's thread opened its own connection to flush
+        try:
+            self.flush()
+        finally:
+            connection.close()
+
+
+counter_buffer = CounterBuffer()
+atexit.register(counter_buffer.flush)
+
+
+def buffer_counts(post_id, likes=0, comments=0):
+    """
+    Buffers counter deltas of a post until the current transaction
+    commits, when COUNTER_BUFFER is on. Returns whether they were
+    buffered; if not, the caller updates the post itself.
+    """
+    if not settings.COUNTER_BUFFER:
+        return False
+    transaction.on_commit(
+        lambda: counter_buffer.add(post_id, likes, comments)
+    )
+    return True
+
+
+def pending_counts(post_id):
+    """
+    Returns the (likes, comments) deltas of a post that this process
+    has yet to write.
+    """
+    if not settings.COUNTER_BUFFER:
+        return 0, 0
+    return counter_buffer.pending(post_id)
+
+
+def merged_count(post, field):
+    """
+    Returns the post's `likes_count` or `comments_count` with the
+    deltas this process has yet to write.
+    """
+    likes, comments = pending_counts(post.pk)
+    return getattr(post, field) + (
+        likes if field == 'likes_count' else comments
+    )
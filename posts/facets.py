@@ -0,0 +1,58 @@
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Count
+from api_retrospective.response_cache import get_cache
+from .models import Post
+
+
+def cache_key(owner_id, category):
+    return f'post-categories:{owner_id or "all"}:{category}'
+
+
+def category_counts(owner_id=None):
+    """
+    Returns the number of posts in every category, optionally only
+    those owned by `owner_id`. Served from the cache when all counts
+    are cached, otherwise recounted with one grouped query.
+    """
+    # Kept in the response cache's backend, which the web processes
+    # share, so that every process sees the same adjusted counts
+    cache = get_cache()
+    keys = {cache_key(owner_id, value): value for value, _ in Post.categories}
+    cached = cache.get_many(keys)
+    if len(cached) == len(keys):
+        return {keys[key]: count for key, count in cached.items()}
+
+    posts = Post.objects.all()
+    if owner_id:
+        posts = posts.filter(owner_id=owner_id)
+    totals = dict(
+        posts.order_by().values('category')
+        .annotate(total=Count('pk')).values_list('category', 'total')
+    )
+    counts = {value: totals.get(value, 0) for value, _ in Post.categories}
+    cache.set_many({
+        cache_key(owner_id, value): count for value, count in counts.items()
+    }, settings.CATEGORY_COUNTS_TIMEOUT)
+    return counts
+
+
+def adjust_category_count(owner_id, category, delta):
+    """
+    Applies a change to the cached global and owner counts of a category
+    once the current transaction commits, so rolled back posts aren't
+    counted. Counts that aren't cached are left for the next read to
+    recount.
+    """
+    if not category:
+        return
+
+    def adjust():
+        cache = get_cache()
+        for scope in (None, owner_id):
+            try:
+                cache.incr(cache_key(scope, category), delta)
+            except ValueError:
+                pass
+
+    transaction.on_commit(adjust)
@@ -0,0 +1,10 @@
+from api_retrospective.filters import IndexedOrderingFilter
+
+
+class PostOrderingFilter(IndexedOrderingFilter):
+    """
+    Ordering filter whose orderings are all served by indexed Post
+    columns. `likes__created_at` is accepted as the name of the
+    denormalized last_liked_at, rather than joining every like.
+    """
+    ordering_aliases = {'likes__created_at': 'last_liked_at'}
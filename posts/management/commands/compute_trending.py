@@ -0,0 +1,120 @@
+import math
+from datetime import datetime, timedelta, timezone
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils.timezone import now
+from posts.models import Post, PostScore, TrendingCheckpoint
+from likes.models import Like
+from comments.models import Comment
+
+# Scores are sums of weight * exp(decay * (t - EPOCH)), kept as logs.
+# Growing every new event's weight with time ranks posts the same way
+# as decaying every old event would, without rewriting idle posts.
+EPOCH = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def log_add(a, b):
+    """
+    Returns log(exp(a) + exp(b)) without overflowing.
+    """
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+
+class Command(BaseCommand):
+    """
+    Folds the likes and comments created since the last run into the
+    trending scores of their posts. Run it periodically, e.g. from the
+    Heroku scheduler. Posts without new activity are not touched.
+
+    Rows are found by created_at, which is set before their transaction
+    commits, so each run rescans an overlap of TRENDING_OVERLAP_SECONDS
+    before the last run's start and skips the ids it already folded.
+    """
+    help = 'Updates the time-decayed trending scores of posts.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--rebuild', action='store_true',
+            help='Discard the scores and recompute them from all activity.',
+        )
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Rows to read per batch.',
+        )
+
+    def handle(self, *args, **options):
+        decay = math.log(2) / (settings.TRENDING_HALF_LIFE_HOURS * 3600)
+        weights = settings.TRENDING_WEIGHTS
+        chunk_size = options['chunk_size']
+
+        with transaction.atomic():
+            checkpoint, _ = (
+                TrendingCheckpoint.objects.select_for_update()
+                .get_or_create(pk=1)
+            )
+            if options['rebuild']:
+                PostScore.objects.all().delete()
+                checkpoint.scanned_to = None
+                checkpoint.folded_like_ids = []
+                checkpoint.folded_comment_ids = []
+
+            started_at = now()
+            overlap = timedelta(seconds=settings.TRENDING_OVERLAP_SECONDS)
+            deltas = {}
+            sources = [
+                (Like, 'folded_like_ids', math.log(weights['like'])),
+                (Comment, 'folded_comment_ids', math.log(weights['comment'])),
+            ]
+            for model, folded_field, log_weight in sources:
+                rows = model.objects.all()
+                if checkpoint.scanned_to is not None:
+                    rows = rows.filter(
+                        created_at__gte=checkpoint.scanned_to - overlap
+                    )
+                folded = set(getattr(checkpoint, folded_field))
+                # The ids of the next run's overlap, folded now or before
+                overlap_ids = []
+                rows = rows.order_by().values_list(
+                    'pk', 'post_id', 'created_at'
+                )
+                for pk, post_id, created_at in rows.iterator(chunk_size):
+                    if created_at >= started_at - overlap:
+                        overlap_ids.append(pk)
+                    if pk in folded:
+                        continue
+                    age = (created_at - EPOCH).total_seconds()
+                    deltas[post_id] = log_add(
+                        deltas.get(post_id), log_weight + decay * age
+                    )
+                setattr(checkpoint, folded_field, overlap_ids)
+            checkpoint.scanned_to = started_at
+
+            live_ids = list(Post.objects.filter(
+                pk__in=list(deltas)
+            ).values_list('pk', flat=True))
+            existing = PostScore.objects.in_bulk(live_ids)
+            created, updated = [], []
+            for post_id in live_ids:
+                if post_id in existing:
+                    score = existing[post_id]
+                    score.score = log_add(score.score, deltas[post_id])
+                    score.updated_at = now()
+                    updated.append(score)
+                else:
+                    created.append(
+                        PostScore(post_id=post_id, score=deltas[post_id])
+                    )
+            PostScore.objects.bulk_create(created, batch_size=chunk_size)
+            PostScore.objects.bulk_update(
+                updated, ['score', 'updated_at'], batch_size=chunk_size
+            )
+            checkpoint.save()
+
+        self.stdout.write(
+            f'Updated trending scores for {len(created) + len(updated)} '
+            f'post(s).'
+        )
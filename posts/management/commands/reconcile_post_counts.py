@@ -0,0 +1,52 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import F, Q
+from api_retrospective.response_cache import invalidate
+from posts.counters import actual_count
+from posts.models import Post
+from likes.models import Like, last_liked_at
+from comments.models import Comment
+
+
+class Command(BaseCommand):
+    """
+    Recounts likes and comments for every post and repairs any
+    counter column, or last_liked_at, that has drifted from the
+    actual rows. With COUNTER_BUFFER on, run it after a worker stops
+    without flushing, to restore the counts it held in memory; the
+    flushes of the other workers recount too, so they keep them.
+    """
+    help = (
+        'Reconciles Post.likes_count, Post.comments_count and '
+        'Post.last_liked_at.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report drifted posts without updating them.',
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            drifted = Post.objects.annotate(
+                actual_likes=actual_count(Like),
+                actual_comments=actual_count(Comment),
+                actual_last_liked_at=last_liked_at(),
+            ).filter(
+                ~Q(likes_count=F('actual_likes')) |
+                ~Q(comments_count=F('actual_comments')) |
+                ~Q(last_liked_at=F('actual_last_liked_at'))
+            ).values_list('pk', flat=True)
+            drifted = list(drifted)
+
+            if drifted and not options['dry_run']:
+                Post.objects.filter(pk__in=drifted).update(
+                    likes_count=actual_count(Like),
+                    comments_count=actual_count(Comment),
+                    last_liked_at=last_liked_at(),
+                )
+                invalidate('posts.post')
+
+        verb = 'Found' if options['dry_run'] else 'Reconciled'
+        self.stdout.write(f'{verb} {len(drifted)} drifted post(s).')
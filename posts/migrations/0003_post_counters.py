@@ -0,0 +1,49 @@
+# Generated by Django 3.2.25 on 2026-10-18 14:45
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counters(apps, schema_editor):
+    """
+    Populates the new counter columns from the existing likes and comments.
+    """
+    Post = apps.get_model('posts', 'Post')
+    Like = apps.get_model('likes', 'Like')
+    Comment = apps.get_model('comments', 'Comment')
+
+    def count_of(model):
+        return Coalesce(Subquery(
+            model.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post')
+            .annotate(total=Count('pk')).values('total')
+        ), 0)
+
+    Post.objects.update(
+        likes_count=count_of(Like),
+        comments_count=count_of(Comment),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0002_alter_post_category'),
+        ('likes', '0001_initial'),
+        ('comments', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='comments_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='likes_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0005_trending_scores'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='image_variants',
+            field=models.JSONField(default=dict, editable=False),
+        ),
+    ]
@@ -0,0 +1,53 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:09
+
+import datetime
+from django.db import migrations, models
+from django.db.models import F, Max, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils.timezone import utc
+
+
+def backfill_last_liked_at(apps, schema_editor):
+    """
+    Populates last_liked_at from the newest like of each post.
+    """
+    Post = apps.get_model('posts', 'Post')
+    Like = apps.get_model('likes', 'Like')
+    Post.objects.filter(likes_count__gt=0).update(
+        last_liked_at=Coalesce(Subquery(
+            Like.objects.filter(post=OuterRef('pk'))
+            .order_by().values('post')
+            .annotate(newest=Max('created_at')).values('newest')
+        ), F('last_liked_at'))
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_image_variants'),
+        ('likes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='last_liked_at',
+            field=models.DateTimeField(default=datetime.datetime(1970, 1, 1, 0, 0, tzinfo=utc), editable=False),
+        ),
+        migrations.RunPython(
+            backfill_last_liked_at, migrations.RunPython.noop
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-likes_count', '-id'], name='post_likes_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-comments_count', '-id'], name='post_comments_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-last_liked_at', '-id'], name='post_last_liked_id_idx'),
+        ),
+    ]
@@ -0,0 +1,73 @@
+# Generated by Django 3.2.25 on 2026-10-18 16:07
+
+from datetime import timedelta
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Min
+
+
+def convert_checkpoint(apps, schema_editor):
+    """
+    Moves the id checkpoint to a scan time that every unfolded like
+    and comment was created after, with the folded ids of the overlap.
+    """
+    TrendingCheckpoint = apps.get_model('posts', 'TrendingCheckpoint')
+    checkpoint = TrendingCheckpoint.objects.filter(pk=1).first()
+    if checkpoint is None:
+        return
+    sources = [
+        (apps.get_model('likes', 'Like'), 'last_like_id', 'folded_like_ids'),
+        (apps.get_model('comments', 'Comment'), 'last_comment_id',
+         'folded_comment_ids'),
+    ]
+    scanned_to = checkpoint.updated_at
+    for model, mark, _ in sources:
+        earliest = model.objects.filter(
+            pk__gt=getattr(checkpoint, mark)
+        ).aggregate(earliest=Min('created_at'))['earliest']
+        if earliest is not None:
+            scanned_to = min(scanned_to, earliest)
+    overlap = timedelta(seconds=settings.TRENDING_OVERLAP_SECONDS)
+    for model, mark, folded_field in sources:
+        setattr(checkpoint, folded_field, list(model.objects.filter(
+            pk__lte=getattr(checkpoint, mark),
+            created_at__gte=scanned_to - overlap,
+        ).values_list('pk', flat=True)))
+    checkpoint.scanned_to = scanned_to
+    checkpoint.save()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_query_indexes'),
+        ('likes', '0001_initial'),
+        ('comments', '0003_threads'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='trendingcheckpoint',
+            name='folded_comment_ids',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='trendingcheckpoint',
+            name='folded_like_ids',
+            field=models.JSONField(default=list),
+        ),
+        migrations.AddField(
+            model_name='trendingcheckpoint',
+            name='scanned_to',
+            field=models.DateTimeField(null=True),
+        ),
+        migrations.RunPython(convert_checkpoint, migrations.RunPython.noop),
+        migrations.RemoveField(
+            model_name='trendingcheckpoint',
+            name='last_comment_id',
+        ),
+        migrations.RemoveField(
+            model_name='trendingcheckpoint',
+            name='last_like_id',
+        ),
+    ]
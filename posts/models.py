@@ -1,6 +1,12 @@
-from django.db import models
+from datetime import datetime, timezone
+from django.db import models, transaction
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.contrib.auth.models import User
 
+# Post.last_liked_at of posts without likes: older than any like, so
+# they sort last by -last_liked_at and first by last_liked_at
+NEVER_LIKED = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
 
 class Post(models.Model):
     """
@@ -40,15 +46,131 @@ class Post(models.Model):
         default='../default_post_x1mf4x',
         blank=True
     )
+    # Storage names of the resized copies of 'image', by variant name,
+    # filled in by the process_image_variants worker
+    image_variants = models.JSONField(default=dict, editable=False)
     category = models.CharField(
         max_length=150,
         choices=categories,
         blank=True,
         null=True
     )
+    # Denormalized counters, kept in step by the Like and Comment signals.
+    likes_count = models.IntegerField(default=0, editable=False)
+    comments_count = models.IntegerField(default=0, editable=False)
+    # When the newest like was made, kept by the Like signals.
+    last_liked_at = models.DateTimeField(default=NEVER_LIKED, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Serves the keyset pagination on (created_at, id)
+            models.Index(
+                fields=['-created_at', '-id'], name='post_created_id_idx'
+            ),
+            # Serves a profile's posts, newest first
+            models.Index(
+                fields=['owner', '-created_at', '-id'],
+                name='post_owner_created_id_idx',
+            ),
+            # Serve the popularity orderings, which are tie-broken by id
+            models.Index(
+                fields=['-likes_count', '-id'], name='post_likes_id_idx'
+            ),
+            models.Index(
+                fields=['-comments_count', '-id'],
+                name='post_comments_id_idx',
+            ),
+            models.Index(
+                fields=['-last_liked_at', '-id'],
+                name='post_last_liked_id_idx',
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        # Commits a new row together with the profile counters that its
+        # post_save signals update; deletes are atomic already
+        with transaction.atomic():
+            super().save(*args, **kwargs)
 
     def __str__(self):
         return f'{self.id} {self.title}'
+
+
+class PostScore(models.Model):
+    """
+    A post's time-decayed trending score, maintained by the
+    compute_trending command. 'score' is stored in log space relative
+    to a fixed epoch, so scores stay comparable without being decayed.
+    """
+    post = models.OneToOneField(
+        Post, primary_key=True, related_name='trending',
+        on_delete=models.CASCADE
+    )
+    score = models.FloatField()
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['-score']
+        indexes = [
+            models.Index(fields=['-score'], name='postscore_score_idx'),
+        ]
+
+    def __str__(self):
+        return f'{self.post_id} {self.score}'
+
+
+class TrendingCheckpoint(models.Model):
+    """
+    How far compute_trending has folded likes and comments into the
+    trending scores. A single row, read and advanced by each run.
+    'scanned_to' is when the last run started. As rows can commit after
+    a run although created before it started, each run rescans from
+    TRENDING_OVERLAP_SECONDS earlier, skipping the ids already folded
+    in that window.
+    """
+    scanned_to = models.DateTimeField(null=True)
+    folded_like_ids = models.JSONField(default=list)
+    folded_comment_ids = models.JSONField(default=list)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f'scanned to {self.scanned_to}'
+
+
+def remember_category(sender, instance, raw=False, **kwargs):
+    """
+    Records the stored category of a post about to be saved.
+    """
+    instance._previous_category = None
+    if instance.pk and not raw:
+        instance._previous_category = Post.objects.filter(
+            pk=instance.pk
+        ).values_list('category', flat=True).first()
+
+
+def count_saved_post(sender, instance, created, **kwargs):
+    """
+    Moves a created or recategorized post into its new category count.
+    """
+    # Imported here as facets imports this module
+    from .facets import adjust_category_count
+    previous = getattr(instance, '_previous_category', None)
+    if not created and previous == instance.category:
+        return
+    adjust_category_count(instance.owner_id, previous, -1)
+    adjust_category_count(instance.owner_id, instance.category, 1)
+
+
+def count_deleted_post(sender, instance, **kwargs):
+    """
+    Removes a deleted post from its category count.
+    """
+    from .facets import adjust_category_count
+    adjust_category_count(instance.owner_id, instance.category, -1)
+
+
+# Keeps the cached category counts in step with the posts table
+pre_save.connect(remember_category, sender=Post)
+post_save.connect(count_saved_post, sender=Post)
+post_delete.connect(count_deleted_post, sender=Post)
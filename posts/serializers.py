@@ -1,61 +1,60 @@
 from rest_framework import serializers
+from api_retrospective.images import ImageUploadField
+from api_retrospective.owner_summaries import (
+    OwnerImageVariantsField, OwnerSummaryField,
+)
+from api_retrospective.sparse_fields import SparseFieldsSerializerMixin
+from posts.counters import merged_count
 from posts.models import Post
 from likes.models import Like
-from comments.models import Comment
+from variants.serializers import ImageVariantsField
 
 
-class PostSerializer(serializers.ModelSerializer):
-    owner = serializers.ReadOnlyField(source='owner.username')
+class PostSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
+    owner = OwnerSummaryField('username', source='owner_id')
     is_owner = serializers.SerializerMethodField()
-    profile_id = serializers.ReadOnlyField(source='owner.profile.id')
-    profile_image = serializers.ReadOnlyField(source='owner.profile.image.url')
+    profile_id = OwnerSummaryField('profile_id', source='owner_id')
+    profile_image = OwnerSummaryField('profile_image', source='owner_id')
+    profile_image_variants = OwnerImageVariantsField(source='owner_id')
     like_id = serializers.SerializerMethodField()
-    likes_count = serializers.ReadOnlyField()
-    comments_count = serializers.ReadOnlyField()
-
-    def validate_image(self, value):
-        """
-        Validates that the image is not larger than 2MB,
-        higher than 4096px and wider than 4096px.
-        """
-        if value.size > 2 * 1024 * 1024:
-            raise serializers.ValidationError('Image size larger than 2MB!')
-        if value.image.height > 4096:
-            raise serializers.ValidationError('Image height larger than 4096px!')
-        if value.image.width > 4096:
-            raise serializers.ValidationError('Image width larger than 4096px!')
-        return value
+    likes_count = serializers.SerializerMethodField()
+    comments_count = serializers.SerializerMethodField()
+    image = ImageUploadField(required=False)
+    image_variants = ImageVariantsField(source='*')
 
     def get_is_owner(self, obj):
         request = self.context['request']
-        return request.user == obj.owner
+        return request.user.pk == obj.owner_id
 
-    def get_like_id(self, obj):
-        user = self.context['request'].user
-        if user.is_authenticated:
-            like = Like.objects.filter(owner=user, post=obj).first()
-            return like.id if like else None
-        return None
+    def get_likes_count(self, obj):
+        return merged_count(obj, 'likes_count')
 
-    def to_representation(self, instance):
+    def get_comments_count(self, obj):
+        return merged_count(obj, 'comments_count')
+
+    def get_like_id(self, obj):
         """
-        Overrides the default to_representation to add dynamically calculated fields.
+        Returns the id of the current user's like on the post, or None.
+        List views resolve these for the whole page up front and pass
+        them in as the `like_ids` context map.
         """
-        # Prefetch related data for likes and comments
-        self.context['request'].user = instance.owner
-        representation = super().to_representation(instance)
-        
-        # Calculates likes_count and comments_count dynamically if not already present
-        representation['likes_count'] = Like.objects.filter(post=instance).count()
-        representation['comments_count'] = Comment.objects.filter(post=instance).count()
-
-        return representation
+        user = self.context['request'].user
+        if not user.is_authenticated:
+            return None
+        like_ids = self.context.get('like_ids')
+        if like_ids is not None:
+            return like_ids.get(obj.id)
+        like = Like.objects.filter(owner=user, post=obj).first()
+        return like.id if like else None
 
     class Meta:
         model = Post
         fields = [
             'id', 'owner', 'is_owner', 'profile_id', 'profile_image',
+            'profile_image_variants',
             'created_at', 'updated_at', 'title', 'description',
-            'image', 'category', 'like_id',  'location',
+            'image', 'image_variants', 'category', 'like_id',  'location',
             'likes_count', 'comments_count',
         ]
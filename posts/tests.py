@@ -1,7 +1,25 @@
+from io import BytesIO, StringIO
 from django.contrib.auth.models import User
-from posts.models import Post
+from django.core.cache import caches
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.db import DatabaseError, connection
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+import struct
+from unittest import mock
+import zlib
+from datetime import timedelta
+from PIL import Image
+from api_retrospective.response_cache import get_stats
+from posts.counters import counter_buffer
+from posts.facets import category_counts
+from posts.serializers import PostSerializer
+from posts.models import Post, PostScore, TrendingCheckpoint
+from likes.models import Like
+from comments.models import Comment
 from rest_framework import status
-from rest_framework.test import APITestCase
+from rest_framework.test import APIRequestFactory, APITestCase
 
 
 class PostListViewTests(APITestCase):
@@ -100,3 +118,722 @@ class PostDetailViewTests(APITestCase):
         self.client.login(username='adam', password='pass')
         response = self.client.delete('/posts/2/')
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+
+class PostCounterTests(APITestCase):
+    def setUp(self):
+        # Creates a post with no likes or comments
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.post = Post.objects.create(owner=self.adam, title='a title')
+
+    def test_like_and_comment_update_counters(self):
+        # Ensures the counter columns follow likes and comments
+        like = Like.objects.create(owner=self.adam, post=self.post)
+        Comment.objects.create(owner=self.adam, post=self.post, content='hi')
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.comments_count, 1)
+
+        like.delete()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+    def test_counters_are_returned_by_the_api(self):
+        # Ensures the list and detail views read the counter columns
+        Like.objects.create(owner=self.adam, post=self.post)
+        response = self.client.get(f'/posts/{self.post.id}/')
+        self.assertEqual(response.data['likes_count'], 1)
+        self.assertEqual(response.data['comments_count'], 0)
+        response = self.client.get('/posts/')
+        self.assertEqual(response.data['results'][0]['likes_count'], 1)
+
+    def test_reconcile_command_repairs_drift(self):
+        # Ensures the reconcile command recounts drifted counters
+        Like.objects.create(owner=self.adam, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(
+            likes_count=7, comments_count=3
+        )
+        out = StringIO()
+        call_command('reconcile_post_counts', stdout=out)
+        self.assertIn('Reconciled 1 drifted post(s).', out.getvalue())
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.comments_count, 0)
+
+
+@override_settings(
+    COUNTER_BUFFER=True, COUNTER_FLUSH_INTERVAL=3600, COUNTER_FLUSH_SIZE=3
+)
+class PostCounterBufferTests(APITestCase):
+    def setUp(self):
+        caches['responses'].clear()
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.users = [
+            User.objects.create_user(username=f'user{i}') for i in range(3)
+        ]
+        self.post = Post.objects.create(owner=self.adam, title='a title')
+        self.addCleanup(counter_buffer.reset)
+
+    def like(self, user, post=None):
+        with self.captureOnCommitCallbacks(execute=True):
+            return Like.objects.create(owner=user, post=post or self.post)
+
+    def test_counts_are_buffered_until_flushed(self):
+        # Ensures likes and comments reach the post row on flush only
+        likes = [self.like(user) for user in self.users]
+        with self.captureOnCommitCallbacks(execute=True):
+            Comment.objects.create(
+                owner=self.adam, post=self.post, content='hi'
+            )
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 0)
+
+        with self.assertNumQueries(3):
+            counter_buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 3)
+        self.assertEqual(self.post.comments_count, 1)
+        self.assertEqual(self.post.last_liked_at, likes[-1].created_at)
+
+    def test_unlike_recomputes_last_liked_at(self):
+        first, second = [self.like(user) for user in self.users[:2]]
+        counter_buffer.flush()
+        with self.captureOnCommitCallbacks(execute=True):
+            second.delete()
+        counter_buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+        self.assertEqual(self.post.last_liked_at, first.created_at)
+
+    def test_reads_merge_unflushed_counts(self):
+        self.like(self.users[0])
+        response = self.client.get(f'/posts/{self.post.id}/')
+        self.assertEqual(response.data['likes_count'], 1)
+        response = self.client.get('/posts/')
+        self.assertEqual(response.data['results'][0]['likes_count'], 1)
+
+    def test_flushes_once_enough_posts_are_pending(self):
+        posts = [self.post] + [
+            Post.objects.create(owner=self.adam, title=f'post {i}')
+            for i in range(2)
+        ]
+        for post in posts:
+            self.like(self.adam, post)
+        self.assertEqual(counter_buffer.pending(self.post.id), (0, 0))
+        self.assertEqual(
+            list(Post.objects.order_by('id').values_list(
+                'likes_count', flat=True
+            )), [1, 1, 1]
+        )
+
+    def test_uncommitted_likes_are_not_counted(self):
+        with self.captureOnCommitCallbacks(execute=False):
+            Like.objects.create(owner=self.adam, post=self.post)
+        self.assertEqual(counter_buffer.pending(self.post.id), (0, 0))
+
+    def test_failed_flush_keeps_the_counts_without_failing_the_like(self):
+        posts = [self.post] + [
+            Post.objects.create(owner=self.adam, title=f'post {i}')
+            for i in range(2)
+        ]
+        with mock.patch.object(
+            Post.objects, 'filter', side_effect=DatabaseError
+        ), self.assertLogs('posts.counters', 'ERROR'):
+            for post in posts:
+                self.like(self.adam, post)
+        self.assertEqual(Like.objects.count(), 3)
+        for post in posts:
+            self.assertEqual(counter_buffer.pending(post.id), (1, 0))
+
+    def test_failed_write_puts_the_counts_back(self):
+        self.like(self.adam)
+        with mock.patch.object(
+            Post.objects, 'filter', side_effect=DatabaseError
+        ), self.assertRaises(DatabaseError):
+            counter_buffer.flush()
+        self.assertEqual(counter_buffer.pending(self.post.id), (1, 0))
+
+    def test_reads_merge_the_counts_being_flushed(self):
+        self.like(self.adam)
+        taken = counter_buffer.take()
+        # Until the flush commits, reads still count the taken like
+        self.assertEqual(counter_buffer.pending(self.post.id), (1, 0))
+        counter_buffer.write(*taken)
+        self.assertEqual(counter_buffer.pending(self.post.id), (0, 0))
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_flush_after_reconcile_does_not_count_twice(self):
+        # Ensures a worker's flush recounts the post reconcile repaired
+        self.like(self.adam)
+        call_command('reconcile_post_counts', stdout=StringIO())
+        counter_buffer.flush()
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.likes_count, 1)
+
+    def test_etag_follows_unflushed_counts(self):
+        url = f'/posts/{self.post.id}/'
+        etag = self.client.get(url)['ETag']
+        self.like(self.users[0])
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['likes_count'], 1)
+        self.assertNotEqual(response['ETag'], etag)
+
+
+class PostLikeIdTests(APITestCase):
+    def setUp(self):
+        # Creates a viewer and posts by another user
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.brian = User.objects.create_user(username='brian', password='pass')
+        self.posts = [
+            Post.objects.create(owner=self.brian, title=f'post {i}')
+            for i in range(5)
+        ]
+
+    def test_like_id_belongs_to_the_viewer(self):
+        # Ensures like_id is the viewer's like, not the post owner's
+        like = Like.objects.create(owner=self.adam, post=self.posts[0])
+        Like.objects.create(owner=self.brian, post=self.posts[1])
+        self.client.login(username='adam', password='pass')
+        response = self.client.get('/posts/')
+        like_ids = {
+            post['id']: post['like_id'] for post in response.data['results']
+        }
+        self.assertEqual(like_ids[self.posts[0].id], like.id)
+        self.assertIsNone(like_ids[self.posts[1].id])
+        response = self.client.get(f'/posts/{self.posts[0].id}/')
+        self.assertEqual(response.data['like_id'], like.id)
+
+    def test_list_query_count_does_not_grow_with_page_size(self):
+        # Ensures the list costs the same number of queries for 1 or 5 posts
+        self.client.login(username='adam', password='pass')
+        for post in self.posts:
+            Like.objects.create(owner=self.adam, post=post)
+        caches['responses'].clear()
+        with CaptureQueriesContext(connection) as five_posts:
+            self.client.get('/posts/')
+        Post.objects.filter(pk__in=[p.pk for p in self.posts[1:]]).delete()
+        caches['responses'].clear()
+        with CaptureQueriesContext(connection) as one_post:
+            self.client.get('/posts/')
+        self.assertEqual(len(five_posts), len(one_post))
+
+
+class PostCursorPaginationTests(APITestCase):
+    def setUp(self):
+        # Creates more posts than fit on one page
+        adam = User.objects.create_user(username='adam', password='pass')
+        self.posts = [
+            Post.objects.create(owner=adam, title=f'post {i}')
+            for i in range(25)
+        ]
+
+    def test_cursor_pages_walk_every_post_once(self):
+        # Ensures following the next links returns every post in order
+        seen = []
+        url = '/posts/?pagination=cursor'
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, status.HTTP_200_OK)
+            self.assertNotIn('count', response.data)
+            seen += [post['id'] for post in response.data['results']]
+            url = response.data['next']
+        expected = [post.id for post in reversed(self.posts)]
+        self.assertEqual(seen, expected)
+
+    def test_page_number_mode_is_still_the_default(self):
+        # Ensures clients that don't opt in keep page numbers
+        response = self.client.get('/posts/')
+        self.assertEqual(response.data['count'], 25)
+        self.assertIn('page=2', response.data['next'])
+
+    def test_invalid_cursor_returns_not_found(self):
+        # Ensures a tampered cursor is rejected
+        response = self.client.get('/posts/?pagination=cursor&cursor=abc')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+
+class TrendingPostTests(APITestCase):
+    def setUp(self):
+        # Creates an old favourite and a fresh post
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.fans = [
+            User.objects.create_user(username=f'fan{i}', password='pass')
+            for i in range(3)
+        ]
+        self.old = Post.objects.create(owner=self.adam, title='old')
+        self.new = Post.objects.create(owner=self.adam, title='new')
+
+    def trending_titles(self):
+        response = self.client.get('/posts/trending/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post['title'] for post in response.data['results']]
+
+    def test_recent_activity_outranks_older_activity(self):
+        # Ensures three week-old likes rank below one fresh like
+        for fan in self.fans:
+            Like.objects.create(owner=fan, post=self.old)
+        Like.objects.filter(post=self.old).update(
+            created_at=self.old.created_at - timedelta(days=7)
+        )
+        Like.objects.create(owner=self.fans[0], post=self.new)
+        call_command('compute_trending', stdout=StringIO())
+        self.assertEqual(self.trending_titles(), ['new', 'old'])
+
+    def test_runs_only_touch_posts_with_new_activity(self):
+        # Ensures an incremental run leaves idle posts alone
+        Like.objects.create(owner=self.fans[0], post=self.old)
+        call_command('compute_trending', stdout=StringIO())
+        old_score = PostScore.objects.get(post=self.old)
+
+        Comment.objects.create(owner=self.fans[0], post=self.new, content='!')
+        out = StringIO()
+        call_command('compute_trending', stdout=out)
+        self.assertIn('Updated trending scores for 1 post(s).', out.getvalue())
+        self.assertEqual(
+            PostScore.objects.get(post=self.old).updated_at,
+            old_score.updated_at,
+        )
+        self.assertEqual(self.trending_titles(), ['new', 'old'])
+
+    def test_incremental_scores_match_a_rebuild(self):
+        # Ensures folding activity in steps gives the rebuilt score
+        Like.objects.create(owner=self.fans[0], post=self.old)
+        call_command('compute_trending', stdout=StringIO())
+        Like.objects.create(owner=self.fans[1], post=self.old)
+        call_command('compute_trending', stdout=StringIO())
+        incremental = PostScore.objects.get(post=self.old).score
+        call_command('compute_trending', '--rebuild', stdout=StringIO())
+        rebuilt = PostScore.objects.get(post=self.old).score
+        self.assertAlmostEqual(incremental, rebuilt)
+
+    def test_late_commits_are_folded_in_once(self):
+        # Ensures a like created before a run, but committed after it,
+        # is picked up by the next run and not counted again after
+        Like.objects.create(owner=self.fans[0], post=self.old)
+        call_command('compute_trending', stdout=StringIO())
+        checkpoint = TrendingCheckpoint.objects.get()
+        late = Like.objects.create(owner=self.fans[1], post=self.old)
+        Like.objects.filter(pk=late.pk).update(
+            created_at=checkpoint.scanned_to - timedelta(seconds=1)
+        )
+        call_command('compute_trending', stdout=StringIO())
+        call_command('compute_trending', stdout=StringIO())
+        incremental = PostScore.objects.get(post=self.old).score
+        call_command('compute_trending', '--rebuild', stdout=StringIO())
+        rebuilt = PostScore.objects.get(post=self.old).score
+        self.assertAlmostEqual(incremental, rebuilt)
+
+
+class PostCategoryCountTests(APITestCase):
+    def setUp(self):
+        # Creates posts in two categories by two owners
+        caches['responses'].clear()
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.brian = User.objects.create_user(username='brian', password='pass')
+        self.post = Post.objects.create(
+            owner=self.adam, title='a', category='food-and-drinks'
+        )
+        Post.objects.create(owner=self.brian, title='b', category='other')
+        Post.objects.create(owner=self.brian, title='c', category='other')
+
+    def counts(self, url='/posts/categories/'):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(response.data), len(Post.categories))
+        return {row['category']: row['count'] for row in response.data}
+
+    def test_counts_every_category(self):
+        counts = self.counts()
+        self.assertEqual(counts['food-and-drinks'], 1)
+        self.assertEqual(counts['other'], 2)
+        self.assertEqual(counts['relationships'], 0)
+
+    def test_counts_can_be_scoped_to_a_profile(self):
+        counts = self.counts(
+            f'/posts/categories/?owner__profile={self.brian.profile.id}'
+        )
+        self.assertEqual(counts['other'], 2)
+        self.assertEqual(counts['food-and-drinks'], 0)
+        response = self.client.get('/posts/categories/?owner__profile=999')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+
+    def test_profile_must_be_an_id(self):
+        for value in ['abc', '0', '99999999999999999999']:
+            response = self.client.get(
+                f'/posts/categories/?owner__profile={value}'
+            )
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+            self.assertIn('owner__profile', response.data)
+
+    def test_writes_adjust_the_cached_counts(self):
+        # Ensures creates, recategorizations and deletes are applied to
+        # the cache without recounting
+        category_counts()
+        category_counts(self.adam.id)
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(owner=self.adam, title='d', category='other')
+            self.post.category = 'other'
+            self.post.save()
+            Post.objects.filter(title='b').get().delete()
+        with self.assertNumQueries(0):
+            counts = category_counts()
+            adam_counts = category_counts(self.adam.id)
+        self.assertEqual(counts['other'], 3)
+        self.assertEqual(counts['food-and-drinks'], 0)
+        self.assertEqual(adam_counts['other'], 2)
+
+    def test_uncommitted_posts_leave_the_counts_alone(self):
+        category_counts()
+        with self.captureOnCommitCallbacks(execute=False):
+            Post.objects.create(owner=self.adam, title='d', category='other')
+        self.assertEqual(category_counts()['other'], 2)
+
+
+class PostConditionalGetTests(APITestCase):
+    def setUp(self):
+        # Creates a post to revalidate
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.post = Post.objects.create(owner=self.adam, title='a title')
+        self.url = f'/posts/{self.post.id}/'
+
+    def test_matching_etag_returns_not_modified(self):
+        # Ensures a revalidation is answered with 304 from fewer queries
+        with CaptureQueriesContext(connection) as full:
+            response = self.client.get(self.url)
+        etag = response['ETag']
+        with CaptureQueriesContext(connection) as revalidation:
+            response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        self.assertLess(len(revalidation), len(full))
+
+    def test_counter_and_edit_changes_invalidate_the_etag(self):
+        # Ensures likes and edits produce a new ETag
+        etag = self.client.get(self.url)['ETag']
+        Like.objects.create(owner=self.adam, post=self.post)
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertNotEqual(response['ETag'], etag)
+
+    def test_etag_depends_on_the_viewer(self):
+        # Ensures viewer-specific fields get their own validators
+        etag = self.client.get(self.url)['ETag']
+        self.client.login(username='adam', password='pass')
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertTrue(response.data['is_owner'])
+
+    def test_owner_rename_changes_the_etag(self):
+        # Ensures the owner's username, which the post shows, is validated
+        etag = self.client.get(self.url)['ETag']
+        self.adam.username = 'adam2'
+        self.adam.save()
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['owner'], 'adam2')
+
+    def test_list_returns_weak_etag(self):
+        # Ensures list pages can be revalidated with a weak ETag
+        response = self.client.get('/posts/')
+        etag = response['ETag']
+        self.assertTrue(etag.startswith('W/'))
+        response = self.client.get('/posts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+        Post.objects.create(owner=self.adam, title='another')
+        response = self.client.get('/posts/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class PostListResponseCacheTests(APITestCase):
+    def setUp(self):
+        # Starts from an empty response cache with one post
+        caches['responses'].clear()
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.post = Post.objects.create(owner=self.adam, title='a title')
+
+    def test_anonymous_repeat_is_served_from_cache(self):
+        # Ensures a repeated anonymous request skips the database
+        self.assertEqual(self.client.get('/posts/')['X-Cache'], 'MISS')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/posts/')
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(response.data['results'][0]['title'], 'a title')
+        self.assertEqual(get_stats(), {'hits': 1, 'misses': 1})
+
+    def test_query_params_are_normalized(self):
+        # Ensures the order of query params doesn't split the cache
+        self.client.get('/posts/?ordering=-likes_count&search=title')
+        response = self.client.get('/posts/?search=title&ordering=-likes_count')
+        self.assertEqual(response['X-Cache'], 'HIT')
+
+    def test_writes_invalidate_cached_responses(self):
+        # Ensures likes, comments and profile edits are seen at once
+        self.client.get('/posts/')
+        Like.objects.create(owner=self.adam, post=self.post)
+        response = self.client.get('/posts/')
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data['results'][0]['likes_count'], 1)
+
+        Comment.objects.create(owner=self.adam, post=self.post, content='c')
+        response = self.client.get('/posts/')
+        self.assertEqual(response.data['results'][0]['comments_count'], 1)
+
+        self.adam.profile.save()
+        self.assertEqual(self.client.get('/posts/')['X-Cache'], 'MISS')
+
+    def test_responses_cached_before_a_write_commits_are_missed(self):
+        # Ensures a read racing with an uncommitted write, which caches
+        # the old rows under the new version, is missed after commit
+        with self.captureOnCommitCallbacks(execute=True):
+            Post.objects.create(owner=self.adam, title='another title')
+            self.client.get('/posts/')
+        self.assertEqual(self.client.get('/posts/')['X-Cache'], 'MISS')
+
+    def test_authenticated_requests_bypass_cache(self):
+        # Ensures viewer-specific responses are never cached
+        self.client.get('/posts/')
+        self.client.login(username='adam', password='pass')
+        response = self.client.get('/posts/')
+        self.assertNotIn('X-Cache', response)
+        self.assertTrue(response.data['results'][0]['is_owner'])
+
+    def test_stats_command_reports_hits_and_misses(self):
+        # Ensures the stats command reports and resets the counts
+        self.client.get('/posts/')
+        self.client.get('/posts/')
+        out = StringIO()
+        call_command('response_cache_stats', '--reset', stdout=out)
+        self.assertIn('Hits: 1, misses: 1, hit ratio: 50.0%', out.getvalue())
+        self.assertEqual(get_stats(), {'hits': 0, 'misses': 0})
+
+
+def image_upload(width, height, fmt='PNG'):
+    # Encodes a blank image as an upload
+    buffer = BytesIO()
+    Image.new('RGB', (width, height)).save(buffer, fmt)
+    return SimpleUploadedFile('image.' + fmt.lower(), buffer.getvalue())
+
+
+def png_header_upload(width, height):
+    # Builds a PNG that only declares its size, with no pixel data
+    ihdr = struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0)
+    chunk = b'IHDR' + ihdr
+    data = (
+        b'\x89PNG\r\n\x1a\n' + struct.pack('>I', len(ihdr)) + chunk +
+        struct.pack('>I', zlib.crc32(chunk))
+    )
+    return SimpleUploadedFile('bomb.png', data)
+
+
+class PostImageValidationTests(APITestCase):
+    def setUp(self):
+        self.request = APIRequestFactory().post('/posts/')
+        self.request.user = User.objects.create_user(
+            username='adam', password='pass'
+        )
+
+    def errors_for(self, upload):
+        serializer = PostSerializer(
+            data={'title': 'a title', 'image': upload},
+            context={'request': self.request},
+        )
+        serializer.is_valid()
+        return serializer.errors.get('image')
+
+    def test_valid_images_are_accepted(self):
+        # Ensures every supported format passes validation
+        for fmt in ['PNG', 'JPEG', 'GIF', 'WEBP']:
+            self.assertIsNone(self.errors_for(image_upload(64, 48, fmt)))
+
+    def test_oversized_upload_is_rejected_before_reading(self):
+        # Ensures uploads over 2MB are refused without parsing them
+        upload = SimpleUploadedFile('big.png', b'\0' * (2 * 1024 * 1024 + 1))
+        self.assertEqual(
+            self.errors_for(upload), ['Image size larger than 2MB!']
+        )
+
+    def test_dimensions_come_from_the_header(self):
+        # Ensures huge declared dimensions are refused without decoding
+        self.assertEqual(
+            self.errors_for(png_header_upload(100000, 100000)),
+            ['Image height larger than 4096px!'],
+        )
+        self.assertEqual(
+            self.errors_for(image_upload(4097, 1, 'GIF')),
+            ['Image width larger than 4096px!'],
+        )
+
+    def test_non_images_are_rejected(self):
+        # Ensures uploads without a known image header are refused
+        upload = SimpleUploadedFile('notes.png', b'not an image at all')
+        self.assertEqual(
+            self.errors_for(upload),
+            ['Upload a valid PNG, JPEG, GIF or WebP image.'],
+        )
+
+
+class PostSparseFieldsTests(APITestCase):
+    def setUp(self):
+        # Creates a few posts, one liked by its owner
+        caches['responses'].clear()
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        for title in ['one', 'two', 'three']:
+            post = Post.objects.create(owner=self.adam, title=title)
+        Like.objects.create(owner=self.adam, post=post)
+
+    def test_grid_fields_cost_one_unjoined_query(self):
+        # Ensures ?fields=id,image reads only the posts table
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                '/posts/?pagination=cursor&fields=id,image'
+            )
+        self.assertEqual(len(queries), 1)
+        self.assertNotIn('JOIN', queries[0]['sql'])
+        self.assertEqual(
+            set(response.data['results'][0]), {'id', 'image'}
+        )
+
+    def test_omitted_method_fields_are_not_computed(self):
+        # Ensures like_id's lookup is skipped and the owner is read
+        # from the owner summary cache
+        self.client.login(username='adam', password='pass')
+        omit = 'like_id,profile_id,profile_image,profile_image_variants'
+        self.client.get(f'/posts/?pagination=cursor&omit={omit}')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f'/posts/?pagination=cursor&omit={omit}'
+            )
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('likes_like', sql)
+        self.assertNotIn('profiles_profile', sql)
+        result = response.data['results'][0]
+        self.assertNotIn('like_id', result)
+        self.assertEqual(result['owner'], 'adam')
+        self.assertTrue(result['is_owner'])
+
+    def test_detail_fields_are_pruned(self):
+        # Ensures detail views honour ?fields= and key ETags on it
+        post = Post.objects.get(title='one')
+        response = self.client.get(f'/posts/{post.id}/?fields=id,title')
+        self.assertEqual(response.data, {'id': post.id, 'title': 'one'})
+        full = self.client.get(f'/posts/{post.id}/')
+        self.assertNotEqual(response['ETag'], full['ETag'])
+
+
+class PostBulkListTests(APITestCase):
+    def setUp(self):
+        # Creates three posts, one liked by its owner
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.posts = [
+            Post.objects.create(owner=self.adam, title=title)
+            for title in ['one', 'two', 'three']
+        ]
+        self.like = Like.objects.create(owner=self.adam, post=self.posts[1])
+
+    def test_posts_are_returned_in_requested_order(self):
+        # Ensures order is kept and missing ids are reported
+        ids = [self.posts[2].id, 999, self.posts[0].id, self.posts[1].id]
+        self.client.login(username='adam', password='pass')
+        caches['responses'].clear()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(
+                f'/posts/bulk/?ids={",".join(map(str, ids))}'
+            )
+        self.assertEqual(
+            [post['title'] for post in response.data['results']],
+            ['three', 'one', 'two'],
+        )
+        self.assertEqual(response.data['missing'], [999])
+        self.assertEqual(
+            response.data['results'][2]['like_id'], self.like.id
+        )
+        # Session and user lookups, then the posts, the likes and the
+        # owner summaries
+        self.assertEqual(len(queries), 5)
+
+    def test_invalid_or_too_many_ids_are_rejected(self):
+        # Ensures malformed and oversized id lists get a 400
+        for query in [
+            '', '?ids=1,a', '?ids=0', '?ids=99999999999999999999',
+            '?ids=' + ','.join(str(pk) for pk in range(1, 102)),
+        ]:
+            response = self.client.get(f'/posts/bulk/{query}')
+            self.assertEqual(
+                response.status_code, status.HTTP_400_BAD_REQUEST
+            )
+
+
+class PostPopularityOrderingTests(APITestCase):
+    def setUp(self):
+        # Creates posts liked at different times
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.eve = User.objects.create_user(username='eve', password='pass')
+        self.posts = [
+            Post.objects.create(owner=self.adam, title=title)
+            for title in ['one', 'two', 'three', 'four']
+        ]
+        Like.objects.create(owner=self.adam, post=self.posts[2])
+        Like.objects.create(owner=self.eve, post=self.posts[2])
+        Like.objects.create(owner=self.adam, post=self.posts[0])
+
+    def titles(self, url):
+        return [post['title'] for post in self.client.get(url).data['results']]
+
+    def test_recently_liked_ordering_uses_last_liked_at(self):
+        # Ensures each post appears once, most recently liked first
+        self.assertEqual(
+            self.titles('/posts/?ordering=-likes__created_at'),
+            ['one', 'three', 'four', 'two'],
+        )
+        Like.objects.get(owner=self.adam, post=self.posts[0]).delete()
+        self.assertEqual(
+            self.titles('/posts/?ordering=-likes__created_at'),
+            ['three', 'four', 'two', 'one'],
+        )
+
+    def test_ascending_recently_liked_ordering_lists_unliked_first(self):
+        # Ensures never-liked posts come first, oldest first as
+        # the id tie-break follows the ordering's direction
+        self.assertEqual(
+            self.titles('/posts/?ordering=likes__created_at'),
+            ['two', 'four', 'three', 'one'],
+        )
+
+    def test_count_ordering_is_indexed_and_stable(self):
+        # Ensures ties fall back to id and pages don't overlap
+        with CaptureQueriesContext(connection) as queries:
+            titles = self.titles('/posts/?ordering=-likes_count')
+        self.assertEqual(titles, ['three', 'one', 'four', 'two'])
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('likes_like', sql)
+        self.assertNotIn('GROUP BY', sql)
+
+        for i in range(12):
+            Post.objects.create(owner=self.eve, title=f'extra {i}')
+        pages = (
+            self.titles('/posts/?ordering=-likes_count') +
+            self.titles('/posts/?ordering=-likes_count&page=2')
+        )
+        cursor_pages = []
+        url = '/posts/?ordering=-likes_count&pagination=cursor'
+        while url:
+            response = self.client.get(url)
+            cursor_pages += [
+                post['title'] for post in response.data['results']
+            ]
+            url = response.data['next']
+        self.assertEqual(len(set(pages)), 16)
+        self.assertEqual(cursor_pages, pages)
+
+    def test_reconcile_repairs_last_liked_at(self):
+        # Ensures the reconcile command recomputes last_liked_at
+        Post.objects.filter(pk=self.posts[1].pk).update(
+            last_liked_at=self.posts[1].created_at
+        )
+        out = StringIO()
+        call_command('reconcile_post_counts', stdout=out)
+        self.assertIn('Reconciled 1 drifted post(s).', out.getvalue())
@@ -1,7 +1,10 @@
 # urls.py
 from django.urls import path, include
 from rest_framework.routers import DefaultRouter
-from .views import PostList, PostDetail
+from .views import (
+    PostList, PostDetail, PostSearch, TrendingPostList, PostCategoryList,
+    PostBulkList,
+)
 
 
 
@@ -10,4 +13,13 @@ urlpatterns = [
     # Direct URLs for the list, detail, and autocomplete views
     path('posts/', PostList.as_view(), name='post-list'),
     path('posts/<int:pk>/', PostDetail.as_view(), name='post-detail'),
+    path('posts/search/', PostSearch.as_view(), name='post-search'),
+    path('posts/bulk/', PostBulkList.as_view(), name='post-bulk'),
+    path(
+        'posts/trending/', TrendingPostList.as_view(), name='post-trending'
+    ),
+    path(
+        'posts/categories/', PostCategoryList.as_view(),
+        name='post-categories'
+    ),
 ]
\ No newline at end of file
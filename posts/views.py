@@ -1,27 +1,86 @@
-from django.db.models import Count
-from rest_framework import viewsets, generics, permissions, status, filters
+from rest_framework import viewsets, generics, permissions, serializers, status
 from django_filters.rest_framework import DjangoFilterBackend
+from rest_framework.exceptions import ValidationError
 from rest_framework.response import Response
 from rest_framework.views import APIView
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.db.models import IntegerField, OuterRef, Subquery, Value
+from django.shortcuts import get_object_or_404
+from likes.models import Like
+from profiles.models import Profile
+from .facets import category_counts
+from .filters import PostOrderingFilter
+from .counters import pending_counts
 from .models import Post
 from .serializers import PostSerializer
+from api_retrospective.conditional import (
+    ConditionalRetrieveMixin, WeakETagListMixin,
+)
+from api_retrospective.pagination import KeysetPagination
+from api_retrospective.response_cache import AnonymousCacheMixin
+from api_retrospective.sparse_fields import is_field_selected
 from api_retrospective.permissions import IsOwnerOrReadOnly
+from search.filters import IndexedSearchFilter
+from search.models import SEARCH_FIELDS
+from search.views import RankedSearchList
 
+# The largest primary key; larger ids overflow the database's integer
+MAX_ID = 2 ** 63 - 1
 
-class PostList(generics.ListCreateAPIView):
+
+def like_ids_for(user, posts):
+    """
+    Maps post id to the user's like id for the given posts,
+    fetched with a single IN query.
+    """
+    if not user.is_authenticated:
+        return {}
+    return dict(
+        Like.objects.filter(
+            owner=user, post__in=[post.id for post in posts]
+        ).order_by().values_list('post_id', 'id')
+    )
+
+
+class LikeIdsMixin:
+    """
+    Resolves the viewer's likes for a whole page of posts at once
+    and hands them to the serializer as the `like_ids` context map.
+    Skipped when `like_id` isn't among the selected fields.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        if kwargs.get('many') and args:
+            posts = list(args[0])
+            context = self.get_serializer_context()
+            context['like_ids'] = {}
+            if is_field_selected(self.request, 'like_id'):
+                context['like_ids'] = like_ids_for(self.request.user, posts)
+            kwargs['context'] = context
+            args = (posts,) + args[1:]
+        return super().get_serializer(*args, **kwargs)
+
+
+class PostList(
+    WeakETagListMixin, AnonymousCacheMixin, LikeIdsMixin,
+    generics.ListCreateAPIView
+):
     """
     Lists posts or creates a post if logged in.
     """
+    cache_dependencies = [
+        'posts.post', 'likes.like', 'comments.comment',
+        'followers.follower', 'profiles.profile', 'auth.user',
+        'search.searchdocument',
+    ]
     serializer_class = PostSerializer
     permission_classes = [permissions.IsAuthenticatedOrReadOnly]
-    queryset = Post.objects.annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comment', distinct=True)
-    ).order_by('-created_at')
+    pagination_class = KeysetPagination
+    queryset = Post.objects.order_by('-created_at')
     filter_backends = [
-        filters.OrderingFilter,
-        filters.SearchFilter,
+        PostOrderingFilter,
+        IndexedSearchFilter,
         DjangoFilterBackend,
     ]
     filterset_fields = [
@@ -29,10 +88,7 @@ class PostList(generics.ListCreateAPIView):
         'likes__owner__profile',
         'owner__profile',
     ]
-    search_fields = [
-        'owner__username',
-        'title',
-    ]
+    search_fields = SEARCH_FIELDS[Post]
     ordering_fields = [
         'likes_count',
         'comments_count',
@@ -43,16 +99,139 @@ class PostList(generics.ListCreateAPIView):
         serializer.save(owner=self.request.user)
 
 
-class PostDetail(generics.RetrieveUpdateDestroyAPIView):
+class PostSearch(LikeIdsMixin, RankedSearchList):
+    """
+    Lists the posts matching `?q=` by owner username or title,
+    best match first.
+    """
+    serializer_class = PostSerializer
+    queryset = Post.objects.all()
+
+
+class TrendingPostList(LikeIdsMixin, generics.ListAPIView):
+    """
+    Lists posts by their precomputed trending score, highest first.
+    Scores are refreshed by the compute_trending command.
+    """
+    serializer_class = PostSerializer
+    queryset = Post.objects.filter(
+        trending__isnull=False
+    ).order_by('-trending__score', '-id')
+
+
+class PostBulkList(LikeIdsMixin, generics.ListAPIView):
+    """
+    Lists the posts with the ids in `?ids=1,2,3`, in that order,
+    with one query for the posts and one for the viewer's likes.
+    Ids of posts that don't exist are listed under `missing`.
+    """
+    serializer_class = PostSerializer
+    queryset = Post.objects.all()
+
+    def get_requested_ids(self):
+        """
+        Parses `?ids=` into a list of unique ids, in request order.
+        """
+        values = self.request.query_params.get('ids', '').split(',')
+        field = serializers.IntegerField(min_value=1, max_value=MAX_ID)
+        try:
+            ids = [
+                field.run_validation(value)
+                for value in values if value.strip()
+            ]
+        except ValidationError:
+            raise ValidationError({
+                'ids': 'Enter a comma-separated list of post ids.'
+            })
+        ids = list(dict.fromkeys(ids))
+        limit = settings.POSTS_BULK_LIMIT
+        if not ids:
+            raise ValidationError({'ids': 'This parameter is required.'})
+        if len(ids) > limit:
+            raise ValidationError({
+                'ids': f'Ensure there are at most {limit} ids.'
+            })
+        return ids
+
+    def list(self, request, *args, **kwargs):
+        ids = self.get_requested_ids()
+        found = self.get_queryset().in_bulk(ids)
+        serializer = self.get_serializer(
+            [found[pk] for pk in ids if pk in found], many=True
+        )
+        return Response({
+            'results': serializer.data,
+            'missing': [pk for pk in ids if pk not in found],
+        })
+
+
+class PostCategoryList(APIView):
+    """
+    Lists every post category with its number of posts.
+    `?owner__profile=<id>` counts only that profile's posts.
+    """
+
+    def get(self, request):
+        owner_id = None
+        profile_id = request.query_params.get('owner__profile')
+        if profile_id:
+            field = serializers.IntegerField(min_value=1, max_value=MAX_ID)
+            try:
+                profile_id = field.run_validation(profile_id)
+            except ValidationError as error:
+                raise ValidationError({'owner__profile': error.detail})
+            profile = get_object_or_404(
+                Profile.objects.only('owner_id'), pk=profile_id
+            )
+            owner_id = profile.owner_id
+        counts = category_counts(owner_id)
+        return Response([
+            {'category': value, 'label': label, 'count': counts[value]}
+            for value, label in Post.categories
+        ])
+
+
+class PostDetail(
+    ConditionalRetrieveMixin, generics.RetrieveUpdateDestroyAPIView
+):
     """
     Retrieves a posts and edits or deletes it if you own it.
     """
     serializer_class = PostSerializer
     permission_classes = [IsOwnerOrReadOnly]
-    queryset = Post.objects.annotate(
-        likes_count=Count('likes', distinct=True),
-        comments_count=Count('comment', distinct=True)
-    ).order_by('-created_at')
+    queryset = Post.objects.order_by('-created_at')
+    validator_fields = [
+        'updated_at', 'likes_count', 'comments_count',
+        'owner__profile__updated_at', 'owner__username', 'viewer_like_id',
+    ]
+
+    def get_validator_queryset(self):
+        """
+        Adds the viewer's like, which like_id exposes, to the validators.
+        """
+        user = self.request.user
+        viewer_like_id = Value(None, output_field=IntegerField())
+        if user.is_authenticated:
+            viewer_like_id = Subquery(Like.objects.filter(
+                post=OuterRef('pk'), owner=user
+            ).values('id')[:1])
+        return super().get_validator_queryset().annotate(
+            viewer_like_id=viewer_like_id
+        )
+
+    def get_validator_values(self, values):
+        """
+        Hashes the counts the serializer returns, with the deltas this
+        process has yet to write.
+        """
+        updated_at, likes, comments, *rest = values
+        pending_likes, pending_comments = pending_counts(
+            int(self.kwargs['pk'])
+        )
+        return (
+            updated_at, likes + pending_likes, comments + pending_comments,
+            *rest,
+        )
 
     def perform_update(self, serializer):
         tagged_users = self.request.data.get('tagged_users')
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery
+from django.db.models.functions import Coalesce
+from api_retrospective.response_cache import invalidate
+from followers.models import Follower
+from posts.models import Post
+from profiles.models import Profile
+
+
+def owner_count(model, field):
+    """
+    Returns a subquery expression counting the rows of `model`
+    whose `field` is the outer profile's owner.
+    """
+    return Coalesce(Subquery(
+        model.objects.filter(**{field: OuterRef('owner')})
+        .order_by().values(field)
+        .annotate(total=Count('pk')).values('total')
+    ), 0)
+
+
+class Command(BaseCommand):
+    """
+    Recounts posts, followers and follows for every profile and repairs
+    any counter column that has drifted from the actual rows.
+    """
+    help = (
+        'Reconciles Profile.posts_count, Profile.followers_count and '
+        'Profile.following_count.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--dry-run', action='store_true',
+            help='Report drifted profiles without updating them.',
+        )
+
+    def handle(self, *args, **options):
+        counts = {
+            'posts_count': owner_count(Post, 'owner'),
+            'followers_count': owner_count(Follower, 'followed'),
+            'following_count': owner_count(Follower, 'owner'),
+        }
+        with transaction.atomic():
+            drifted = Profile.objects.annotate(**{
+                f'actual_{field}': count for field, count in counts.items()
+            }).filter(
+                ~Q(posts_count=F('actual_posts_count')) |
+                ~Q(followers_count=F('actual_followers_count')) |
+                ~Q(following_count=F('actual_following_count'))
+            ).values_list('pk', flat=True)
+            drifted = list(drifted)
+
+            if drifted and not options['dry_run']:
+                Profile.objects.filter(pk__in=drifted).update(**counts)
+                invalidate('profiles.profile')
+
+        verb = 'Found' if options['dry_run'] else 'Reconciled'
+        self.stdout.write(f'{verb} {len(drifted)} drifted profile(s).')
@@ -0,0 +1,67 @@
+# Generated by Django 3.2.25 on 2026-10-18 15:20
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_counts(apps, schema_editor):
+    """
+    Populates the counters from the posts and followers tables.
+    """
+    Profile = apps.get_model('profiles', 'Profile')
+    Post = apps.get_model('posts', 'Post')
+    Follower = apps.get_model('followers', 'Follower')
+
+    def owner_count(model, field):
+        return Coalesce(Subquery(
+            model.objects.filter(**{field: OuterRef('owner')})
+            .order_by().values(field)
+            .annotate(total=Count('pk')).values('total')
+        ), 0)
+
+    Profile.objects.update(
+        posts_count=owner_count(Post, 'owner'),
+        followers_count=owner_count(Follower, 'followed'),
+        following_count=owner_count(Follower, 'owner'),
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('profiles', '0004_query_indexes'),
+        ('posts', '0008_query_indexes'),
+        ('followers', '0002_query_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='profile',
+            name='followers_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='following_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='profile',
+            name='posts_count',
+            field=models.IntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_counts, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['-posts_count', '-id'], name='profile_posts_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['-followers_count', '-id'], name='profile_followers_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(fields=['-following_count', '-id'], name='profile_following_id_idx'),
+        ),
+    ]
@@ -1,6 +1,9 @@
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import post_save, post_delete
 from django.contrib.auth.models import User
+from followers.models import Follower
+from posts.models import Post
 
 
 class Profile(models.Model):
@@ -9,15 +12,40 @@ class Profile(models.Model):
     """
     owner = models.OneToOneField(User, on_delete=models.CASCADE)
     created_at = models.DateTimeField(auto_now_add=True)
-    updated_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     name = models.CharField(max_length=250, blank=True)
     bio = models.TextField(blank=True)
     image = models.ImageField(
         upload_to='images/', default='../default_profile_mjfgzn'
     )
+    # Storage names of the resized copies of 'image', by variant name,
+    # filled in by the process_image_variants worker
+    image_variants = models.JSONField(default=dict, editable=False)
+    # Denormalized counters, kept in step by the Post and Follower signals.
+    posts_count = models.IntegerField(default=0, editable=False)
+    followers_count = models.IntegerField(default=0, editable=False)
+    following_count = models.IntegerField(default=0, editable=False)
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Serves the profile list, newest first
+            models.Index(
+                fields=['-created_at', '-id'], name='profile_created_id_idx'
+            ),
+            # Serve the profile list ordered by each counter
+            models.Index(
+                fields=['-posts_count', '-id'], name='profile_posts_id_idx'
+            ),
+            models.Index(
+                fields=['-followers_count', '-id'],
+                name='profile_followers_id_idx',
+            ),
+            models.Index(
+                fields=['-following_count', '-id'],
+                name='profile_following_id_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"{self.owner}'s profile"
@@ -31,5 +59,59 @@ def create_profile(sender, instance, created, **kwargs):
         Profile.objects.create(owner=instance)
 
 
+def adjust_counts(delta, **counts):
+    """
+    Adds `delta` to the given counter of each owner's profile,
+    e.g. adjust_counts(1, posts_count=user_id).
+    """
+    for field, owner_id in counts.items():
+        Profile.objects.filter(owner_id=owner_id).update(
+            **{field: F(field) + delta}
+        )
+
+
+def increment_posts_count(sender, instance, created, **kwargs):
+    """
+    Increments the owner's posts_count when a new post is created.
+    """
+    if created:
+        adjust_counts(1, posts_count=instance.owner_id)
+
+
+def decrement_posts_count(sender, instance, **kwargs):
+    """
+    Decrements the owner's posts_count when a post is deleted.
+    """
+    adjust_counts(-1, posts_count=instance.owner_id)
+
+
+def increment_follow_counts(sender, instance, created, **kwargs):
+    """
+    Increments the follower's following_count and the followed
+    user's followers_count when a new follow is created.
+    """
+    if created:
+        adjust_counts(
+            1, following_count=instance.owner_id,
+            followers_count=instance.followed_id,
+        )
+
+
+def decrement_follow_counts(sender, instance, **kwargs):
+    """
+    Decrements both counters of a follow when it is deleted.
+    """
+    adjust_counts(
+        -1, following_count=instance.owner_id,
+        followers_count=instance.followed_id,
+    )
+
+
 # Connects the signal handler function with the signal
 post_save.connect(create_profile, sender=User)
+
+# Keeps the Profile counters in step with the posts and followers tables
+post_save.connect(increment_posts_count, sender=Post)
+post_delete.connect(decrement_posts_count, sender=Post)
+post_save.connect(increment_follow_counts, sender=Follower)
+post_delete.connect(decrement_follow_counts, sender=Follower)
@@ -1,9 +1,14 @@
 from rest_framework import serializers
+from api_retrospective.images import ImageUploadField
+from api_retrospective.sparse_fields import SparseFieldsSerializerMixin
 from .models import Profile
 from followers.models import Follower
+from variants.serializers import ImageVariantsField
 
 
-class ProfileSerializer(serializers.ModelSerializer):
+class ProfileSerializer(
+    SparseFieldsSerializerMixin, serializers.ModelSerializer
+):
     """
     Serializer for the Profile model to handle user profile data.
     """
@@ -13,31 +18,38 @@ class ProfileSerializer(serializers.ModelSerializer):
     posts_count = serializers.ReadOnlyField()
     followers_count = serializers.ReadOnlyField()
     following_count = serializers.ReadOnlyField()
+    image = ImageUploadField(required=False)
+    image_variants = ImageVariantsField(source='*')
 
     def get_is_owner(self, obj):
         """
         Returns True if the current user is the owner of the profile.
         """
         request = self.context['request']
-        return request.user == obj.owner
+        return request.user.pk == obj.owner_id
 
     def get_following_id(self, obj):
         """
         Returns the ID of the current user's following relation to the profile,
         or None if not following.
+        The views resolve these up front and pass them in as the
+        `following_ids` context map.
         """
         user = self.context['request'].user
-        if user.is_authenticated:
-            following = Follower.objects.filter(
-                owner=user, followed=obj.owner
-            ).first()
-            return following.id if following else None
-        return None
+        if not user.is_authenticated:
+            return None
+        following_ids = self.context.get('following_ids')
+        if following_ids is not None:
+            return following_ids.get(obj.owner_id)
+        following = Follower.objects.filter(
+            owner=user, followed_id=obj.owner_id
+        ).first()
+        return following.id if following else None
 
     class Meta:
         model = Profile
         fields = [
             'id', 'owner', 'created_at', 'updated_at', 'name',
-            'bio', 'image', 'is_owner', 'following_id', 'posts_count',
-            'followers_count', 'following_count',
+            'bio', 'image', 'image_variants', 'is_owner', 'following_id',
+            'posts_count', 'followers_count', 'following_count',
         ]
@@ -1,4 +1,11 @@
+from io import StringIO
 from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from posts.tests import png_header_upload
+from followers.models import Follower
+from posts.models import Post
 from .models import Profile
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -38,6 +45,17 @@ class ProfileDetailViewTests(APITestCase):
         response = self.client.put('/profiles/1/', {'bio': 'Updated bio'})
         self.assertEqual(response.status_code, status.HTTP_200_OK)
 
+    def test_profile_image_dimensions_are_validated(self):
+        self.client.login(username='tester', password='test123')
+        response = self.client.put(
+            '/profiles/1/', {'image': png_header_upload(5000, 100)},
+            format='multipart',
+        )
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+        self.assertEqual(
+            response.data['image'], ['Image width larger than 4096px!']
+        )
+
     def test_logged_in_user_cant_update_other_users_profile(self):
         self.client.login(username='tester', password='test123')
         response = self.client.put('/profiles/2/', {'bio': 'Updated bio 2'})
@@ -51,3 +69,151 @@ class ProfileDetailViewTests(APITestCase):
         self.client.login(username='tester', password='test123')
         response = self.client.post('/dj-rest-auth/logout/')
         self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ProfileConditionalGetTests(APITestCase):
+    """
+    Tests for conditional GETs on the ProfileDetail view.
+    """
+    def setUp(self):
+        User.objects.create_user(username='tester', password='test123')
+        User.objects.create_user(username='tester2', password='test321')
+
+    def test_matching_etag_returns_not_modified(self):
+        etag = self.client.get('/profiles/1/')['ETag']
+        response = self.client.get('/profiles/1/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_304_NOT_MODIFIED)
+
+    def test_follow_and_edit_change_the_etag(self):
+        self.client.login(username='tester2', password='test321')
+        etag = self.client.get('/profiles/1/')['ETag']
+        Follower.objects.create(
+            owner=User.objects.get(username='tester2'),
+            followed=User.objects.get(username='tester'),
+        )
+        response = self.client.get('/profiles/1/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['followers_count'], 1)
+
+        etag = response['ETag']
+        profile = Profile.objects.get(pk=1)
+        profile.bio = 'Updated bio'
+        profile.save()
+        response = self.client.get('/profiles/1/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+
+
+class ProfileSparseFieldsTests(APITestCase):
+    """
+    Tests for ?fields= / ?omit= on the profile views.
+    """
+    def setUp(self):
+        User.objects.create_user(username='tester', password='test123')
+        User.objects.create_user(username='tester2', password='test321')
+
+    def test_selected_fields_only(self):
+        response = self.client.get('/profiles/?fields=id,name')
+        self.assertEqual(set(response.data['results'][0]), {'id', 'name'})
+
+    def test_ordering_by_an_omitted_count_still_works(self):
+        Post.objects.create(
+            owner=User.objects.get(username='tester2'), title='a post'
+        )
+        response = self.client.get(
+            '/profiles/?fields=owner&ordering=-posts_count'
+        )
+        self.assertEqual(response.data['results'][0], {'owner': 'tester2'})
+
+    def test_omit_drops_fields_from_detail(self):
+        response = self.client.get('/profiles/1/?omit=following_id,image')
+        self.assertNotIn('following_id', response.data)
+        self.assertNotIn('image', response.data)
+        self.assertEqual(response.data['posts_count'], 0)
+
+
+class ProfileCountTests(APITestCase):
+    """
+    Tests for the denormalized Profile counters.
+    """
+    def setUp(self):
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.brian = User.objects.create_user(username='brian', password='pass')
+
+    def counts(self, user):
+        profile = Profile.objects.get(owner=user)
+        return (
+            profile.posts_count, profile.followers_count,
+            profile.following_count,
+        )
+
+    def test_counts_follow_posts_and_follows(self):
+        post = Post.objects.create(owner=self.adam, title='a post')
+        follow = Follower.objects.create(owner=self.brian, followed=self.adam)
+        self.assertEqual(self.counts(self.adam), (1, 1, 0))
+        self.assertEqual(self.counts(self.brian), (0, 0, 1))
+
+        post.delete()
+        follow.delete()
+        self.assertEqual(self.counts(self.adam), (0, 0, 0))
+        self.assertEqual(self.counts(self.brian), (0, 0, 0))
+
+    def test_counts_are_read_without_joins(self):
+        Post.objects.create(owner=self.adam, title='a post')
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/profiles/?ordering=-posts_count')
+        sql = ' '.join(query['sql'] for query in queries)
+        self.assertNotIn('posts_post', sql)
+        self.assertNotIn('followers_follower', sql)
+        self.assertEqual(response.data['results'][0]['owner'], 'adam')
+        self.assertEqual(response.data['results'][0]['posts_count'], 1)
+
+    def test_reconcile_repairs_drifted_counts(self):
+        Post.objects.create(owner=self.adam, title='a post')
+        Profile.objects.filter(owner=self.adam).update(
+            posts_count=5, followers_count=2
+        )
+        out = StringIO()
+        call_command('reconcile_profile_counts', stdout=out)
+        self.assertIn('Reconciled 1 drifted profile(s).', out.getvalue())
+        self.assertEqual(self.counts(self.adam), (1, 0, 0))
+
+
+class ProfileFollowingIdTests(APITestCase):
+    """
+    Tests for the batched following_id of the profile views.
+    """
+    def setUp(self):
+        self.viewer = User.objects.create_user(
+            username='viewer', password='pass'
+        )
+        self.users = [
+            User.objects.create_user(username=f'user{i}', password='pass')
+            for i in range(5)
+        ]
+        self.follow = Follower.objects.create(
+            owner=self.viewer, followed=self.users[0]
+        )
+        self.client.login(username='viewer', password='pass')
+
+    def test_list_resolves_follows_in_one_query(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get('/profiles/')
+        following_ids = {
+            profile['owner']: profile['following_id']
+            for profile in response.data['results']
+        }
+        self.assertEqual(following_ids.pop('user0'), self.follow.id)
+        self.assertEqual(set(following_ids.values()), {None})
+        follow_queries = [
+            query for query in queries
+            if 'followers_follower' in query['sql']
+        ]
+        self.assertEqual(len(follow_queries), 1)
+
+    def test_detail_returns_following_id(self):
+        profile = Profile.objects.get(owner=self.users[0])
+        response = self.client.get(f'/profiles/{profile.id}/')
+        self.assertEqual(response.data['following_id'], self.follow.id)
+        profile = Profile.objects.get(owner=self.users[1])
+        response = self.client.get(f'/profiles/{profile.id}/')
+        self.assertIsNone(response.data['following_id'])
@@ -1,24 +1,75 @@
-from django.db.models import Count
-from rest_framework import generics, filters
+from django.db.models import IntegerField, OuterRef, Subquery, Value
+from rest_framework import generics
 from django_filters.rest_framework import DjangoFilterBackend
+from followers.models import Follower
 from .models import Profile
 from .serializers import ProfileSerializer
+from api_retrospective.conditional import (
+    ConditionalRetrieveMixin, WeakETagListMixin,
+)
+from api_retrospective.filters import IndexedOrderingFilter
 from api_retrospective.permissions import IsOwnerOrReadOnly
+from api_retrospective.response_cache import AnonymousCacheMixin
+from api_retrospective.sparse_fields import (
+    SparseQuerysetMixin, is_field_selected,
+)
 
 
-class ProfileList(generics.ListAPIView):
+def following_ids_for(user, profiles):
+    """
+    Maps profile owner id to the user's follow id for the given
+    profiles, fetched with a single IN query.
+    """
+    if not user.is_authenticated:
+        return {}
+    return dict(
+        Follower.objects.filter(
+            owner=user,
+            followed__in=[profile.owner_id for profile in profiles],
+        ).order_by().values_list('followed_id', 'id')
+    )
+
+
+class FollowingIdsMixin:
+    """
+    Resolves the viewer's follows of a whole page of profiles, or of
+    the one profile of a detail view, at once and hands them to the
+    serializer as the `following_ids` context map.
+    Skipped when `following_id` isn't among the selected fields.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        if args and args[0] is not None:
+            many = kwargs.get('many')
+            profiles = list(args[0]) if many else [args[0]]
+            context = self.get_serializer_context()
+            context['following_ids'] = {}
+            if is_field_selected(self.request, 'following_id'):
+                context['following_ids'] = following_ids_for(
+                    self.request.user, profiles
+                )
+            kwargs['context'] = context
+            if many:
+                args = (profiles,) + args[1:]
+        return super().get_serializer(*args, **kwargs)
+
+
+class ProfileList(
+    WeakETagListMixin, AnonymousCacheMixin, SparseQuerysetMixin,
+    FollowingIdsMixin, generics.ListAPIView
+):
     """
     List all profiles.
     No create view as profile creation is handled by Django signals.
     """
-    queryset = Profile.objects.annotate(
-        posts_count=Count('owner__post', distinct=True),
-        followers_count=Count('owner__followed', distinct=True),
-        following_count=Count('owner__following', distinct=True)
-    ).order_by('-created_at')
+    cache_dependencies = [
+        'profiles.profile', 'posts.post', 'followers.follower', 'auth.user',
+    ]
+    queryset = Profile.objects.order_by('-created_at')
     serializer_class = ProfileSerializer
+    field_relations = {'owner': ['owner']}
     filter_backends = [
-        filters.OrderingFilter,
+        IndexedOrderingFilter,
         DjangoFilterBackend,
     ]
     filterset_fields = [
@@ -34,14 +85,32 @@ class ProfileList(generics.ListAPIView):
     ]
 
 
-class ProfileDetail(generics.RetrieveUpdateAPIView):
+class ProfileDetail(
+    ConditionalRetrieveMixin, SparseQuerysetMixin, FollowingIdsMixin,
+    generics.RetrieveUpdateAPIView
+):
     """
     Retrieves or updates a profile if you're the owner.
     """
     permission_classes = [IsOwnerOrReadOnly]
-    queryset = Profile.objects.annotate(
-        posts_count=Count('owner__post', distinct=True),
-        followers_count=Count('owner__followed', distinct=True),
-        following_count=Count('owner__following', distinct=True)
-    ).order_by('-created_at')
+    queryset = Profile.objects.order_by('-created_at')
     serializer_class = ProfileSerializer
+    field_relations = {'owner': ['owner']}
+    validator_fields = [
+        'updated_at', 'posts_count', 'followers_count', 'following_count',
+        'viewer_following_id',
+    ]
+
+    def get_validator_queryset(self):
+        """
+        Adds the viewer's follow of the profile to the validators.
+        """
+        user = self.request.user
+        viewer_following_id = Value(None, output_field=IntegerField())
+        if user.is_authenticated:
+            viewer_following_id = Subquery(Follower.objects.filter(
+                owner=user, followed=OuterRef('owner')
+            ).values('id')[:1])
+        return super().get_validator_queryset().annotate(
+            viewer_following_id=viewer_following_id,
+        )
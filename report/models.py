@@ -27,6 +27,21 @@ class Report(models.Model):
     class Meta:
         """Order reports by the most recent."""
         ordering = ['-created_at']
+        # Serve the report list, newest first, whole or filtered
+        # by one of its filterset_fields
+        indexes = [
+            models.Index(
+                fields=['-created_at', '-id'], name='report_created_id_idx'
+            ),
+            models.Index(
+                fields=['category', '-created_at', '-id'],
+                name='report_category_created_idx',
+            ),
+            models.Index(
+                fields=['user', '-created_at', '-id'],
+                name='report_user_created_idx',
+            ),
+        ]
 
     def __str__(self):
         return f"Report by {self.user} - {self.category}"
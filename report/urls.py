@@ -1,9 +1,10 @@
 # report/urls.py
 from django.urls import path
 from . import views
-from .views import ReportList
+from .views import ReportList, ReportSearch
 
 urlpatterns = [
     path('report/', ReportList.as_view(), name='report-list'),
+    path('report/search/', ReportSearch.as_view(), name='report-search'),
 
 ]
@@ -1,4 +1,8 @@
 from rest_framework import generics, filters
+from django_filters.rest_framework import DjangoFilterBackend
+from search.filters import IndexedSearchFilter
+from search.models import SEARCH_FIELDS
+from search.views import RankedSearchList
 from .models import Report
 from .serializers import ReportSerializer
 
@@ -15,13 +19,22 @@ class ReportList(generics.ListCreateAPIView):
         serializer.save(user=self.request.user)
 
     filter_backends = [
-        filters.SearchFilter,
+        IndexedSearchFilter,
         filters.OrderingFilter,
+        DjangoFilterBackend,
     ]
 
     filterset_fields = ['user', 'category']
 
-    search_fields = ['user__username', 'category', 'comment', 'title']
+    search_fields = SEARCH_FIELDS[Report]
 
     ordering_fields = ['created_at', 'category']
     ordering = ['-created_at']
+
+
+class ReportSearch(RankedSearchList):
+    """List the reports matching `?q=`, best match first."""
+
+    queryset = Report.objects.all()
+    serializer_class = ReportSerializer
+    permission_classes = []
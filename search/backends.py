@@ -0,0 +1,130 @@
+import re
+from django.db import connection
+from django.db.models.expressions import RawSQL
+from .models import SearchDocument
+
+FTS_TABLE = 'search_searchdocument_fts'
+TS_CONFIG = 'simple'
+
+WORD_RE = re.compile(r'\w+')
+
+
+class SQLiteSearchBackend:
+    """
+    Searches the FTS5 table that mirrors SearchDocument.body.
+    Each search word matches as a token prefix; results rank by bm25.
+    """
+
+    def match_expression(self, words):
+        return ' '.join(f'"{word}"*' for word in words)
+
+    def ids_sql(self, doc_type, words):
+        sql = (
+            f'SELECT d.object_id FROM {FTS_TABLE} '
+            f'JOIN search_searchdocument d ON d.id = {FTS_TABLE}.rowid '
+            f'WHERE {FTS_TABLE} MATCH %s AND d.doc_type = %s'
+        )
+        return sql, [self.match_expression(words), doc_type]
+
+    def ranked_sql(self, doc_type, words, limit):
+        sql, params = self.ids_sql(doc_type, words)
+        return f'{sql} ORDER BY {FTS_TABLE}.rank LIMIT %s', params + [limit]
+
+    def rebuild(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')"
+            )
+
+
+class PostgresSearchBackend:
+    """
+    Searches SearchDocument.body through its GIN tsvector index.
+    Each search word matches as a lexeme prefix; results rank by ts_rank.
+    """
+    vector = f"to_tsvector('{TS_CONFIG}', body)"
+
+    def match_expression(self, words):
+        return ' & '.join(f'{word}:*' for word in words)
+
+    def ids_sql(self, doc_type, words):
+        sql = (
+            'SELECT object_id FROM search_searchdocument '
+            f"WHERE doc_type = %s AND {self.vector} @@ "
+            f"to_tsquery('{TS_CONFIG}', %s)"
+        )
+        return sql, [doc_type, self.match_expression(words)]
+
+    def ranked_sql(self, doc_type, words, limit):
+        sql, params = self.ids_sql(doc_type, words)
+        rank = f"ts_rank({self.vector}, to_tsquery('{TS_CONFIG}', %s))"
+        return (
+            f'{sql} ORDER BY {rank} DESC LIMIT %s',
+            params + [self.match_expression(words), limit],
+        )
+
+    def rebuild(self):
+        pass
+
+
+class FallbackSearchBackend:
+    """
+    Unindexed substring search for other database engines.
+    """
+
+    def ids_sql(self, doc_type, words):
+        queryset = SearchDocument.objects.filter(doc_type=doc_type)
+        for word in words:
+            queryset = queryset.filter(body__icontains=word)
+        return queryset.values('object_id').query.sql_with_params()
+
+    def ranked_sql(self, doc_type, words, limit):
+        sql, params = self.ids_sql(doc_type, words)
+        return f'{sql} LIMIT %s', params + (limit,)
+
+    def rebuild(self):
+        pass
+
+
+def get_backend():
+    """
+    Returns the search backend for the default database engine.
+    """
+    if connection.vendor == 'sqlite':
+        return SQLiteSearchBackend()
+    if connection.vendor == 'postgresql':
+        return PostgresSearchBackend()
+    return FallbackSearchBackend()
+
+
+def search_words(query):
+    """
+    Splits a search query into the words the index can match.
+    """
+    return WORD_RE.findall(query.lower())
+
+
+def matching_ids(model, query):
+    """
+    Returns an expression selecting the ids of `model` rows whose
+    indexed text matches every word of `query`, for use in pk__in.
+    """
+    sql, params = get_backend().ids_sql(
+        model._meta.label_lower, search_words(query)
+    )
+    return RawSQL(sql, params)
+
+
+def ranked_ids(model, query, limit):
+    """
+    Returns up to `limit` ids of matching `model` rows, best match first.
+    """
+    words = search_words(query)
+    if not words:
+        return []
+    sql, params = get_backend().ranked_sql(
+        model._meta.label_lower, words, limit
+    )
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
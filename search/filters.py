@@ -0,0 +1,21 @@
+from rest_framework import filters
+from .backends import matching_ids, search_words
+
+
+class IndexedSearchFilter(filters.SearchFilter):
+    """
+    A drop-in replacement for DRF's SearchFilter that answers `?search=`
+    from the full-text index instead of icontains scans over the
+    view's search_fields. The index covers search.models.SEARCH_FIELDS,
+    which the views' search_fields point to. Words match indexed tokens
+    by prefix.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        terms = self.get_search_terms(request)
+        if not terms:
+            return queryset
+        query = ' '.join(terms)
+        if not search_words(query):
+            return queryset.none()
+        return queryset.filter(pk__in=matching_ids(queryset.model, query))
@@ -0,0 +1,47 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from api_retrospective.response_cache import invalidate
+from search.backends import get_backend
+from search.models import SEARCH_FIELDS, SearchDocument, document_body
+
+
+class Command(BaseCommand):
+    """
+    Regenerates every search document from the indexed models
+    and rebuilds the engine's full-text index.
+    """
+    help = 'Rebuilds the full-text search index.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', type=int, default=2000,
+            help='Rows to read and insert per batch.',
+        )
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        total = 0
+        with transaction.atomic():
+            SearchDocument.objects.all().delete()
+            for model, fields in SEARCH_FIELDS.items():
+                related = {
+                    path.rsplit('__', 1)[0] for path in fields if '__' in path
+                }
+                rows = model.objects.select_related(*related).order_by('pk')
+                batch = []
+                for instance in rows.iterator(chunk_size=chunk_size):
+                    batch.append(SearchDocument(
+                        doc_type=model._meta.label_lower,
+                        object_id=instance.pk,
+                        body=document_body(instance),
+                    ))
+                    if len(batch) >= chunk_size:
+                        SearchDocument.objects.bulk_create(batch)
+                        total += len(batch)
+                        batch = []
+                SearchDocument.objects.bulk_create(batch)
+                total += len(batch)
+            get_backend().rebuild()
+        invalidate('search.searchdocument')
+
+        self.stdout.write(f'Indexed {total} document(s).')
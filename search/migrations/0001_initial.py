@@ -0,0 +1,26 @@
+# Generated by Django 3.2.25 on 2026-10-18 14:52
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('doc_type', models.CharField(max_length=50)),
+                ('object_id', models.BigIntegerField()),
+                ('body', models.TextField()),
+            ],
+            options={
+                'unique_together': {('doc_type', 'object_id')},
+            },
+        ),
+    ]
@@ -0,0 +1,68 @@
+from django.db import migrations
+
+SQLITE_FORWARD = [
+    # External-content FTS5 table mirroring search_searchdocument.body
+    """CREATE VIRTUAL TABLE search_searchdocument_fts USING fts5(
+        body, content='search_searchdocument', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )""",
+    """CREATE TRIGGER search_searchdocument_ai AFTER INSERT
+    ON search_searchdocument BEGIN
+        INSERT INTO search_searchdocument_fts(rowid, body)
+        VALUES (new.id, new.body);
+    END""",
+    """CREATE TRIGGER search_searchdocument_ad AFTER DELETE
+    ON search_searchdocument BEGIN
+        INSERT INTO search_searchdocument_fts(
+            search_searchdocument_fts, rowid, body
+        ) VALUES ('delete', old.id, old.body);
+    END""",
+    """CREATE TRIGGER search_searchdocument_au AFTER UPDATE
+    ON search_searchdocument BEGIN
+        INSERT INTO search_searchdocument_fts(
+            search_searchdocument_fts, rowid, body
+        ) VALUES ('delete', old.id, old.body);
+        INSERT INTO search_searchdocument_fts(rowid, body)
+        VALUES (new.id, new.body);
+    END""",
+]
+SQLITE_BACKWARD = [
+    'DROP TRIGGER IF EXISTS search_searchdocument_au',
+    'DROP TRIGGER IF EXISTS search_searchdocument_ad',
+    'DROP TRIGGER IF EXISTS search_searchdocument_ai',
+    'DROP TABLE IF EXISTS search_searchdocument_fts',
+]
+POSTGRES_FORWARD = [
+    """CREATE INDEX search_searchdocument_body_gin
+    ON search_searchdocument USING GIN (to_tsvector('simple', body))""",
+]
+POSTGRES_BACKWARD = [
+    'DROP INDEX IF EXISTS search_searchdocument_body_gin',
+]
+
+
+def run_statements(statements):
+    def run(apps, schema_editor):
+        for statement in statements.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(statement)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            run_statements({
+                'sqlite': SQLITE_FORWARD,
+                'postgresql': POSTGRES_FORWARD,
+            }),
+            run_statements({
+                'sqlite': SQLITE_BACKWARD,
+                'postgresql': POSTGRES_BACKWARD,
+            }),
+        ),
+    ]
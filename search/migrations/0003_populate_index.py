@@ -0,0 +1,52 @@
+from django.db import migrations
+
+# The indexed fields as of this migration; later changes to
+# search.models.SEARCH_FIELDS need rebuild_search_index
+INDEXED_FIELDS = {
+    'posts.Post': ['owner__username', 'title'],
+    'feedback.Feedback': ['first_name', 'last_name', 'email', 'content'],
+    'report.Report': ['user__username', 'category', 'comment', 'title'],
+}
+CHUNK_SIZE = 2000
+
+
+def populate_index(apps, schema_editor):
+    """
+    Indexes the rows that existed before the search index did. The
+    engine's full-text index follows the documents by itself: FTS5
+    through its triggers, PostgreSQL through the GIN expression index.
+    """
+    SearchDocument = apps.get_model('search', 'SearchDocument')
+    for label, fields in INDEXED_FIELDS.items():
+        model = apps.get_model(label)
+        doc_type = label.lower()
+        indexed = set(SearchDocument.objects.filter(
+            doc_type=doc_type
+        ).values_list('object_id', flat=True))
+        rows = model.objects.order_by('pk').values_list('pk', *fields)
+        batch = []
+        for pk, *values in rows.iterator(chunk_size=CHUNK_SIZE):
+            if pk in indexed:
+                continue
+            batch.append(SearchDocument(
+                doc_type=doc_type, object_id=pk,
+                body='\n'.join(str(value) for value in values if value),
+            ))
+            if len(batch) >= CHUNK_SIZE:
+                SearchDocument.objects.bulk_create(batch)
+                batch = []
+        SearchDocument.objects.bulk_create(batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('search', '0002_fulltext_index'),
+        ('posts', '0009_trending_overlap'),
+        ('feedback', '0002_query_indexes'),
+        ('report', '0002_query_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_index, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,85 @@
+from django.db import models
+from django.db.models.signals import post_save, post_delete
+from django.contrib.auth.models import User
+from posts.models import Post
+from feedback.models import Feedback
+from report.models import Report
+
+
+class SearchDocument(models.Model):
+    """
+    The searchable text of one indexed object.
+    'doc_type' is the indexed model's label, e.g. 'posts.post'.
+    The full-text index over 'body' is engine specific: an FTS5 table
+    on SQLite and a GIN expression index on PostgreSQL (see migrations).
+    """
+    doc_type = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    body = models.TextField()
+
+    class Meta:
+        unique_together = ['doc_type', 'object_id']
+
+    def __str__(self):
+        return f'{self.doc_type} {self.object_id}'
+
+
+# The indexed fields of each model, which the views' search_fields are
+SEARCH_FIELDS = {
+    Post: ['owner__username', 'title'],
+    Feedback: ['first_name', 'last_name', 'email', 'content'],
+    Report: ['user__username', 'category', 'comment', 'title'],
+}
+
+
+def document_body(instance):
+    """
+    Joins the indexed field values of an instance into one text body.
+    """
+    values = []
+    for path in SEARCH_FIELDS[type(instance)]:
+        value = instance
+        for attr in path.split('__'):
+            value = getattr(value, attr, None)
+        if value:
+            values.append(str(value))
+    return '\n'.join(values)
+
+
+def index_instance(sender, instance, **kwargs):
+    """
+    Creates or refreshes the search document of a saved instance.
+    """
+    SearchDocument.objects.update_or_create(
+        doc_type=sender._meta.label_lower,
+        object_id=instance.pk,
+        defaults={'body': document_body(instance)},
+    )
+
+
+def unindex_instance(sender, instance, **kwargs):
+    """
+    Removes the search document of a deleted instance.
+    """
+    SearchDocument.objects.filter(
+        doc_type=sender._meta.label_lower, object_id=instance.pk
+    ).delete()
+
+
+def reindex_user_content(sender, instance, created, update_fields, **kwargs):
+    """
+    Refreshes the documents that include a user's username.
+    """
+    if created or (update_fields and 'username' not in update_fields):
+        return
+    for post in Post.objects.filter(owner=instance).select_related('owner'):
+        index_instance(Post, post)
+    for report in Report.objects.filter(user=instance).select_related('user'):
+        index_instance(Report, report)
+
+
+# Keeps the search index in step with the indexed models
+for model in SEARCH_FIELDS:
+    post_save.connect(index_instance, sender=model)
+    post_delete.connect(unindex_instance, sender=model)
+post_save.connect(reindex_user_content, sender=User)
@@ -0,0 +1,86 @@
+from io import StringIO
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from rest_framework import status
+from rest_framework.test import APITestCase
+from feedback.models import Feedback
+from posts.models import Post
+from report.models import Report
+from .models import SearchDocument
+
+
+class SearchIndexTests(APITestCase):
+    """
+    Tests for the full-text index and the search endpoints.
+    """
+    def setUp(self):
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.brian = User.objects.create_user(username='brian', password='pass')
+        self.sunset = Post.objects.create(
+            owner=self.adam, title='Sunset over the harbour'
+        )
+        self.sunrise = Post.objects.create(
+            owner=self.brian, title='Sunrise sunset and sunset again'
+        )
+
+    def search_titles(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        return [post['title'] for post in response.data['results']]
+
+    def test_list_search_uses_the_index(self):
+        titles = self.search_titles('/posts/?search=harb')
+        self.assertEqual(titles, ['Sunset over the harbour'])
+        titles = self.search_titles('/posts/?search=brian sun')
+        self.assertEqual(titles, ['Sunrise sunset and sunset again'])
+
+    def test_ranked_search_orders_by_relevance(self):
+        titles = self.search_titles('/posts/search/?q=sunset')
+        self.assertEqual(titles, [
+            'Sunrise sunset and sunset again', 'Sunset over the harbour',
+        ])
+        self.assertEqual(self.search_titles('/posts/search/?q=!!'), [])
+
+    def test_index_follows_edits_and_deletes(self):
+        self.sunset.title = 'Moonlight'
+        self.sunset.save()
+        self.assertEqual(self.search_titles('/posts/?search=harbour'), [])
+        self.assertEqual(
+            self.search_titles('/posts/?search=moon'), ['Moonlight']
+        )
+        self.sunset.delete()
+        self.assertEqual(self.search_titles('/posts/?search=moon'), [])
+        self.assertFalse(SearchDocument.objects.filter(
+            doc_type='posts.post', object_id=self.sunset.id
+        ).exists())
+
+    def test_username_change_reindexes_posts(self):
+        self.adam.username = 'adelaide'
+        self.adam.save()
+        titles = self.search_titles('/posts/?search=adelaide')
+        self.assertEqual(titles, ['Sunset over the harbour'])
+
+    def test_feedback_and_reports_are_searchable(self):
+        Feedback.objects.create(
+            first_name='Cleo', email='cleo@example.com', content='Love it'
+        )
+        Report.objects.create(
+            title='Rude reply', user=self.brian, category='harassment'
+        )
+        response = self.client.get('/feedback/search/?q=cleo')
+        self.assertEqual(response.data['results'][0]['content'], 'Love it')
+        response = self.client.get('/report/?search=rude')
+        self.assertEqual(response.data['results'][0]['title'], 'Rude reply')
+        response = self.client.get('/report/search/?q=brian')
+        self.assertEqual(response.data['results'][0]['title'], 'Rude reply')
+
+    def test_rebuild_command_restores_the_index(self):
+        SearchDocument.objects.all().delete()
+        self.assertEqual(self.search_titles('/posts/?search=harbour'), [])
+        out = StringIO()
+        call_command('rebuild_search_index', stdout=out)
+        self.assertIn('Indexed 2 document(s).', out.getvalue())
+        self.assertEqual(
+            self.search_titles('/posts/?search=harbour'),
+            ['Sunset over the harbour'],
+        )
@@ -0,0 +1,26 @@
+from django.conf import settings
+from django.db.models import Case, IntegerField, When
+from rest_framework import generics
+from .backends import ranked_ids
+
+
+class RankedSearchList(generics.ListAPIView):
+    """
+    Lists the objects matching `?q=`, best match first.
+    Subclasses set `queryset` and `serializer_class`.
+    """
+    search_param = 'q'
+
+    def get_queryset(self):
+        query = self.request.query_params.get(self.search_param, '')
+        queryset = super().get_queryset()
+        ids = ranked_ids(
+            queryset.model, query, settings.SEARCH_RESULTS_LIMIT
+        )
+        if not ids:
+            return queryset.none()
+        ranking = Case(
+            *[When(pk=pk, then=position) for position, pk in enumerate(ids)],
+            output_field=IntegerField(),
+        )
+        return queryset.filter(pk__in=ids).order_by(ranking)
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SuggestionsConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'suggestions'
+
+    def ready(self):
+        # Keeps the in-memory follow graph in step with Follower writes
+        from . import graph
+        graph.connect_signals()
@@ -0,0 +1,173 @@
+import heapq
+import threading
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models.signals import post_save, post_delete
+from followers.models import Follower
+
+# Unsigned 32-bit user ids, 4 bytes per edge
+TYPECODE = 'I'
+
+
+class FollowGraph:
+    """
+    The follow graph held in memory as one sorted array of followed
+    user ids per follower, loaded from the followers table on first use
+    and kept up to date by the Follower signals of this process.
+
+    Memory footprint, as measured by benchmarks/follow_graph.py: each
+    edge takes 4 bytes of array storage, and each follower with at
+    least one edge adds 125-155 bytes of dict entry, int key and array
+    header. One million edges take 18.7MiB over 100,000 followers
+    (10 follows each), 6.2MiB over 20,000 (50 each) and 4.4MiB over
+    5,000 (200 each).
+
+    Follows written by other processes are picked up when the graph is
+    reloaded, after FOLLOW_GRAPH_MAX_AGE seconds. A stale graph is
+    reloaded by one background thread while requests keep reading it;
+    only the first load makes requests wait, for a single load.
+    """
+
+    def __init__(self):
+        self.following = {}
+        self.loaded_at = None
+        self.reloading = False
+        self.lock = threading.Lock()
+        self.load_lock = threading.Lock()
+
+    def build(self, edges):
+        """
+        Replaces the graph with `edges`, (owner_id, followed_id) pairs
+        sorted by owner_id then followed_id.
+        """
+        following = {}
+        owner_id = followed = None
+        for owner, followed_id in edges:
+            if owner != owner_id:
+                owner_id = owner
+                followed = following[owner] = array(TYPECODE)
+            followed.append(followed_id)
+        with self.lock:
+            self.following = following
+            self.loaded_at = time.monotonic()
+
+    def load(self):
+        self.build(
+            Follower.objects.order_by('owner_id', 'followed_id')
+            .values_list('owner_id', 'followed_id')
+            .iterator(chunk_size=10000)
+        )
+
+    def refresh(self):
+        """
+        Loads the graph if it never was, or starts reloading it in the
+        background if it is stale and no reload is running yet.
+        """
+        if self.loaded_at is None:
+            with self.load_lock:
+                if self.loaded_at is None:
+                    self.load()
+            return
+        if not self.is_stale():
+            return
+        with self.lock:
+            if self.reloading:
+                return
+            self.reloading = True
+        threading.Thread(target=self.reload_in_thread, daemon=True).start()
+
+    def reload_in_thread(self):
+        try:
+            with self.load_lock:
+                self.load()
+        finally:
+            self.reloading = False
+            # The thread opened its own connection to load
+            connection.close()
+
+    def reset(self):
+        with self.lock:
+            self.following = {}
+            self.loaded_at = None
+
+    def is_stale(self):
+        return (
+            self.loaded_at is None or
+            time.monotonic() - self.loaded_at > settings.FOLLOW_GRAPH_MAX_AGE
+        )
+
+    def add(self, owner_id, followed_id):
+        with self.lock:
+            if self.loaded_at is None:
+                return
+            followed = self.following.setdefault(owner_id, array(TYPECODE))
+            index = bisect_left(followed, followed_id)
+            if index == len(followed) or followed[index] != followed_id:
+                followed.insert(index, followed_id)
+
+    def remove(self, owner_id, followed_id):
+        with self.lock:
+            followed = self.following.get(owner_id)
+            if not followed:
+                return
+            index = bisect_left(followed, followed_id)
+            if index < len(followed) and followed[index] == followed_id:
+                followed.pop(index)
+            if not followed:
+                del self.following[owner_id]
+
+    def suggest(self, user_id, limit):
+        """
+        Returns up to `limit` (user_id, mutual_count) pairs of the users
+        followed by the most of the users `user_id` follows, excluding
+        `user_id` and the users they already follow. Ties go to the
+        lower, older, user id.
+        """
+        self.refresh()
+        with self.lock:
+            followed = self.following.get(user_id, ())
+            scores = Counter()
+            for followed_id in followed:
+                scores.update(self.following.get(followed_id, ()))
+            excluded = set(followed)
+        excluded.add(user_id)
+        for excluded_id in excluded:
+            scores.pop(excluded_id, None)
+        return heapq.nlargest(
+            limit, scores.items(), key=lambda item: (item[1], -item[0])
+        )
+
+
+follow_graph = FollowGraph()
+
+
+def add_follow(sender, instance, created, **kwargs):
+    """
+    Adds a new follow to the graph once its transaction commits.
+    """
+    if created:
+        transaction.on_commit(lambda: follow_graph.add(
+            instance.owner_id, instance.followed_id
+        ))
+
+
+def remove_follow(sender, instance, **kwargs):
+    """
+    Removes a deleted follow from the graph once its transaction commits.
+    """
+    transaction.on_commit(lambda: follow_graph.remove(
+        instance.owner_id, instance.followed_id
+    ))
+
+
+def connect_signals():
+    post_save.connect(
+        add_follow, sender=Follower, dispatch_uid='follow-graph:add'
+    )
+    post_delete.connect(
+        remove_follow, sender=Follower, dispatch_uid='follow-graph:remove'
+    )
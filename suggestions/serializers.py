@@ -0,0 +1,13 @@
+from rest_framework import serializers
+from profiles.serializers import ProfileSerializer
+
+
+class SuggestionSerializer(ProfileSerializer):
+    """
+    A suggested profile, with how many of the viewer's follows
+    follow its owner.
+    """
+    mutual_count = serializers.ReadOnlyField()
+
+    class Meta(ProfileSerializer.Meta):
+        fields = ProfileSerializer.Meta.fields + ['mutual_count']
@@ -0,0 +1,114 @@
+import threading
+from unittest import mock
+from django.conf import settings
+from django.contrib.auth.models import User
+from rest_framework import status
+from rest_framework.test import APITestCase
+from followers.models import Follower
+from .graph import FollowGraph, follow_graph
+
+
+class FollowGraphTests(APITestCase):
+    """
+    Tests for the in-memory follow graph.
+    """
+    def test_suggestions_rank_by_mutual_follows(self):
+        graph = FollowGraph()
+        graph.build([
+            (1, 2), (1, 3), (1, 4),
+            (2, 5), (2, 6),
+            (3, 1), (3, 5), (3, 6),
+            (4, 4), (4, 5),
+        ])
+        self.assertEqual(graph.suggest(1, 10), [(5, 3), (6, 2)])
+        self.assertEqual(graph.suggest(1, 1), [(5, 3)])
+
+    def test_add_and_remove_keep_arrays_sorted(self):
+        graph = FollowGraph()
+        graph.build([(1, 5)])
+        graph.add(1, 3)
+        graph.add(1, 9)
+        graph.add(1, 3)
+        self.assertEqual(list(graph.following[1]), [3, 5, 9])
+        graph.remove(1, 5)
+        graph.remove(1, 7)
+        self.assertEqual(list(graph.following[1]), [3, 9])
+        graph.remove(1, 3)
+        graph.remove(1, 9)
+        self.assertNotIn(1, graph.following)
+
+
+    def test_stale_graph_is_served_while_one_reload_runs(self):
+        graph = FollowGraph()
+        graph.build([(1, 2), (2, 3)])
+        graph.loaded_at -= settings.FOLLOW_GRAPH_MAX_AGE + 1
+        started, release, loads = threading.Event(), threading.Event(), []
+
+        def load():
+            loads.append(threading.current_thread())
+            started.set()
+            release.wait(5)
+            graph.build([(1, 2), (2, 4)])
+
+        with mock.patch.object(graph, 'load', load), \
+                mock.patch('suggestions.graph.connection'):
+            self.assertEqual(graph.suggest(1, 10), [(3, 1)])
+            self.assertTrue(started.wait(5))
+            self.assertEqual(graph.suggest(1, 10), [(3, 1)])
+            release.set()
+            loads[0].join(5)
+        self.assertEqual(len(loads), 1)
+        self.assertIsNot(loads[0], threading.current_thread())
+        self.assertEqual(graph.suggest(1, 10), [(4, 1)])
+
+
+class SuggestionListViewTests(APITestCase):
+    """
+    Tests for /profiles/suggestions/.
+    """
+    def setUp(self):
+        follow_graph.reset()
+        self.users = {
+            name: User.objects.create_user(username=name, password='pass')
+            for name in ['adam', 'brian', 'carol', 'dave', 'erin']
+        }
+        for owner, followed in [
+            ('adam', 'brian'), ('adam', 'carol'),
+            ('brian', 'dave'), ('carol', 'dave'), ('carol', 'erin'),
+            ('brian', 'adam'),
+        ]:
+            Follower.objects.create(
+                owner=self.users[owner], followed=self.users[followed]
+            )
+        self.client.login(username='adam', password='pass')
+
+    def tearDown(self):
+        follow_graph.reset()
+
+    def test_logged_out_user_cant_view_suggestions(self):
+        self.client.logout()
+        response = self.client.get('/profiles/suggestions/')
+        self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
+
+    def test_suggestions_exclude_self_and_followed(self):
+        response = self.client.get('/profiles/suggestions/')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(profile['owner'], profile['mutual_count'])
+             for profile in response.data],
+            [('dave', 2), ('erin', 1)],
+        )
+        self.assertIsNone(response.data[0]['following_id'])
+
+    def test_new_follows_update_the_graph(self):
+        self.client.get('/profiles/suggestions/')
+        with self.captureOnCommitCallbacks(execute=True):
+            Follower.objects.create(
+                owner=self.users['adam'], followed=self.users['dave']
+            )
+        response = self.client.get('/profiles/suggestions/?fields=owner')
+        self.assertEqual(response.data, [{'owner': 'erin'}])
+
+    def test_invalid_limit_is_rejected(self):
+        response = self.client.get('/profiles/suggestions/?limit=500')
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,52 @@
+from django.conf import settings
+from rest_framework import generics, permissions
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+from profiles.models import Profile
+from profiles.views import FollowingIdsMixin
+from api_retrospective.sparse_fields import SparseQuerysetMixin
+from .graph import follow_graph
+from .serializers import SuggestionSerializer
+
+
+class SuggestionList(
+    SparseQuerysetMixin, FollowingIdsMixin, generics.ListAPIView
+):
+    """
+    Lists up to `?limit=` profiles of people you may know: those
+    followed by the most of the users you follow, excluding the ones
+    you already follow. Scored on the in-memory follow graph.
+    """
+    serializer_class = SuggestionSerializer
+    permission_classes = [permissions.IsAuthenticated]
+    queryset = Profile.objects.all()
+    field_relations = {'owner': ['owner']}
+
+    def get_limit(self):
+        value = self.request.query_params.get(
+            'limit', settings.SUGGESTIONS_LIMIT
+        )
+        maximum = settings.SUGGESTIONS_MAX_LIMIT
+        try:
+            limit = int(value)
+        except ValueError:
+            raise ValidationError({'limit': 'Enter a whole number.'})
+        if not 1 <= limit <= maximum:
+            raise ValidationError({
+                'limit': f'Ensure this is between 1 and {maximum}.'
+            })
+        return limit
+
+    def list(self, request, *args, **kwargs):
+        scores = dict(follow_graph.suggest(request.user.pk, self.get_limit()))
+        found = {
+            profile.owner_id: profile
+            for profile in self.get_queryset().filter(owner__in=scores)
+        }
+        profiles = []
+        for owner_id, mutual_count in scores.items():
+            if owner_id in found:
+                found[owner_id].mutual_count = mutual_count
+                profiles.append(found[owner_id])
+        serializer = self.get_serializer(profiles, many=True)
+        return Response(serializer.data)
@@ -0,0 +1,64 @@
+import time
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from variants.models import ImageVariantJob
+from variants.processing import process_job
+
+MAX_ATTEMPTS = 3
+
+
+class Command(BaseCommand):
+    """
+    Works through the queued image variant jobs, oldest first.
+    Run it as the Procfile worker with --loop, or periodically.
+    Several workers can run at once on PostgreSQL, as each job is
+    claimed with SELECT ... FOR UPDATE SKIP LOCKED.
+    Run it with the web processes' RESPONSE_CACHE backend, shared
+    across machines (memcached) when it runs on its own dyno, so its
+    invalidations reach their cached responses.
+    """
+    help = 'Generates the resized variants of uploaded images.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--loop', action='store_true',
+            help='Keep polling for new jobs instead of exiting when idle.',
+        )
+        parser.add_argument(
+            '--sleep', type=float, default=5,
+            help='Seconds to wait between polls with --loop.',
+        )
+
+    def handle(self, *args, **options):
+        processed = 0
+        while True:
+            if self.run_next_job():
+                processed += 1
+            elif options['loop']:
+                time.sleep(options['sleep'])
+            else:
+                break
+        self.stdout.write(f'Processed {processed} image variant job(s).')
+
+    def run_next_job(self):
+        """
+        Runs the oldest unclaimed job. Returns False if there was none.
+        """
+        with transaction.atomic():
+            job = ImageVariantJob.objects.select_for_update(
+                skip_locked=True
+            ).filter(attempts__lt=MAX_ATTEMPTS).first()
+            if job is None:
+                return False
+            try:
+                with transaction.atomic():
+                    process_job(job)
+            except Exception as error:
+                job.attempts += 1
+                job.save(update_fields=['attempts'])
+                self.stderr.write(f'{job} failed: {error}')
+            else:
+                ImageVariantJob.objects.filter(
+                    pk=job.pk, source=job.source
+                ).delete()
+        return True
@@ -0,0 +1,57 @@
+from django.db import models
+from django.db.models.signals import pre_save, post_save
+from posts.models import Post
+from profiles.models import Profile
+
+
+class ImageVariantJob(models.Model):
+    """
+    A queued request to generate the resized variants of an image.
+    'model_label' and 'object_id' identify the post or profile and
+    'source' is the storage name of the uploaded image.
+    Jobs are run by the process_image_variants command.
+    """
+    model_label = models.CharField(max_length=50)
+    object_id = models.BigIntegerField()
+    source = models.CharField(max_length=255)
+    attempts = models.PositiveSmallIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        ordering = ['created_at']
+        unique_together = ['model_label', 'object_id']
+
+    def __str__(self):
+        return f'{self.model_label} {self.object_id}: {self.source}'
+
+
+# Models with an 'image' field and an 'image_variants' map
+VARIANT_MODELS = [Post, Profile]
+
+
+def discard_stale_variants(sender, instance, raw=False, **kwargs):
+    """
+    Notes whether a new image is being uploaded, in which case
+    the variants of the previous image no longer apply.
+    """
+    instance._image_uploaded = not raw and not instance.image._committed
+    if instance._image_uploaded:
+        instance.image_variants = {}
+
+
+def queue_variants(sender, instance, **kwargs):
+    """
+    Queues variant generation for a newly uploaded image, replacing
+    any job still pending for the previous one.
+    """
+    if getattr(instance, '_image_uploaded', False):
+        ImageVariantJob.objects.update_or_create(
+            model_label=sender._meta.label_lower,
+            object_id=instance.pk,
+            defaults={'source': instance.image.name, 'attempts': 0},
+        )
+
+
+for model in VARIANT_MODELS:
+    pre_save.connect(discard_stale_variants, sender=model)
+    post_save.connect(queue_variants, sender=model)
@@ -0,0 +1,85 @@
+import posixpath
+from io import BytesIO
+from django.apps import apps
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils.timezone import now
+from PIL import Image, ImageOps
+from api_retrospective.owner_summaries import forget_owner_summaries
+from api_retrospective.response_cache import invalidate
+
+
+def flatten(image):
+    """
+    Returns an RGB copy of an image, with any transparency
+    composited onto white as JPEG has no alpha channel.
+    """
+    if image.mode in ('RGBA', 'LA') or 'transparency' in image.info:
+        image = image.convert('RGBA')
+        background = Image.new('RGBA', image.size, 'white')
+        image = Image.alpha_composite(background, image)
+    return image.convert('RGB')
+
+
+def render_variant(image, longest_edge):
+    """
+    Returns a JPEG of the image scaled down to fit `longest_edge`.
+    Images already smaller are re-encoded at their own size.
+    """
+    variant = image.copy()
+    variant.thumbnail((longest_edge, longest_edge), Image.LANCZOS)
+    buffer = BytesIO()
+    variant.save(
+        buffer, 'JPEG', quality=settings.IMAGE_VARIANT_QUALITY,
+        optimize=True, progressive=True,
+    )
+    return ContentFile(buffer.getvalue())
+
+
+def generate_variants(storage, source):
+    """
+    Saves every variant of the image stored as `source` and
+    returns their storage names by variant name.
+    """
+    with storage.open(source) as file:
+        image = Image.open(file)
+        image.load()
+    image = flatten(ImageOps.exif_transpose(image))
+    stem = posixpath.splitext(posixpath.basename(source))[0]
+    return {
+        name: storage.save(
+            f'variants/{stem}_{name}.jpg', render_variant(image, size)
+        )
+        for name, size in settings.IMAGE_VARIANTS.items()
+    }
+
+
+def process_job(job):
+    """
+    Generates the variants of a job's image and records them on its
+    post or profile, unless the image was replaced in the meantime.
+
+    The cached responses and owner summaries are invalidated through
+    the 'responses' cache, which only reaches the web processes when
+    they share its backend. The Procfile worker runs on a dyno of its
+    own, so it needs RESPONSE_CACHE=memcached; with a file or locmem
+    backend, cached lists keep the old variants until they expire.
+    """
+    model = apps.get_model(job.model_label)
+    storage = model._meta.get_field('image').storage
+    variants = generate_variants(storage, job.source)
+    # .update() leaves the job-queueing signals alone; updated_at is
+    # bumped by hand so cached representations are revalidated
+    updated = model.objects.filter(
+        pk=job.object_id, image=job.source
+    ).update(image_variants=variants, updated_at=now())
+    if updated:
+        invalidate(job.model_label)
+        if job.model_label == 'profiles.profile':
+            # Owner summaries carry the profile image variants
+            forget_owner_summaries(*model.objects.filter(
+                pk=job.object_id
+            ).values_list('owner_id', flat=True))
+    else:
+        for name in variants.values():
+            storage.delete(name)
@@ -0,0 +1,44 @@
+from django.conf import settings
+from rest_framework import serializers
+
+
+def variant_urls(storage, image, image_variants):
+    """
+    Maps each variant name to the URL of the variant of the image
+    stored as `image`, or to the image itself until it's generated.
+    """
+    image_url = storage.url(image)
+    return {
+        name: (
+            storage.url(image_variants[name])
+            if name in image_variants else image_url
+        )
+        for name in settings.IMAGE_VARIANTS
+    }
+
+
+def absolute_urls(request, urls):
+    if request is None:
+        return urls
+    # Absolute like the URLs of DRF's own ImageField
+    return {
+        name: request.build_absolute_uri(url) for name, url in urls.items()
+    }
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    A read-only srcset-style map of variant name to URL for the image
+    of a post or profile. Until the variants are generated, every
+    name maps to the original image.
+    """
+
+    def __init__(self, **kwargs):
+        kwargs['read_only'] = True
+        super().__init__(**kwargs)
+
+    def to_representation(self, obj):
+        urls = variant_urls(
+            obj.image.storage, obj.image.name, obj.image_variants
+        )
+        return absolute_urls(self.context.get('request'), urls)
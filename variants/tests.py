@@ -0,0 +1,115 @@
+import shutil
+import tempfile
+from io import BytesIO, StringIO
+from django.contrib.auth.models import User
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from django.test import override_settings
+from PIL import Image
+from rest_framework.test import APITestCase
+from posts.models import Post
+from .models import ImageVariantJob
+
+MEDIA_ROOT = tempfile.mkdtemp()
+
+
+def image_upload(width, height, name='photo.png'):
+    buffer = BytesIO()
+    Image.new('RGBA', (width, height), (255, 0, 0, 128)).save(buffer, 'PNG')
+    return SimpleUploadedFile(name, buffer.getvalue())
+
+
+@override_settings(
+    DEFAULT_FILE_STORAGE='django.core.files.storage.FileSystemStorage',
+    MEDIA_ROOT=MEDIA_ROOT,
+)
+class ImageVariantTests(APITestCase):
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        shutil.rmtree(MEDIA_ROOT, ignore_errors=True)
+
+    def setUp(self):
+        self.adam = User.objects.create_user(username='adam', password='pass')
+        self.client.login(username='adam', password='pass')
+
+    def process(self):
+        out = StringIO()
+        call_command('process_image_variants', stdout=out)
+        return out.getvalue()
+
+    def test_upload_queues_a_job_and_serves_the_original(self):
+        response = self.client.post('/posts/', {
+            'title': 'a title', 'image': image_upload(2000, 1000),
+        }, format='multipart')
+        post = Post.objects.get(pk=response.data['id'])
+        job = ImageVariantJob.objects.get()
+        self.assertEqual(job.source, post.image.name)
+        self.assertEqual(
+            set(response.data['image_variants'].values()),
+            {response.data['image']},
+        )
+
+    def test_worker_records_resized_variants(self):
+        response = self.client.post('/posts/', {
+            'title': 'a title', 'image': image_upload(2000, 1000),
+        }, format='multipart')
+        self.assertIn('Processed 1 image variant job(s).', self.process())
+        self.assertFalse(ImageVariantJob.objects.exists())
+
+        post = Post.objects.get(pk=response.data['id'])
+        sizes = {}
+        for name, key in post.image_variants.items():
+            with default_storage.open(key) as file:
+                sizes[name] = Image.open(file).size
+        self.assertEqual(sizes, {
+            'thumb': (150, 75), 'medium': (600, 300), 'full': (1600, 800),
+        })
+
+        response = self.client.get(f'/posts/{post.id}/')
+        thumb_url = default_storage.url(post.image_variants['thumb'])
+        self.assertEqual(
+            response.data['image_variants']['thumb'],
+            f'http://testserver{thumb_url}',
+        )
+
+    def test_profile_upload_replaces_previous_variants(self):
+        profile = self.adam.profile
+        self.client.put(
+            f'/profiles/{profile.id}/', {'image': image_upload(300, 300)},
+            format='multipart',
+        )
+        self.process()
+        profile.refresh_from_db()
+        self.assertEqual(len(profile.image_variants), 3)
+
+        self.client.put(
+            f'/profiles/{profile.id}/',
+            {'image': image_upload(400, 400, 'other.png')},
+            format='multipart',
+        )
+        profile.refresh_from_db()
+        self.assertEqual(profile.image_variants, {})
+        self.process()
+        profile.refresh_from_db()
+        self.assertIn('other', profile.image_variants['thumb'])
+
+        self.client.post('/posts/', {'title': 'a title'})
+        response = self.client.get('/posts/')
+        self.assertTrue(
+            response.data['results'][0]['profile_image_variants']['medium']
+            .endswith(default_storage.url(profile.image_variants['medium']))
+        )
+
+    def test_job_for_replaced_image_is_discarded(self):
+        response = self.client.post('/posts/', {
+            'title': 'a title', 'image': image_upload(100, 100),
+        }, format='multipart')
+        job = ImageVariantJob.objects.get()
+        Post.objects.filter(pk=response.data['id']).update(image='other.png')
+        self.process()
+        self.assertEqual(
+            Post.objects.get(pk=response.data['id']).image_variants, {}
+        )
+        self.assertFalse(ImageVariantJob.objects.filter(pk=job.pk).exists())